@@ -0,0 +1,87 @@
+"""
+Microbenchmark da codificação e decodificação das mensagens
+
+Compara o formato JSON antigo com o formato binário do Codec para os tipos
+de mensagem mais frequentes no sistema. Na decodificação a coluna "tipado" mede
+decode_message, que entrega o objeto tipado recebido pelos handlers do nó.
+
+Ao final compara um payload grande (lista de votos) com e sem a compressão zlib.
+
+Uso:
+    python3 benchmarks/bench_codec.py --number 100000
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.message.Codec import encode, decode, decode_message, configure_compression
+from middleware.message.MessageEnum import MessageEnum
+
+
+CASES: list[tuple[MessageEnum, str, dict]] = [
+    (MessageEnum.HEARTBEAT, "HEARTBEAT", {}),
+    (MessageEnum.LEADER_ACK, "LEADER_ACK:7", {"leader": 7}),
+    (MessageEnum.BIZANTINE_VOTE, "3:48200", {"round": 3, "vote": 48200}),
+]
+
+
+def json_encode(message_enum: MessageEnum, payload: str) -> bytes:
+    return json.dumps({
+        "type": message_enum.value,
+        "sender_id": 1,
+        "payload": payload
+    }).encode('utf-8')
+
+
+def json_decode(data: bytes) -> dict:
+    return json.loads(data.decode('utf-8'))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmark do codec de mensagens")
+    parser.add_argument("--number", type=int, help="Repetições de cada operação", default=100000)
+    args = parser.parse_args()
+
+    n: int = args.number
+
+    print(f"{'tipo':<18}{'op':<8}{'json (ns)':>12}{'binário (ns)':>14}{'tipado (ns)':>13}{'bytes json':>12}{'bytes bin':>11}")
+
+    for message_enum, payload, fields in CASES:
+        j: bytes = json_encode(message_enum, payload)
+        b: bytes = encode(message_enum, 1, **fields)
+
+        enc_json: float = timeit.timeit(lambda: json_encode(message_enum, payload), number=n) / n * 1e9
+        enc_bin: float = timeit.timeit(lambda: encode(message_enum, 1, **fields), number=n) / n * 1e9
+
+        dec_json: float = timeit.timeit(lambda: json_decode(j), number=n) / n * 1e9
+        dec_bin: float = timeit.timeit(lambda: decode(b), number=n) / n * 1e9
+        dec_typed: float = timeit.timeit(lambda: decode_message(b), number=n) / n * 1e9
+
+        print(f"{message_enum.name:<18}{'encode':<8}{enc_json:>12.0f}{enc_bin:>14.0f}{'':>13}{len(j):>12}{len(b):>11}")
+        print(f"{message_enum.name:<18}{'decode':<8}{dec_json:>12.0f}{dec_bin:>14.0f}{dec_typed:>13.0f}")
+
+    # Payload grande, ex.: vetor de votos de 200 nós
+    votes: str = ",".join(f"{i}:{48200 + i % 5}" for i in range(1, 201))
+
+    print(f"\n{'compressão':<18}{'encode (ns)':>12}{'decode (ns)':>13}{'bytes':>8}")
+
+    for name, threshold in (("desativada", None), ("zlib", 512)):
+        configure_compression(threshold=threshold)
+
+        b = encode(MessageEnum.REQUEST_VALUE, 1, payload=votes)
+
+        enc: float = timeit.timeit(lambda: encode(MessageEnum.REQUEST_VALUE, 1, payload=votes), number=n // 10) / (n // 10) * 1e9
+        dec: float = timeit.timeit(lambda: decode_message(b), number=n // 10) / (n // 10) * 1e9
+
+        print(f"{name:<18}{enc:>12.0f}{dec:>13.0f}{len(b):>8}")
+
+    configure_compression(threshold=None)
+
+
+if __name__ == "__main__":
+    main()
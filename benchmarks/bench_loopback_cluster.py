@@ -0,0 +1,89 @@
+"""
+Experimento de escala do protocolo com muitos nós no mesmo processo
+
+Executa N AsyncNode no mesmo event loop conectados por uma LoopbackNetwork (sem
+sockets), com latência e perda configuráveis, e informa o tempo até todos os nós
+concordarem sobre o líder, as decisões de consenso e o tráfego da rede em memória.
+
+Uso:
+    python3 benchmarks/bench_loopback_cluster.py --nodes 100 --latency 0.001 --loss 0.01 --duration 20
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import contextlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.AsyncNode import AsyncNode, serve
+from middleware.message.LoopbackTransport import LoopbackNetwork
+
+
+async def watch(nodes: list[AsyncNode], start: float, res: dict) -> None:
+    """
+    Registra o instante em que todos os nós passam a concordar sobre o líder
+    """
+
+    while True:
+        leaders: set = {node._ele.get_leader() for node in nodes}
+
+        if "leader_agreed" not in res and len(leaders) == 1 and None not in leaders:
+            res["leader_agreed"] = time.monotonic() - start
+            res["leader"] = leaders.pop()
+
+        await asyncio.sleep(0.1)
+
+
+async def experiment(nodes: list[AsyncNode], duration: float) -> dict:
+    res: dict = {}
+    start: float = time.monotonic()
+
+    try:
+        await asyncio.wait_for(asyncio.gather(serve(nodes), watch(nodes, start, res)), duration)
+    except asyncio.TimeoutError:
+        pass
+
+    return res
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Experimento com N nós em memória")
+    parser.add_argument("--nodes", type=int, help="Número de nós", default=100)
+    parser.add_argument("--latency", type=float, help="Latência de cada entrega (s)", default=0.001)
+    parser.add_argument("--jitter", type=float, help="Variação máxima da latência (s)", default=0.0)
+    parser.add_argument("--loss", type=float, help="Probabilidade de perda de cada entrega", default=0.0)
+    parser.add_argument("--duration", type=float, help="Duração do experimento (s)", default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    network: LoopbackNetwork = LoopbackNetwork(latency=args.latency, jitter=args.jitter, loss=args.loss, seed=0)
+
+    ids: list[int] = list(range(1, args.nodes + 1))
+
+    # Os prints de depuração dos módulos são descartados
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        nodes: list[AsyncNode] = [
+            AsyncNode(i, ids, df_d=2, df_t=1, election_timeout=3, transport=network.transport(i))
+            for i in ids
+        ]
+
+        res: dict = asyncio.run(experiment(nodes, args.duration))
+
+    network.close()
+
+    stats: dict = network.stats()
+
+    print(f"nós:                 {args.nodes}")
+    print(f"líder acordado em:   {res.get('leader_agreed', float('nan')):.2f} s (líder {res.get('leader')})")
+    print(f"entregas:            {stats['delivered']} ({stats['delivered'] / args.duration:.0f}/s)")
+    print(f"perdidas:            {stats['lost']}")
+    print(f"pendentes ao final:  {stats['pending']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de vazão (mensagens/s) do envio multicast
+
+Compara o envio antigo, que cria, vincula, entra no grupo multicast e fecha um
+socket a cada mensagem, com o MulticastSender que mantém um socket persistente.
+
+Uso:
+    python3 benchmarks/bench_multicast_sender.py --messages 5000 --threads 3
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.message.Message import (
+    Message, MulticastSender, MULTICAST_GROUP, MUSTICAST_PORT, message
+)
+from middleware.message.MessageEnum import MessageEnum
+
+
+def send_socket_per_message(m: bytes) -> None:
+    """
+    Reproduz o envio antigo: um socket novo para cada mensagem
+    """
+
+    s = Message.create_socket_multicast()
+
+    try:
+        s.sendto(m, (MULTICAST_GROUP, MUSTICAST_PORT))
+    finally:
+        s.close()
+
+
+def run(send, num_messages: int, num_threads: int) -> float:
+    """
+    Executa o envio de num_messages mensagens divididas entre num_threads threads
+
+    Returns:
+        float: vazão em mensagens por segundo
+    """
+
+    m: bytes = message(
+        message_enum=MessageEnum.HEARTBEAT,
+        sender_id=1,
+        payload="HEARTBEAT"
+    )
+
+    per_thread: int = num_messages // num_threads
+
+    def worker() -> None:
+        for _ in range(per_thread):
+            send(m)
+
+    threads: list[threading.Thread] = [threading.Thread(target=worker) for _ in range(num_threads)]
+
+    start: float = time.perf_counter()
+
+    for th in threads:
+        th.start()
+
+    for th in threads:
+        th.join()
+
+    elapsed: float = time.perf_counter() - start
+
+    return (per_thread * num_threads) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do envio multicast")
+    parser.add_argument("--messages", type=int, help="Número de mensagens enviadas", default=5000)
+    parser.add_argument("--threads", type=int, help="Threads compartilhando o remetente (DF, escuta, principal)", default=3)
+    args = parser.parse_args()
+
+    before: float = run(send_socket_per_message, args.messages, args.threads)
+
+    sender: MulticastSender = MulticastSender()
+    after: float = run(sender.send, args.messages, args.threads)
+    sender.close()
+
+    print(f"Socket por mensagem:  {before:12.0f} mensagens/s")
+    print(f"MulticastSender:      {after:12.0f} mensagens/s")
+    print(f"Ganho:                {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Custo de cada nó executado em um NodeHost
+
+Inicia, em um processo novo para cada K, um NodeHost com K nós e informa após alguns
+segundos a memória residente do processo, a memória alocada pelo Python (tracemalloc),
+as threads e os descritores de arquivo. O custo marginal de cada nó é comparado com
+o de um processo main.py por nó (K = 1).
+
+Uso:
+    python3 benchmarks/bench_node_host.py --nodes 1 10 50
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+import subprocess
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.NodeHost import NodeHost
+from middleware.message.Message import ClusterConfig
+
+# Cluster próprio, não interfere com nós em execução
+CLUSTER: ClusterConfig = ClusterConfig(group="224.1.1.242", port=5242, unicast_base_port=18000)
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+    return 0
+
+
+def measure(k: int, seconds: float) -> dict:
+    tracemalloc.start()
+
+    ids: list[int] = list(range(1, k + 1))
+
+    # Os prints de depuração dos módulos são descartados
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        host: NodeHost = NodeHost(ids, ids, df_d=2, df_t=1, election_timeout=3, cluster=CLUSTER)
+        host.start()
+
+        time.sleep(seconds)
+
+        res: dict = {
+            "rss_kb": rss_kb(),
+            "python_kb": tracemalloc.get_traced_memory()[0] // 1024,
+            "threads": threading.active_count(),
+            "fds": len(os.listdir("/proc/self/fd")),
+            "leader": sorted({node._ele.get_leader() for node in host.nodes.values()}, key=str),
+        }
+
+        host.stop()
+
+    return res
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo de cada nó em um NodeHost")
+    parser.add_argument("--nodes", type=int, nargs="+", help="Nós por processo", default=[1, 10, 50])
+    parser.add_argument("--seconds", type=float, help="Tempo de execução antes da medição", default=8)
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS, default=None)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(measure(args.child, args.seconds)))
+        return
+
+    print(f"{'nós':>5}{'RSS (KB)':>10}{'Python (KB)':>13}{'threads':>9}{'fds':>6}{'KB/nó':>8}  líderes")
+
+    base: dict | None = None
+
+    for k in args.nodes:
+        out: str = subprocess.run(
+            [sys.executable, __file__, "--child", str(k), "--seconds", str(args.seconds)],
+            capture_output=True, text=True, check=True
+        ).stdout
+
+        res: dict = json.loads(out.strip().splitlines()[-1])
+
+        if base is None:
+            base = {**res, "k": k}
+
+        per_node: float = (res["rss_kb"] - base["rss_kb"]) / (k - base["k"]) if k != base["k"] else res["rss_kb"]
+
+        print(f"{k:>5}{res['rss_kb']:>10}{res['python_kb']:>13}{res['threads']:>9}{res['fds']:>6}{per_node:>8.0f}  {res['leader']}")
+
+
+if __name__ == "__main__":
+    main()
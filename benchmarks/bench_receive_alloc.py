@@ -0,0 +1,132 @@
+"""
+Benchmark de alocações de memória por mensagem recebida (tracemalloc)
+
+Compara o recebimento antigo (recvfrom alocando bytes, decodificação completa de
+todas as mensagens, inclusive as do próprio nó) com o recebimento por recv_into em
+buffers reutilizados, memoryviews e descarte das mensagens do próprio nó pelo cabeçalho.
+
+Para cada mensagem é medido o pico de memória alocada durante o processamento.
+
+Uso:
+    python3 benchmarks/bench_receive_alloc.py --messages 20000
+"""
+
+import os
+import sys
+import socket
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.message.Codec import decode, peek_header, split_datagram
+from middleware.message.Message import RECV_BUFFER_SIZE, message
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.Receiver import BufferPool
+
+
+PROCESS_ID: int = 1
+
+
+def traffic(n: int) -> list[bytes]:
+    """
+    Metade das mensagens é do próprio nó, como acontece com o loopback multicast
+    """
+
+    return [
+        message(
+            message_enum=MessageEnum.HEARTBEAT,
+            sender_id=PROCESS_ID if i % 2 == 0 else 2,
+            payload="HEARTBEAT"
+        )
+        for i in range(n)
+    ]
+
+
+def recv_old(sock: socket.socket) -> None:
+    data, _ = sock.recvfrom(RECV_BUFFER_SIZE)
+
+    for m in split_datagram(data):
+        msg: dict = decode(m)
+
+        if msg["sender_id"] == PROCESS_ID:
+            continue
+
+
+def make_recv_pooled():
+    pool: BufferPool = BufferPool(RECV_BUFFER_SIZE, 4)
+
+    def recv_pooled(sock: socket.socket) -> None:
+        buf: bytearray = pool.acquire()
+
+        try:
+            nbytes: int = sock.recv_into(buf)
+
+            for m in split_datagram(memoryview(buf)[:nbytes]):
+                if peek_header(m)[1] == PROCESS_ID:
+                    continue
+
+                decode(m)
+        finally:
+            pool.release(buf)
+
+    return recv_pooled
+
+
+def measure(recv, messages: list[bytes]) -> float:
+    """
+    Returns:
+        float: bytes alocados (pico) por mensagem
+    """
+
+    rx: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    rx.bind(("127.0.0.1", 0))
+
+    tx: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    total_peak: int = 0
+
+    tracemalloc.start()
+
+    chunk: int = 500
+
+    for start in range(0, len(messages), chunk):
+        batch: list[bytes] = messages[start:start + chunk]
+
+        for m in batch:
+            tx.sendto(m, rx.getsockname())
+
+        for _ in batch:
+            current: int = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+            recv(rx)
+
+            total_peak += tracemalloc.get_traced_memory()[1] - current
+
+    tracemalloc.stop()
+
+    rx.close()
+    tx.close()
+
+    return total_peak / len(messages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de alocações no recebimento")
+    parser.add_argument("--messages", type=int, help="Número de mensagens recebidas", default=20000)
+    args = parser.parse_args()
+
+    messages: list[bytes] = traffic(args.messages)
+
+    old_bytes: float = measure(recv_old, messages)
+    new_bytes: float = measure(make_recv_pooled(), messages)
+
+    print(f"{'recebimento':<22}{'bytes/msg':>12}")
+    print(f"{'recvfrom + decode':<22}{old_bytes:>12.0f}")
+    print(f"{'recv_into + pool':<22}{new_bytes:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Comunicação entre dois nós no mesmo host: UDP x memória compartilhada
+
+Compara o UdpTransport (unicast pelo kernel) com o SharedMemoryTransport (anéis em
+memória compartilhada) entre dois processos:
+
+* ida e volta: um processo envia um HEARTBEAT (send_to) e o outro o devolve, mede a
+  latência de cada mensagem
+* rajada: um processo envia as mensagens sem aguardar e o outro informa quantas recebeu
+  (o UDP pode perder mensagens), mede a vazão
+
+Em ambos é medido o tempo de CPU do processo que envia. Em hosts com um único
+processador o polling dos anéis disputa a CPU com o outro processo, e a latência de
+ida e volta não é representativa.
+
+Uso:
+    python3 benchmarks/bench_shared_memory.py --messages 5000
+"""
+
+import os
+import sys
+import time
+import queue
+import argparse
+import statistics
+import multiprocessing
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.message.Codec import decode, peek_header
+from middleware.message.Message import ClusterConfig, message
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.SharedMemoryTransport import SharedMemoryTransport
+from middleware.message.Transport import Transport, UdpTransport
+
+# Cluster próprio, não interfere com nós em execução
+CLUSTER: ClusterConfig = ClusterConfig(group="224.1.1.240", port=5240, unicast_base_port=16000)
+
+PING: bytes = message(message_enum=MessageEnum.HEARTBEAT, sender_id=1)
+DATA: bytes = message(message_enum=MessageEnum.TEST, sender_id=1, payload="x" * 64)
+
+
+def create(kind: str, process_id: int, namespace: str) -> Transport:
+    if kind == "udp":
+        return UdpTransport(process_id, cluster=CLUSTER)
+
+    return SharedMemoryTransport(process_id, [1, 2], namespace=namespace, scan_interval=0.05)
+
+
+def peer(kind: str, namespace: str, burst: int, ready, done) -> None:
+    """
+    Devolve os HEARTBEATs e informa quantas mensagens TEST recebeu, ao completar
+    burst mensagens ou após 0.5 s sem mensagens
+    """
+
+    transport: Transport = create(kind, 2, namespace)
+    received: queue.Queue = queue.Queue()
+
+    transport.start(received.put)
+    ready.set()
+
+    count: int = 0
+
+    def report() -> None:
+        transport.send_to(1, message(message_enum=MessageEnum.TEST, sender_id=2, payload=str(count)))
+
+    while not done.is_set():
+        try:
+            m: bytes = received.get(timeout=0.5)
+        except queue.Empty:
+            if count:
+                report()
+                count = 0
+            continue
+
+        if peek_header(m)[0] == MessageEnum.HEARTBEAT.value:
+            transport.send_to(1, m)
+            continue
+
+        count += 1
+
+        if count == burst:
+            report()
+            count = 0
+
+    transport.stop()
+
+
+def run(kind: str, messages: int) -> dict:
+    ready = multiprocessing.Event()
+    done = multiprocessing.Event()
+    namespace: str = f"bench-{os.getpid()}"
+
+    process = multiprocessing.Process(target=peer, args=(kind, namespace, messages, ready, done))
+    process.start()
+
+    transport: Transport = create(kind, 1, namespace)
+    received: queue.Queue = queue.Queue()
+    transport.start(received.put)
+    ready.wait()
+
+    # Aguarda o outro nó abrir o anel (ou o socket) deste nó e descarta as respostas das tentativas
+    while True:
+        transport.send_to(2, PING)
+
+        try:
+            received.get(timeout=0.1)
+            break
+        except queue.Empty:
+            continue
+
+    time.sleep(0.3)
+
+    while not received.empty():
+        received.get()
+
+    res: dict = {"rtts": []}
+    cpu: float = time.process_time()
+
+    for _ in range(messages):
+        start: float = time.perf_counter()
+        transport.send_to(2, PING)
+        received.get()
+        res["rtts"].append(time.perf_counter() - start)
+
+    res["rtt_cpu"] = time.process_time() - cpu
+    res["rtts"].sort()
+
+    cpu = time.process_time()
+    start = time.perf_counter()
+
+    for _ in range(messages):
+        transport.send_to(2, DATA)
+
+    res["received"] = int(decode(received.get(timeout=10))["payload"])
+    res["elapsed"] = time.perf_counter() - start
+    res["burst_cpu"] = time.process_time() - cpu
+
+    done.set()
+    process.join()
+    transport.stop()
+
+    return res
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Comunicação UDP x memória compartilhada")
+    parser.add_argument("--messages", type=int, help="Mensagens de cada experimento", default=5000)
+    args = parser.parse_args()
+
+    print(f"{'transporte':<12}{'mediana (µs)':>14}{'p99 (µs)':>12}{'CPU (ms)':>10}{'rajada (msg/s)':>16}{'recebidas':>11}{'CPU (ms)':>10}")
+
+    for kind in ("udp", "shm"):
+        res: dict = run(kind, args.messages)
+        rtts: list[float] = res["rtts"]
+
+        # Com perdas o receptor informa após 0.5 s sem mensagens
+        elapsed: float = res["elapsed"] - (0.5 if res["received"] < args.messages else 0)
+
+        print(
+            f"{kind:<12}{statistics.median(rtts) * 1e6:>14.1f}{rtts[int(len(rtts) * 0.99)] * 1e6:>12.1f}"
+            f"{res['rtt_cpu'] * 1e3:>10.1f}{res['received'] / elapsed:>16.0f}{res['received']:>11}{res['burst_cpu'] * 1e3:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
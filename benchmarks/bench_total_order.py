@@ -0,0 +1,97 @@
+"""
+Vazão da difusão com ordem total (TotalOrder)
+
+Executa N AsyncNode em uma LoopbackNetwork, aguarda a eleição do líder e difunde
+M mensagens a partir de todos os nós. Informa o tempo até todos os nós entregarem
+todas as mensagens, a vazão, o tamanho médio dos lotes do líder e se a ordem de
+entrega é a mesma em todos os nós.
+
+Uso:
+    python3 benchmarks/bench_total_order.py --nodes 5 --messages 2000 --loss 0.01
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import contextlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from middleware.AsyncNode import AsyncNode, serve
+from middleware.message.LoopbackTransport import LoopbackNetwork
+
+
+async def workload(nodes: list[AsyncNode], delivered: dict[int, list[str]], messages: int, res: dict) -> None:
+    while len({node._ele.get_leader() for node in nodes} - {None}) != 1 or any(node._ele.get_leader() is None for node in nodes):
+        await asyncio.sleep(0.1)
+
+    start: float = time.monotonic()
+
+    for i in range(messages):
+        nodes[i % len(nodes)].total_order.broadcast(f"{i % len(nodes)}:{i}")
+
+        # Cede o event loop a cada rajada
+        if i % 10 == 9:
+            await asyncio.sleep(0)
+
+    while any(len(d) < messages for d in delivered.values()):
+        await asyncio.sleep(0.01)
+
+    res["elapsed"] = time.monotonic() - start
+
+
+async def experiment(nodes: list[AsyncNode], delivered: dict, messages: int, duration: float) -> dict:
+    res: dict = {}
+
+    try:
+        await asyncio.wait_for(asyncio.gather(serve(nodes), workload(nodes, delivered, messages, res)), duration)
+    except asyncio.TimeoutError:
+        pass
+
+    return res
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vazão da difusão com ordem total")
+    parser.add_argument("--nodes", type=int, help="Número de nós", default=5)
+    parser.add_argument("--messages", type=int, help="Mensagens difundidas", default=2000)
+    parser.add_argument("--loss", type=float, help="Probabilidade de perda de cada entrega", default=0.0)
+    parser.add_argument("--duration", type=float, help="Tempo máximo do experimento (s)", default=30)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    network: LoopbackNetwork = LoopbackNetwork(loss=args.loss, seed=0)
+    ids: list[int] = list(range(1, args.nodes + 1))
+    delivered: dict[int, list[str]] = {i: [] for i in ids}
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        nodes: list[AsyncNode] = [
+            AsyncNode(i, ids, df_d=2, df_t=1, election_timeout=3, transport=network.transport(i))
+            for i in ids
+        ]
+
+        for node in nodes:
+            node.total_order.on_deliver = lambda sender_id, payload, d=delivered[node._process_id]: d.append(payload)
+
+        res: dict = asyncio.run(experiment(nodes, delivered, args.messages, args.duration))
+
+    network.close()
+
+    leader: AsyncNode = max(nodes, key=lambda node: node.total_order.stats()["orders"])
+    stats: dict = leader.total_order.stats()
+    elapsed: float = res.get("elapsed", float("nan"))
+
+    print(f"nós:                 {args.nodes}")
+    print(f"mensagens:           {args.messages}")
+    print(f"tempo:               {elapsed:.2f} s ({args.messages / elapsed:.0f} msg/s)")
+    print(f"lote médio do líder: {stats['ordered'] / max(stats['orders'], 1):.1f}")
+    print(f"entregues por nó:    {min(len(d) for d in delivered.values())}..{max(len(d) for d in delivered.values())}")
+    print(f"mesma ordem:         {all(d == delivered[ids[0]] for d in delivered.values())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,56 +2,146 @@
 
 """
 
+import os
+import signal
 import logging
+import threading
 import argparse
 from time import sleep, time
 from random import randint
 
 from config.logger_config import setup_logger
 from middleware import Node
+from middleware.NodeHost import NodeHost
+from middleware.message.Codec import configure_compression
 from middleware.message.MessageEnum import MessageEnum
+from middleware.message.Message import ClusterConfig, MULTICAST_GROUP, MUSTICAST_PORT, PLANE_NAMES
 
 logger = logging.getLogger(__name__)
 
 class App(Node.Node):
-    def __init__(self, process_id: int, processes_id: list[int], df_d: int, df_t, election_timeout: int):
+    def __init__(self, process_id: int, processes_id: list[int], df_d: int, df_t, election_timeout: int, cluster: ClusterConfig | None = None, planes: tuple[str, ...] | None = None, **kwargs):
         super().__init__(
             process_id=process_id,
             processes_id=processes_id,
             df_d=df_d,
             df_t=df_t,
-            election_timeout=election_timeout
+            election_timeout=election_timeout,
+            cluster=cluster,
+            planes=planes,
+            **kwargs
         )
 
     def main(self) -> None:
         self.init_node()
+        wait_for_signal()
+        self.stop()
 
-def main(id: int = 1) -> None:
+def wait_for_signal() -> None:
     """
-    Inicia todas as configurações do sistema
+    Bloqueia a thread principal até SIGTERM (ex.: run_nodes.py) ou SIGINT (Ctrl+C),
+    para que o nó saia do cluster de forma graciosa (ver Node.stop)
     """
     
-    setup_logger(id)
+    stop: threading.Event = threading.Event()
+    
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+        
+    while not stop.wait(1):
+        pass
+    
+
+def report_ready(fd: int, node: Node.Node) -> None:
+    """
+    Escreve cada evento de prontidão do nó (ver Node.READY_EVENTS) no descritor fd,
+    uma linha "<id> <evento> <segundos>" por evento, lida pelo run_nodes.py
+    """
+    
+    def write(event: str, elapsed: float) -> None:
+        # Linhas menores que PIPE_BUF são escritas atomicamente pelos nós do processo
+        os.write(fd, f"{node._process_id} {event} {elapsed:.3f}\n".encode())
+        
+    node.on_ready = write
+
+
+def main(id: int = 1, cluster: ClusterConfig | None = None, planes: tuple[str, ...] | None = None, ids: list[int] | None = None, cluster_size: int = 10, ready_fd: int | None = None) -> None:
+    """
+    Inicia todas as configurações do sistema, com ids vários nós são executados
+    neste processo (NodeHost). Com ready_fd os eventos de prontidão são informados
+    no descritor (ver report_ready)
+    """
+    
+    setup_logger(id if not ids else f"{min(ids)}-{max(ids)}")
     
     d: int = 2
     t: int = 1
     election_timeout: int = 5
     
-    processes_id: list[int] = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    processes_id: list[int] = list(range(1, cluster_size + 1))
+    
+    if ids:
+        host: NodeHost = NodeHost(
+            local_ids=ids,
+            processes_id=processes_id,
+            df_d=d,
+            df_t=t,
+            election_timeout=election_timeout,
+            cluster=cluster,
+            planes=planes,
+            node_cls=App
+        )
+        
+        if ready_fd is not None:
+            for node in host.nodes.values():
+                report_ready(ready_fd, node)
+        
+        host.start()
+        wait_for_signal()
+        host.stop()
+        return
     
     app = App(
         process_id=id,
         processes_id=processes_id,
         df_d=d,
         df_t=t,
-        election_timeout=election_timeout
+        election_timeout=election_timeout,
+        cluster=cluster,
+        planes=planes
     )
     
+    if ready_fd is not None:
+        report_ready(ready_fd, app)
+    
     app.main()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Identificador de processo para o sistema")
     parser.add_argument("--id", type=int, help="Identificador de processo (id)", default=0)
+    parser.add_argument("--ids", type=int, nargs="+", help="Executa vários nós neste processo", default=None)
+    parser.add_argument("--cluster-size", type=int, help="Visão inicial do cluster (ids 1 a N), outros ids entram pelo líder", default=10)
+    parser.add_argument("--ready-fd", type=int, help="Descritor onde os eventos de prontidão são informados", default=None)
+    parser.add_argument("--group", type=str, help="Grupo multicast do cluster", default=MULTICAST_GROUP)
+    parser.add_argument("--port", type=int, help="Porta multicast do cluster", default=MUSTICAST_PORT)
+    parser.add_argument("--compress", type=int, help="Comprime payloads a partir deste tamanho (bytes)", default=None)
+    parser.add_argument("--split-planes", action="store_true", help="Um grupo multicast por plano (a partir de --group)")
+    parser.add_argument("--planes", type=str, nargs="+", choices=PLANE_NAMES, help="Planos recebidos pelo nó (padrão: todos)", default=None)
+    parser.add_argument("--shm", action="store_true", help="Memória compartilhada entre os nós do mesmo host")
+    parser.add_argument("--local-ids", type=int, nargs="+", help="Nós no mesmo host com --shm (padrão: todos)", default=None)
     args = parser.parse_args()
+
+    if args.compress is not None:
+        configure_compression(threshold=args.compress)
+        
+    cluster: ClusterConfig = ClusterConfig(
+        group=args.group,
+        port=args.port,
+        shared_memory=f"distributed-{args.port}" if args.shm else None,
+        local_ids=tuple(args.local_ids) if args.local_ids is not None else None
+    )
+    
+    if args.split_planes:
+        cluster = cluster.split()
     
-    main(args.id)
\ No newline at end of file
+    main(args.id, cluster, tuple(args.planes) if args.planes is not None else None, args.ids, args.cluster_size, args.ready_fd)
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+    Variante do Node executada sobre asyncio: HEARTBEATs do DF, pesquisa do líder,
+    timeout da eleição e rodadas de consenso são tarefas e temporizadores de um único
+    event loop, sem threads dormindo com time.sleep.
+
+    Vários AsyncNode podem executar no mesmo event loop (ver serve), e o protocolo
+    (MessageEnum e Codec) é o mesmo do Node, portanto os dois tipos de nó interoperam.
+"""
+
+import asyncio
+import logging
+
+from .Node import Node
+from .DF import DF
+from .Scheduler import LoopScheduler
+from .message.Message import ClusterConfig
+from .message.Transport import Transport
+from .message.AsyncMessage import AsyncUdpTransport
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNode(Node):
+    def __init__(self,
+                 process_id: int,
+                 processes_id: list[int],
+                 df_d: int,
+                 df_t: int,
+                 election_timeout: int,
+                 round: int = 0,
+                 transport: Transport | None = None,
+                 cluster: ClusterConfig | None = None,
+                 planes: tuple[str, ...] | None = None) -> None:
+
+        super().__init__(
+            process_id=process_id,
+            processes_id=processes_id,
+            df_d=df_d,
+            df_t=df_t,
+            election_timeout=election_timeout,
+            round=round,
+            transport=transport if transport is not None else AsyncUdpTransport(process_id, cluster=cluster, planes=planes),
+            planes=planes,
+            scheduler=LoopScheduler()
+        )
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        
+        # Tarefas do nó em run(), canceladas por stop()
+        self._tasks: asyncio.Future | None = None
+
+        # Temporizador da eleição em andamento e tarefa da rodada de consenso em andamento
+        self._election_timer: asyncio.TimerHandle | None = None
+        self._consensus_task: asyncio.Task | None = None
+
+        # Acorda o laço principal quando a lista de suspeitos ou o líder mudam
+        self._wake_event: asyncio.Event = asyncio.Event()
+
+
+    # Tarefas do event loop
+
+    async def __heartbeat_task(self) -> None:
+        """
+        Substitui a thread de HEARTBEAT do DF
+        """
+
+        while True:
+            with self._transport.batch():
+                self._df.tick()
+
+            await asyncio.sleep(self._df_t)
+
+
+    async def __leader_search(self, timeout: int) -> None:
+        logger.info(f"❔ Servidor {self._process_id} pergunta para o sitema quem é o líder")
+
+        with self._send_leader_search_message_lock:
+            self._is_send_leader_search_message = True
+
+        # Termina antes se o estado do líder for instalado (JOIN_SNAPSHOT)
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        with self._send_leader_search_message_lock:
+            self._is_send_leader_search_message = False
+
+
+    async def __main_task(self) -> None:
+        """
+        Substitui a thread principal do Node
+        """
+
+        await self.__leader_search(2)
+
+        self._main_active = True
+
+        while True:
+            self._wake_event.clear()
+
+            # Os envios do ciclo (ex.: VIEW, BIZANTINE_START) são agrupados, como em Node
+            with self._transport.batch():
+                self._node_step()
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), self._main_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+    async def __consensus_round(self) -> None:
+        self.consensus_module.start_round()
+
+        await asyncio.sleep(self.consensus_module.timeout)
+
+        with self._transport.batch():
+            self.consensus_module.decide()
+
+
+    def __election_timeout(self) -> None:
+        self._election_timer = None
+        self._ele.election_timeout()
+
+
+    # Ganchos do Node, não bloqueiam o event loop
+
+    def _wake(self) -> None:
+        # Pode ser chamado pela thread do transporte
+        if self._loop is not None and self._main_active:
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+
+    def _cancel_election_timer(self) -> None:
+        # Pode ser chamado pela thread do transporte
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(super()._cancel_election_timer)
+
+
+    def _start_election(self) -> None:
+        if self._election_timer is not None:
+            return
+
+        self._update_election_members()
+
+        if self._ele.start_nowait():
+            self._election_timer = self._loop.call_later(self._election_timeout, self.__election_timeout)
+
+
+    def _run_consensus(self) -> None:
+        if self._consensus_task is None or self._consensus_task.done():
+            self._consensus_task = self._loop.create_task(self.__consensus_round())
+
+
+    # Métodos para o APP
+
+    async def run(self) -> None:
+        """
+        Inicia o nó no event loop atual e executa até stop() ou até ser cancelado
+        """
+
+        self._loop = asyncio.get_running_loop()
+        
+        # Os lotes da ordem total utilizam os temporizadores do event loop, sem a thread do Scheduler
+        self._scheduler.bind(self._loop)
+
+        self._df = DF(
+            d=self._df_d,
+            t=self._df_t,
+            process_id=self._process_id,
+            processes_list=self._membership.peers(),
+            transport=self._transport,
+            autostart=False,
+            on_tick=self._periodic_step,
+            on_change=self._wake
+        )
+
+        await self._transport.astart(self._on_message)
+
+        self._tasks = asyncio.gather(
+            self.__heartbeat_task(),
+            self.__main_task()
+        )
+
+        try:
+            await self._tasks
+        except asyncio.CancelledError:
+            # Apenas a saída graciosa (stop) termina run() normalmente
+            if not self._stopped:
+                raise
+        finally:
+            self._main_active = False
+
+            if self._election_timer is not None:
+                self._election_timer.cancel()
+
+            if self._consensus_task is not None:
+                self._consensus_task.cancel()
+
+            self.total_order.flush()
+            self._send_leave()
+
+            self._transport.stop()
+
+
+    def stop(self) -> None:
+        """
+        Saída graciosa do nó, pode ser chamada por outra thread: run() termina após 
+        anunciar a saída (LEAVE), sem interromper os outros nós do mesmo event loop
+        """
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.__cancel)
+
+
+    def __cancel(self) -> None:
+        self._stopped = True
+
+        if self._tasks is not None:
+            self._tasks.cancel()
+
+
+    def init_node(self) -> None:
+        """
+        Executa o nó em um event loop próprio, bloqueando a thread atual
+        """
+
+        asyncio.run(self.run())
+
+
+async def serve(nodes: list[AsyncNode]) -> None:
+    """
+    Executa vários nós no mesmo event loop
+
+    Args:
+        nodes (list[AsyncNode]): nós que serão executados
+    """
+
+    await asyncio.gather(*(node.run() for node in nodes))
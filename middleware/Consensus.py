@@ -1,67 +1,111 @@
 import time
-import queue
+import threading
 from random import randint
 from middleware.message.MessageEnum import MessageEnum
 from middleware.message.Message import Message, message
+from middleware.message.TypedMessage import BizantineStartMessage, BizantineVoteMessage, BizantineDecideMessage
 
 class Consensus:
-    def __init__(self, node):
+    def __init__(self, node, timeout: float = 3):
         self.node = node
         self.votes = {}
+        self.timeout = timeout  # seconds
 
-    def run_leader_consensus(self):
+        # Votes are only accepted while the leader has a round open
+        self._collecting = False
+        self._lock = threading.Lock()
+
+        # Last decided round and value, sent to joining nodes in the leader's snapshot
+        self.decided_round = 0
+        self.decided_value = None
+
+    def start_round(self):
         """
-        Leader starts consensus round, collects votes, and broadcasts the consensus value.
+        Leader opens a new consensus round and broadcasts BIZANTINE_START.
         """
         self.node.round += 1
 
         m = message(
             message_enum=MessageEnum.BIZANTINE_START,
             sender_id=self.node._process_id,
-            payload=str(self.node.round)
+            round=self.node.round
         )
-        Message.send_multicast(m)
+        Message.send_multicast(m, sender=self.node._transport)
 
-        self.votes = {self.node._process_id: self.node.get_node_vote()}
+        with self._lock:
+            self.votes = {self.node._process_id: self.node.get_node_vote()}
+            self._collecting = True
 
-        start_time = time.time()
-        timeout = 3  # seconds
-        while time.time() - start_time < timeout:
-            try:
-                msg = self.node._message_queue.get(timeout=timeout - (time.time() - start_time))
-                if msg.get("type") == MessageEnum.BIZANTINE_VOTE.value:
-                    sender = int(msg["sender_id"])
-                    vote = int(msg["payload"].split(":")[1])  # Extract the vote from the payload
-                    if sender not in self.votes and msg["payload"] == self.node.round:  # Avoid overwriting existing votes
-                        self.node.logger.info(f"[BIZANTINE] Node {self.node._process_id} received vote from {sender}: {vote}")
-                    # Store the vote in the votes dictionary
-                    self.votes[sender] = vote
-            except queue.Empty:
-                break
+    def collect_vote(self, msg):
+        """
+        Stores a BIZANTINE_VOTE for the open round, ignoring votes from other rounds.
+        """
+        sender = msg.sender_id
+        vote = msg.vote
+        with self._lock:
+            if self._collecting and sender not in self.votes and msg.round == self.node.round:  # Avoid overwriting existing votes
+                self.node.logger.info(f"[BIZANTINE] Node {self.node._process_id} received vote from {sender}: {vote}")
+                # Store the vote in the votes dictionary
+                self.votes[sender] = vote
+
+    def decide(self):
+        """
+        Leader closes the open round and broadcasts the consensus value.
+        """
+        with self._lock:
+            self._collecting = False
+            consensus_value = max(self.votes.values()) if self.votes else None
 
-        consensus_value = max(self.votes.values()) if self.votes else None
         if consensus_value is not None:
             self.node.logger.info(f"[BIZANTINE] Leader {self.node._process_id} decided consensus value: {consensus_value}")
+            self.record_decision(self.node.round, consensus_value)
             m = message(
                 message_enum=MessageEnum.BIZANTINE_DECIDE,
                 sender_id=self.node._process_id,
-                payload=str(consensus_value)
+                round=self.node.round,
+                value=consensus_value
             )
-            Message.send_multicast(m)
+            # DECIDE goes through the node's reliable (NACK) channel
+            Message.send_multicast(m, sender=self.node._reliable)
         return consensus_value
 
+    def record_decision(self, round, value):
+        """
+        Keeps the most recent decision, taken by this leader, received in a
+        BIZANTINE_DECIDE or installed from the leader's snapshot.
+        """
+        with self._lock:
+            if round >= self.decided_round:
+                self.decided_round = round
+                self.decided_value = value
+
+        self.node._mark_ready("decided")
+
+    def run_leader_consensus(self):
+        """
+        Leader starts consensus round, collects votes, and broadcasts the consensus value.
+        """
+        self.start_round()
+        time.sleep(self.timeout)
+        return self.decide()
+
     def handle_message(self, msg):
-        if msg.get("type") == MessageEnum.BIZANTINE_START.value:
-            if(int(msg["payload"]) > self.node.round):
-                self.node.round = int(msg["payload"])
+        if isinstance(msg, BizantineStartMessage):
+            if(msg.round > self.node.round):
+                self.node.round = msg.round
                 self.node.logger.info(f"[BIZANTINE] Node {self.node._process_id} updated round to {self.node.round}")
 
             m = message(
                 message_enum=MessageEnum.BIZANTINE_VOTE,
                 sender_id=self.node._process_id,
-                payload=str(f"{msg["payload"]}:{self.node.get_node_vote()}")
+                round=msg.round,
+                vote=self.node.get_node_vote()
             )
-            Message.send_multicast(m)
-        elif msg.get("type") == MessageEnum.BIZANTINE_DECIDE.value:
-            consensus_value = int(msg["payload"])
+            # Only the leader collects the votes
+            Message.send_to(m, msg.sender_id, sender=self.node._transport)
+        elif isinstance(msg, BizantineVoteMessage):
+            self.collect_vote(msg)
+        elif isinstance(msg, BizantineDecideMessage):
+            consensus_value = msg.value
             self.node.logger.info(f"[BIZANTINE] Node {self.node._process_id} received consensus value: {consensus_value}")
+            self.record_decision(msg.round, consensus_value)
@@ -37,8 +37,11 @@ import logging
 import threading
 
 from enum import Enum
+from typing import Callable
 
-from .message.Message import Message, MessageEnum, message, handle_message
+from .message.Message import Message, MessageEnum, Outbox, message, handle_message
+from .message.Transport import Transport
+from .message.TypedMessage import TypedMessage, HeartbeatMessage
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +51,40 @@ class DFState(Enum):
 
 
 class DF():
-    def __init__(self, d: int, t: int, process_id: int, processes_list: list[int]) -> None:
+    def __init__(self, 
+                 d: int, 
+                 t: int, 
+                 process_id: int, 
+                 processes_list: list[int], 
+                 transport: Transport | Outbox | None = None,
+                 autostart: bool = True,
+                 on_tick: Callable[[], None] | None = None,
+                 on_change: Callable[[], None] | None = None) -> None:
+        """
+        Args:
+            d (int): tempo máximo de transmissão de mensagens
+            t (int): intervalo entre HEARTBEATs
+            process_id (int): id do processo local
+            processes_list (list[int]): id de todos os processos do sistema
+            transport (Transport | Outbox | None): transporte compartilhado com o nó, caso None
+            utiliza o remetente padrão do processo
+            autostart (bool): se True inicia a thread de HEARTBEAT, caso contrário quem 
+            utiliza o DF deve chamar tick() a cada t unidades de tempo (ex.: AsyncNode)
+            on_tick (Callable | None): executada a cada ciclo do DF, após o HEARTBEAT, para
+            as tarefas periódicas do nó (ex.: reenvio de ELECTION e LEADER_SEARCH)
+            on_change (Callable | None): executada quando a lista de suspeitos muda, na thread
+            que detectou a mudança, portanto não deve bloquear (ex.: acordar o laço principal)
+        """
+        
         self._d = d
         self._t = t
         
+        # Transporte compartilhado com o nó
+        self._transport: Transport | Outbox | None = transport
+        
+        self._on_tick: Callable[[], None] | None = on_tick
+        self._on_change: Callable[[], None] | None = on_change
+        
         self._process_id: int = process_id
         self._processes_status: dict = {k: [time.time(), 0, DFState.SUSPECTED] for k in processes_list if k != process_id}
         
@@ -62,15 +95,21 @@ class DF():
         
         self._send_heartbeat_thread: threading.Thread = threading.Thread(target=self.__df_send_heartbeat_thread)
         
-        self._send_heartbeat_thread.start()
+        if autostart:
+            self._send_heartbeat_thread.start()
         
         logger.info(f"✅ Detector de Falhas do Servidor ID {self._process_id} Iniciado com Sucesso" )
 
     
-    def __stop(self) -> None:
+    def stop(self) -> None:
+        """
+        Encerra a thread de HEARTBEAT (autostart), quem chama tick() apenas deixa de chamá-lo
+        """
+        
         self._stop_event.set()
-        self._send_heartbeat_thread.join(timeout=0.1)
-        print("Thread send hearbeat parada")
+        
+        if self._send_heartbeat_thread.is_alive() and self._send_heartbeat_thread is not threading.current_thread():
+            self._send_heartbeat_thread.join(timeout=self._t + 1)
     
     def suspected_list(self) -> list[int]:
         """
@@ -100,7 +139,7 @@ class DF():
             payload="HEARTBEAT"
         )
         
-        Message.send_multicast(message=m)
+        Message.send_multicast(message=m, sender=self._transport)
       
         
     def __verify_processes_status(self) -> None:
@@ -112,14 +151,41 @@ class DF():
         Caso seja maior que 3 vezes altera para SUSPECTED
         """
         
-        for p in self._processes_status.values():
-            now = time.time()
-                        
-            if now - p[0] > self._t + self._d:
-                p[1] += 1
+        changed: bool = False
+        
+        with self._lock:
+            for p in self._processes_status.values():
+                now = time.time()
+                            
+                if now - p[0] > self._t + self._d:
+                    p[1] += 1
+                    
+                if p[1] > 3 and p[2] != DFState.SUSPECTED:
+                    p[2] = DFState.SUSPECTED 
+                    changed = True
                 
-            if p[1] > 3:
-                p[2] = DFState.SUSPECTED 
+        if changed:
+            self.__notify_change()
+            
+            
+    def __notify_change(self) -> None:
+        if self._on_change is not None:
+            self._on_change()
+    
+    
+    def tick(self) -> None:
+        """
+        Executa um ciclo do DF: envia o HEARTBEAT e verifica o estado dos outros processos
+        """
+        
+        self.__send_heartbeat()
+        
+        print("Mensagem ")
+        
+        self.__verify_processes_status()
+        
+        if self._on_tick is not None:
+            self._on_tick()
     
     
     def __df_send_heartbeat_thread(self) -> None:
@@ -127,23 +193,90 @@ class DF():
         Thread que envia as mensagens de HEARTBEAT para todos os nós
         """
         
-        while True:
-            self.__send_heartbeat()
+        while not self._stop_event.is_set():
+            self.tick()
+            
+            self._stop_event.wait(self._t)
+            
+            
+    def install_members(self, members: list[int]) -> None:
+        """
+        Marca os processos ativos informados por outro nó (ex.: estado do líder na
+        entrada no cluster) como UNSUSPECTED, como se um HEARTBEAT de cada um tivesse
+        acabado de chegar, sem aguardar os seus próximos HEARTBEATs
+
+        Args:
+            members (list[int]): ids dos processos ativos
+        """
+        
+        now = time.time()
+        changed: bool = False
+        
+        with self._lock:
+            for id in members:
+                if id == self._process_id or id not in self._processes_status:
+                    continue
+                
+                changed = changed or self._processes_status[id][2] == DFState.SUSPECTED
+                self._processes_status[id] = [now, 0, DFState.UNSUSPECTED]
+                
+        if changed:
+            self.__notify_change()
             
-            print("Mensagem ")
             
-            self.__verify_processes_status()
+    def set_members(self, members: list[int]) -> None:
+        """
+        Altera os processos monitorados para os membros da visão atual (ver Membership).
+        Os processos removidos deixam de ser monitorados, e os admitidos iniciam como 
+        UNSUSPECTED, pois o líder os admitiu ao receber uma mensagem deles. Não executa 
+        on_change, quem instala a visão já é avisado da mudança
+
+        Args:
+            members (list[int]): ids dos membros da visão
+        """
+        
+        now = time.time()
+        
+        with self._lock:
+            self._processes_status = {
+                id: self._processes_status.get(id) or [now, 0, DFState.UNSUSPECTED]
+                for id in members if id != self._process_id
+            }
+            
+            
+    def mark_down(self, process_id: int) -> None:
+        """
+        Marca um processo como SUSPECTED imediatamente, sem aguardar t + k*d (ex.: o 
+        processo anunciou a sua saída com LEAVE). Um novo HEARTBEAT do processo, após o 
+        seu reinício, o marca novamente como UNSUSPECTED
+
+        Args:
+            process_id (int): id do processo que saiu
+        """
+        
+        with self._lock:
+            status: list | None = self._processes_status.get(process_id)
             
-            time.sleep(self._t)
+            if status is None or status[2] == DFState.SUSPECTED:
+                return
             
+            status[2] = DFState.SUSPECTED
             
-    def handle_df_message(self, message: dict) -> None:
-        if message["type"] == MessageEnum.HEARTBEAT.value and self._process_id != message["sender_id"]:
+        self.__notify_change()
+            
+            
+    def handle_df_message(self, message: TypedMessage) -> None:
+        if isinstance(message, HeartbeatMessage) and self._process_id != message.sender_id:
             print("Mensagem recebida")
             now = time.time()
             
             with self._lock:
-                self._processes_status[message["sender_id"]] = [now, 0, DFState.UNSUSPECTED]
+                previous: list | None = self._processes_status.get(message.sender_id)
+                self._processes_status[message.sender_id] = [now, 0, DFState.UNSUSPECTED]
+                
+            # Um processo suspeito (ou desconhecido) voltou a enviar HEARTBEATs
+            if previous is None or previous[2] == DFState.SUSPECTED:
+                self.__notify_change()
             
             
         
@@ -13,9 +13,11 @@ O algoritmo utiliza as seguintes mensagens:
  
   MULTICAST:
   *  ELECTION: anuncia o uma eleição
-  *  ANSWER: responde a mensagem ELECTION  
   *  COORDINATOR: mensagem enviada pelo vencedor para anunciar a sua vitória
   
+  UNICAST:
+  *  ANSWER: responde a mensagem ELECTION diretamente para quem a enviou
+  
   Quando um processo P detectar que o coordenador atual falhou, P executa 
   as seguintes ações:
   
@@ -48,8 +50,13 @@ import time
 import logging
 import threading
 
-from .message.Message import Message, message, handle_message
+from typing import Callable
+
+from .message.Message import Message, Outbox, message, handle_message
+from .message.Transport import Transport
+from .message.Reliable import ReliableChannel
 from .message.MessageEnum import MessageEnum
+from .message.TypedMessage import TypedMessage, ElectionMessage, AnswerMessage, CoordinatorMessage
 
 from statemachine import StateMachine, State
 
@@ -67,13 +74,26 @@ class Election(StateMachine):
     win_election = candidate.to(elected)
     
     
-    def __init__(self, process_id: int, processes_id: list[int], leader: int | None = None, timeout: int = 5):
+    def __init__(self, process_id: int, processes_id: list[int], leader: int | None = None, timeout: int = 5, transport: Transport | Outbox | None = None, reliable: ReliableChannel | None = None, on_leader_change: Callable[[int | None], None] | None = None):
         super().__init__()
         self._process_id: int = process_id
         self._processes_id: list[int] = processes_id
         
+        # Transporte compartilhado com o nó
+        self._transport: Transport | Outbox | None = transport
+        
+        # Canal confiável do nó, utilizado para o COORDINATOR e o ANSWER
+        self._reliable: ReliableChannel | Transport | Outbox | None = reliable if reliable is not None else transport
+        
+        # ELECTION da candidatura atual, reenviado com o mesmo id
+        self._election_frame: bytes | None = None
+        
         self._leader: int = leader
         
+        # Executada com o novo líder sempre que o líder muda, com o lock da eleição
+        # adquirido, portanto não deve bloquear nem consultar a eleição (ex.: acordar o laço principal)
+        self._on_leader_change: Callable[[int | None], None] | None = on_leader_change
+        
         self._timeout: int = timeout
         
         self._lock: threading.Lock = threading.Lock()
@@ -91,19 +111,36 @@ class Election(StateMachine):
           if leader_id != None:
             logger.info(f"📝 Servidor ID {self._process_id} identificou que o Servido ID {leader_id} é o nó líder")
             
-            self._leader = int(leader_id)
-          else:
-            self._leader = leader_id
+          self.__update_leader(leader_id)
           
             
     def __set_leader(self, leader_id: int) -> None:
       logger.info(f"🏆 Servidor ID {leader_id} ganhou a eleição")
-      if leader_id != None:
-        self._leader = int(leader_id)
-      else:
-        self._leader = leader_id
+      self.__update_leader(leader_id)
+      
+      
+    def __update_leader(self, leader_id: int | None) -> None:
+      """
+      Altera o líder e avisa on_leader_change se ele mudou, chamado com o lock adquirido
+      """
+      
+      previous: int | None = self._leader
+      self._leader = int(leader_id) if leader_id != None else None
+      
+      if self._leader != previous and self._on_leader_change is not None:
+        self._on_leader_change(self._leader)
+      
       
+    def set_members(self, members: list[int]) -> None:
+      """
+      Altera os processos considerados pela eleição (ex.: membros ativos da visão, ver
+      Membership), o maior id entre eles vence a eleição imediatamente
+      """
       
+      with self._lock:
+        self._processes_id = sorted({*members, self._process_id})
+        
+        
     def get_leader(self) -> int | None:
       with self._lock:
         leader: int = self._leader
@@ -150,34 +187,42 @@ class Election(StateMachine):
       return is_in_election
     
     
-    def __send_ELECTION_message(self) -> None:
-      m: bytes = message(
-              message_enum=MessageEnum.ELECTION,
-              sender_id=self._process_id,
-              payload="ELECTION"
-      )
+    def __send_ELECTION_message(self, resend: bool = False) -> None:
+      # Os reenvios de uma mesma candidatura mantêm o id da mensagem, e são descartados
+      # pelos nós que já a receberam (o ANSWER utiliza o canal confiável)
+      if not resend or self._election_frame is None:
+        self._election_frame = message(
+                message_enum=MessageEnum.ELECTION,
+                sender_id=self._process_id,
+                payload="ELECTION"
+        )
       
-      Message.send_multicast(message=m)
+      Message.send_multicast(message=self._election_frame, sender=self._transport)
       
     
-    def __resend_ELECTION_message(self) -> None:
+    def resend_ELECTION_message(self) -> None:
       """
-      Se eleição estiver no estado candidate a mensagem ELECTION é reenviada no sistema
+      Se eleição estiver no estado candidate a mensagem ELECTION é reenviada no sistema,
+      chamado periodicamente pelo nó (a cada HEARTBEAT do DF) e não a cada mensagem recebida
       """
       
       if self.is_in_election():
-        self.__send_ELECTION_message()
+        self.__send_ELECTION_message(resend=True)
         
       
    
-    def __send_ANSWER_message(self) -> None:
+    def __send_ANSWER_message(self, peer_id: int) -> None:
+      """
+      Responde diretamente para o nó que iniciou a eleição
+      """
+      
       m_answer: bytes = message(
               message_enum=MessageEnum.ANSWER,
               sender_id=self._process_id,
               payload="ANSWER_ACK"
       )
       
-      Message.send_multicast(message=m_answer)
+      Message.send_to(m_answer, peer_id, sender=self._reliable)
       
     
     def __send_COORDINATOR_message(self):
@@ -187,7 +232,7 @@ class Election(StateMachine):
               payload="COORDINATOR"
       )
       
-      Message.send_multicast(message=m)
+      Message.send_multicast(message=m, sender=self._reliable)
     
     # Transições e Condições da Máquina de Estados 
     
@@ -205,12 +250,12 @@ class Election(StateMachine):
       self.__send_ELECTION_message()
       
       
-    def cond_has_highest_id(self, message: dict) -> bool:
-      print(f"Teste: {self._process_id > message["sender_id"]}")
-      return self._process_id > message["sender_id"] 
+    def cond_has_highest_id(self, message: TypedMessage) -> bool:
+      print(f"Teste: {self._process_id > message.sender_id}")
+      return self._process_id > message.sender_id 
     
     
-    def before_apply(self) -> None:
+    def before_apply(self, message: ElectionMessage) -> None:
       """
       Quando um nó se candidata como possível candidato a coordenador 
       envia a mensagem ANSWER para o nó que iniciou a eleição,
@@ -218,7 +263,7 @@ class Election(StateMachine):
       eleição
       """
             
-      self.__send_ANSWER_message()
+      self.__send_ANSWER_message(message.sender_id)
       
       logger.info(f"🗳️ Servidor ID {self._process_id} inicia a eleição após ANSWER")
       
@@ -237,7 +282,7 @@ class Election(StateMachine):
       
       self.__send_COORDINATOR_message()
       
-      self._leader = self._process_id
+      self.__update_leader(self._process_id)
       
     # Métodos contendo uma interface para as eleições 
     
@@ -266,19 +311,24 @@ class Election(StateMachine):
         else:
           time.sleep(self._timeout)
           
-          with self._lock:
-            """ 
-            Se após o timeout a máquina de estados estiver em candidate faz a transição 
-            para o estado elected
-            """
-            if self.current_state.id == "candidate":
-              self.send("win_election")
+          self.election_timeout()
         
         return True
       except Exception as e:
         print(f"error: {e}")
         return False
       
+      
+    def election_timeout(self) -> None:
+      """ 
+      Se após o timeout a máquina de estados estiver em candidate faz a transição 
+      para o estado elected
+      """
+      
+      with self._lock:
+        if self.current_state.id == "candidate":
+          self.send("win_election")
+      
     
     def start(self) -> bool:
       """
@@ -304,62 +354,89 @@ class Election(StateMachine):
       res: bool = self.__election_process()
       
       return res
+    
+    
+    def start_nowait(self) -> bool:
+      """
+      Inicia uma eleição sem bloquear a thread chamadora, utilizado por quem controla
+      o timeout da eleição com temporizadores (ex.: AsyncNode)
+
+      Returns:
+          bool: True se o nó deve chamar election_timeout() após o timeout da eleição,
+          False se a eleição já foi decidida ou não pôde ser iniciada
+      """
+      
+      try:
+         with self._lock:
+           if self.current_state.id == "normal":
+             self.send("start_election")
+           
+           logger.info(f"✍️ Servidor ID {self._process_id} iniciou o processos de eleição")
+           
+           if self._process_id == max(self._processes_id):
+             if self.current_state.id == "candidate":
+               self.send("win_election")
+               
+             return False
+           
+      except Exception as e:
+         logger.error(f"Estado inconsistente, error: {e}")
+         return False
+      
+      return True
       
           
-    def __message_ELECTION(self, message: bytes) -> None:
+    def __message_ELECTION(self, message: ElectionMessage) -> None:
        sender_id_is_greater_than_id: bool = False
        with self._lock:
             if self.current_state.id == "normal":
-              logger.info(f"🙋 Servidor ID {self._process_id} envia ANSWER para o Servidor {message["sender_id"]} que requesitou a eleição")
+              logger.info(f"🙋 Servidor ID {self._process_id} envia ANSWER para o Servidor {message.sender_id} que requesitou a eleição")
               self.send("apply", message)
             
             elif self.current_state.id == "candidate":
               sender_id_is_greater_than_id = True
 
        if sender_id_is_greater_than_id:
-          logger.info(f"🙋 Servidor ID {self._process_id} possui um ID maior que o Servidor {message["sender_id"]}, então envia ANSWER para quem requesitou a eleição")
-          self.__send_ANSWER_message()
+          logger.info(f"🙋 Servidor ID {self._process_id} possui um ID maior que o Servidor {message.sender_id}, então envia ANSWER para quem requesitou a eleição")
+          self.__send_ANSWER_message(message.sender_id)
               
               
-    def __message_ANSWER(self, message: bytes) -> None:
+    def __message_ANSWER(self, message: AnswerMessage) -> None:
       with self._lock:
             if self.current_state.id == "candidate":
-              logger.info(f"🤦 Servidor ID {self._process_id} perdeu a eleição para o Nó {message["sender_id"]}")       
+              logger.info(f"🤦 Servidor ID {self._process_id} perdeu a eleição para o Nó {message.sender_id}")       
               self.send("lost")
 
               
-    def __message_COORDINATOR(self, message: bytes) -> None:
+    def __message_COORDINATOR(self, message: CoordinatorMessage) -> None:
        with self._lock:
             if self.current_state.id == "normal":
-              self.__set_leader(int(message["sender_id"]))
+              self.__set_leader(message.sender_id)
             
             if self.current_state.id == "candidate":
-              logger.info(f"🤦 Servidor ID {self._process_id} perdeu a eleição para o Nó {message["sender_id"]}")       
+              logger.info(f"🤦 Servidor ID {self._process_id} perdeu a eleição para o Nó {message.sender_id}")       
               self.send("lost")
-              self.__set_leader(int(message["sender_id"]))
+              self.__set_leader(message.sender_id)
 
               
 
-    def handle_election_message(self, message: dict) -> None:
+    def handle_election_message(self, message: TypedMessage) -> None:
       try:
-        if message["type"] == MessageEnum.ELECTION.value and self._process_id > message["sender_id"]:
+        if isinstance(message, ElectionMessage) and self._process_id > message.sender_id:
           self.__message_ELECTION(message)
            
               
         # Algum nó com id maior pretende ser o coordenador 
-        elif message["type"] == MessageEnum.ANSWER.value and self._process_id < message["sender_id"]:
+        elif isinstance(message, AnswerMessage) and self._process_id < message.sender_id:
           self.__message_ANSWER(message)
               
               
-        elif message["type"] == MessageEnum.COORDINATOR.value:
+        elif isinstance(message, CoordinatorMessage):
           self.__message_COORDINATOR(message)
               
   
       except Exception as e:
         print(f"error: {e}")
-        
-      # Reenvia a mensagem ELECTIO se o nó estiver como candidato
-      self.__resend_ELECTION_message()
 
 
   
@@ -0,0 +1,134 @@
+"""
+    Visão versionada dos membros do cluster
+
+    A lista processes_id informada na criação do nó é apenas a visão inicial (versão 0).
+    Apenas o líder altera a visão:
+
+    * admite um nó que ainda não é membro ao receber o seu JOIN_REQUEST ou HEARTBEAT
+    * remove um membro que anunciou a sua saída (LEAVE) ou do qual o DF suspeita
+
+    Cada alteração recebe uma versão maior que todas as já vistas pelo líder e é difundida
+    (VIEW, canal confiável). Os nós instalam apenas visões com versão maior que a atual,
+    portanto cópias atrasadas não desfazem uma alteração. O nó que entra no cluster recebe
+    a visão junto com o estado do líder (JOIN_SNAPSHOT). Um novo líder difunde a sua visão,
+    e um nó com uma visão mais recente que a do líder a envia para o líder (ver Node).
+
+    O DF monitora apenas os membros da visão atual, a eleição utiliza o maior id entre
+    os membros ativos da visão e o nó conta os processos ativos na visão, portanto ids
+    ausentes não são monitorados nem contados.
+"""
+
+import logging
+import threading
+
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class View():
+    """
+    Visão dos membros do cluster em uma versão
+    """
+
+    __slots__ = ("version", "members")
+
+    def __init__(self, version: int, members: Iterable[int]) -> None:
+        self.version: int = version
+        self.members: frozenset[int] = frozenset(members)
+
+
+class Membership():
+    def __init__(self, process_id: int, members: Iterable[int], on_change: Callable[[View], None] | None = None) -> None:
+        """
+        Args:
+            process_id (int): id do processo local, sempre membro da visão inicial
+            members (Iterable[int]): membros da visão inicial (versão 0)
+            on_change (Callable | None): executada com a nova visão sempre que a visão muda,
+            fora do lock, na thread que instalou a visão
+        """
+
+        self._process_id: int = process_id
+        self._view: View = View(0, {*members, process_id})
+
+        # Maior versão já vista, instalada ou não, a próxima alteração utiliza uma versão maior
+        self._latest: int = 0
+        self._on_change: Callable[[View], None] | None = on_change
+
+        self._lock: threading.Lock = threading.Lock()
+
+
+    def view(self) -> View:
+        with self._lock:
+            return self._view
+
+
+    def __contains__(self, process_id: int) -> bool:
+        with self._lock:
+            return process_id in self._view.members
+
+
+    def peers(self) -> list[int]:
+        """
+        Returns:
+            list[int]: membros da visão atual, exceto o próprio processo
+        """
+
+        with self._lock:
+            return sorted(self._view.members - {self._process_id})
+
+
+    def install(self, view: View) -> bool:
+        """
+        Instala uma visão recebida do líder (VIEW ou JOIN_SNAPSHOT)
+
+        Returns:
+            bool: True se a visão foi instalada, False se a versão não é maior que a atual
+        """
+
+        with self._lock:
+            self._latest = max(self._latest, view.version)
+
+            if view.version <= self._view.version:
+                return False
+
+            self._view = view
+
+        self.__notify_change(view)
+
+        return True
+
+
+    def update(self, add: Iterable[int] = (), remove: Iterable[int] = (), force: bool = False) -> View | None:
+        """
+        Altera a visão como líder, com uma versão maior que todas as já vistas
+
+        Args:
+            add (Iterable[int]): ids admitidos
+            remove (Iterable[int]): ids removidos, o próprio processo nunca é removido
+            force (bool): cria uma nova versão mesmo sem alteração (ex.: novo líder)
+
+        Returns:
+            View | None: nova visão, que deve ser difundida, ou None se nada mudou
+        """
+
+        with self._lock:
+            members: frozenset[int] = (self._view.members | set(add)) - (set(remove) - {self._process_id})
+
+            if members == self._view.members and not force:
+                return None
+
+            self._latest += 1
+            self._view = View(self._latest, members)
+            view: View = self._view
+
+        self.__notify_change(view)
+
+        return view
+
+
+    def __notify_change(self, view: View) -> None:
+        logger.info(f"👥 Servidor ID {self._process_id} instalou a visão {view.version}: {sorted(view.members)}")
+
+        if self._on_change is not None:
+            self._on_change(view)
@@ -6,17 +6,31 @@
 
 import logging
 import threading
-import queue
 import time
 from random import randint
+from typing import Callable, Iterable
 
-from .message.Message import Message, MessageEnum, message, handle_message
+from .message.Message import Message, MessageEnum, ClusterConfig, Outbox, PLANES, message
+from .message.Codec import FLAG_RELIABLE, peek_header, peek_message_id, decode_message
+from .message.DuplicateFilter import DuplicateFilter
+from .message.TypedMessage import TypedMessage, LeaderSearchMessage, LeaderAckMessage, JoinRequestMessage, JoinSnapshotMessage, LeaveMessage, ViewMessage
+from .message.Transport import Transport, UdpTransport
+from .message.SharedMemoryTransport import SharedMemoryTransport
+from .message.Reliable import ReliableChannel
 from .DF import DF
+from .Membership import Membership, View
 from .Election import Election
 from .Consensus import Consensus
+from .TotalOrder import TotalOrder
+from .Router import Router
+from .Scheduler import Scheduler, LoopScheduler, TimerHandle
 
 logger = logging.getLogger(__name__)
 
+# Eventos de prontidão do nó, na ordem esperada: primeiro HEARTBEAT enviado, líder
+# conhecido e primeira rodada de consenso decidida
+READY_EVENTS: tuple[str, ...] = ("heartbeat", "leader", "decided")
+
 class Node():
     def __init__(self, 
                  process_id: int, 
@@ -24,47 +38,107 @@ class Node():
                  df_d: int,
                  df_t: int,
                  election_timeout: int,
-                 round: int = 0) -> None:
-        
-        # Eliminas as falhas bizatinas
-        assert(process_id in processes_id)
+                 round: int = 0,
+                 transport: Transport | None = None,
+                 queued_subsystems: tuple[str, ...] = (),
+                 cluster: ClusterConfig | None = None,
+                 planes: tuple[str, ...] | None = None,
+                 scheduler: Scheduler | LoopScheduler | None = None) -> None:
         
         self._process_id: int = process_id
         self._processes_id: list[int] = [id for id in processes_id if id != self._process_id]
+        
+        # Visão versionada dos membros do cluster, processes_id é apenas a visão inicial e
+        # outros ids entram no cluster pelo líder (ver Membership)
+        self._membership: Membership = Membership(process_id, processes_id, on_change=self.__on_view_change)
+        self._announce_view: bool = False
         self.round: int = 0
         
         self._df_d: int = df_d
         self._df_t: int = df_t
         self._election_timeout: int = election_timeout
         
+        # Planos (ver Message.PLANES) recebidos pelo nó, caso None todos. Um observador 
+        # sem "consensus" não participa dos grupos nem trata as mensagens do consenso
+        self._planes: tuple[str, ...] | None = planes
+        
+        # Transporte do nó (UDP nos grupos do cluster por padrão), compartilhado com todos os 
+        # subsistemas. As respostas geradas ao processar uma mensagem recebida são agrupadas pela Outbox
+        self._transport: Outbox = Outbox(transport if transport is not None else self.__default_transport(cluster))
+        
+        # Cópias de mensagens já recebidas (mesmo remetente e id) são descartadas pelo cabeçalho
+        self._duplicates: DuplicateFilter = DuplicateFilter()
+        
+        # Canal confiável (NACK) das mensagens críticas: COORDINATOR, ANSWER, BIZANTINE_DECIDE e LEADER_ACK
+        self._reliable: ReliableChannel = ReliableChannel(self._transport, process_id)
+        
         # Sistema de Detecção de Falhas (DF)
         self._df: DF = None
         
         # Sistema de Eleição utilizando o Algoritmo do Valentão
         self._ele: Election = Election(
             process_id=process_id,
-            processes_id=processes_id,
+            processes_id=sorted(self._membership.view().members),
             timeout=election_timeout,
+            transport=self._transport,
+            reliable=self._reliable,
+            on_leader_change=self.__on_leader_change
         )
         
-        # Threads do sistema 
-        self._main_thread: threading.Thread = None        
-        self._listen_thread: threading.Thread = None
+        # Temporizadores do nó (HEARTBEAT do DF, laço principal, timeout da eleição, prazo do
+        # consenso, pesquisa do líder e lotes da ordem total) executados em uma única thread,
+        # que pode ser compartilhada pelos nós do mesmo processo (ver NodeHost). O AsyncNode
+        # utiliza os temporizadores do seu event loop (LoopScheduler)
+        self._scheduler: Scheduler | LoopScheduler = scheduler if scheduler is not None else Scheduler(name=f"node-{process_id}", daemon=False)
+        self._owns_scheduler: bool = scheduler is None
+        
+        # Temporizadores periódicos do nó (HEARTBEAT do DF e laço principal) e fim da janela de
+        # pesquisa do líder, cancelados por stop() mesmo com o escalonador compartilhado
+        self._df_timer: TimerHandle | None = None
+        self._main_timer: TimerHandle | None = None
+        self._search_timer: TimerHandle | None = None
+        self._stopped: bool = False
+        
+        # Temporizador da eleição em andamento e prazo da rodada de consenso em andamento
+        self._election_timer: TimerHandle | None = None
+        self._consensus_timer: TimerHandle | None = None
+        
+        # O laço principal executa quando a lista de suspeitos do DF ou o líder mudam (ver _wake),
+        # e a cada main_interval segundos apenas como garantia (ex.: cadência do consenso)
+        self._main_interval: float = 2
+        self._main_active: bool = False
+        self._wake_pending: bool = False
+        self._wake_lock: threading.Lock = threading.Lock()
+        
+        self._last_recv_stats: dict = {}
+        
+        # Instante de cada evento de prontidão (READY_EVENTS), em segundos desde a criação do nó,
+        # on_ready(evento, instante) é executada na primeira ocorrência de cada evento
+        self._created: float = time.monotonic()
+        self._ready: dict[str, float] = {}
+        self._ready_lock: threading.Lock = threading.Lock()
+        self.on_ready: Callable[[str, float], None] | None = None
         
         self._is_send_leader_search_message: bool = False
+        self._leader_search_frame: bytes | None = None
+        self._join_frame: bytes | None = None
         self._send_leader_search_message_lock: threading.Lock = threading.Lock()
         
         # Módulo de Consenso
         self.consensus_module = Consensus(self)
+        
+        # Difusão com ordem total sequenciada pelo líder, a aplicação define total_order.on_deliver
+        self.total_order: TotalOrder = TotalOrder(self, scheduler=self._scheduler)
         self._is_send_request_value: bool = False   
         self._send_request_value_lock: threading.Lock = threading.Lock()
         
         # Contador de resposta de valores 
         self._cont_answer_value: int = 0
         
-                        
-        # Fila de mensagens entre listen_thread e thread Node padrão
-        self._message_queue: queue.Queue = queue.Queue()
+        # Roteamento das mensagens recebidas por tipo, os subsistemas em queued_subsystems
+        # ("df", "leader_search", "election", "consensus") possuem fila e thread próprias
+        self._router: Router = Router()
+        self.__register_routes(queued_subsystems)
             
         self.logger = logger
         logger.info(f"✅ Servidor ID {self._process_id}, Rodada {self.round}, Iniciado com Sucesso!")
@@ -72,6 +146,28 @@ class Node():
      
     # Métodos internos do Node
 
+    def __default_transport(self, cluster: ClusterConfig | None) -> Transport:
+        """
+        UDP nos grupos do cluster, ou memória compartilhada entre os nós do mesmo host
+        (cluster.shared_memory) com o UDP para os nós remotos
+        """
+        
+        udp: UdpTransport = UdpTransport(self._process_id, cluster=cluster, planes=self._planes)
+        
+        if cluster is None or cluster.shared_memory is None:
+            return udp
+        
+        local_ids: list[int] = list(cluster.local_ids) if cluster.local_ids is not None else self._processes_id
+        
+        return SharedMemoryTransport(
+            self._process_id,
+            local_ids,
+            fallback=udp,
+            namespace=cluster.shared_memory,
+            remote=any(id not in local_ids for id in self._processes_id)
+        )
+    
+
     def get_node_vote(self) -> int:
         """
         Retorna o voto do nó atual, que é o produto do quadrado do id do nó com o id do nó
@@ -96,7 +192,7 @@ class Node():
         if self._df == None:
             raise Exception("Detctor de falhas não foi iniciado")
         
-        return len(self._processes_id) - len(self._df.suspected_list())
+        return len(self._membership.peers()) - len(self._df.suspected_list())
     
     
     def __list_active_processes(self) -> list[int]:
@@ -110,7 +206,7 @@ class Node():
         if self._df == None:
             raise Exception("Detctor de falhas não foi iniciado")
         
-        return list(set(self._processes_id).difference(set(self._df.suspected_list())))
+        return list(set(self._membership.peers()).difference(set(self._df.suspected_list())))
         
     
     def __leader_is_active(self) -> bool:
@@ -143,48 +239,66 @@ class Node():
         
     # Thread métodos
     
-    def __main_thread_start(self) -> None:
-        self._main_thread.start() 
-        
-        
     def __listen_thread_start(self) -> None:
-        self._listen_thread.start()
+        self._transport.start(self._on_message)
         
         
     # LISTEN THREAD 
     
     def __send_leader_search_message(self, timeout: int) -> None:
+        """
+        Abre a janela de pesquisa do líder, o LEADER_SEARCH é difundido a cada HEARTBEAT 
+        até o fim da janela (timeout segundos) ou até a resposta do líder
+        """
+        
         logger.info(f"❔ Servidor {self._process_id} pergunta para o sitema quem é o líder")
         
         with self._send_leader_search_message_lock:
             self._is_send_leader_search_message = True
+            self._leader_search_frame = None
+            self._join_frame = None
+        
+        self._search_timer = self._scheduler.call_later(timeout, self.__end_leader_search)
         
-        time.sleep(timeout)
         
+    def __end_leader_search(self) -> None:
         with self._send_leader_search_message_lock:
             self._is_send_leader_search_message = False
         
     
     def __send_LEADER_SEARCH(self) -> None:
-        m: bytes = message(
+        # Os reenvios de uma mesma pesquisa mantêm o id da mensagem, e são descartados pelos
+        # nós que já a receberam. O LEADER_ACK utiliza o canal confiável, que recupera as perdas.
+        # O JOIN_REQUEST acompanha a pesquisa, o LEADER_SEARCH é mantido para os nós sem JOIN
+        with self._send_leader_search_message_lock:
+            if self._leader_search_frame is None:
+                self._leader_search_frame = message(
                     message_enum=MessageEnum.LEADER_SEARCH,
                     sender_id=self._process_id,
                     payload="LEADER_SEARCH"
                 )
+                self._join_frame = message(message_enum=MessageEnum.JOIN_REQUEST, sender_id=self._process_id)
+            
+            frames: tuple[bytes, bytes] = (self._join_frame, self._leader_search_frame)
         
-        Message.send_multicast(m)
+        for m in frames:
+            Message.send_multicast(m, sender=self._transport)
         
     
-    def __send_LEADER_ACK(self) -> None:
+    def __send_LEADER_ACK(self, peer_id: int) -> None:
+        """
+        Responde diretamente para o nó que pesquisou o líder
+        """
+        
         logger.info(f"⬆️ Servidor ID {self._process_id} envia uma mensagem identificando que é o líder")
                 
         m_answer: bytes = message(
             message_enum=MessageEnum.LEADER_ACK,
             sender_id=self._process_id,
-            payload=f"LEADER_ACK:{self._ele.get_leader()}"
+            leader=self._ele.get_leader()
         )
                 
-        Message.send_multicast(m_answer)
+        Message.send_to(m_answer, peer_id, sender=self._reliable)
         
     def __send_request_value_message(self, timeout: int) -> None:
         """
@@ -213,17 +327,17 @@ class Node():
         if search:
             self.__send_LEADER_SEARCH()
         
-    def __handle_leader_search_message(self, m: dict) -> None:
+    def __handle_leader_search_message(self, m: TypedMessage) -> None:
         """
         Processa as mensagens recebidas sobre o serviço de pesquisa de líder 
 
         Args:
-            message (bytes): messagem recebida pela rede como o type LEADER_SEARCH ou LEADER_ACK 
+            m (TypedMessage): messagem recebida pela rede como o type LEADER_SEARCH ou LEADER_ACK 
         """
         
-        if m["type"] == MessageEnum.LEADER_SEARCH.value:
+        if isinstance(m, LeaderSearchMessage):
             if self._ele.leader_is_alive():
-               self.__send_LEADER_ACK()
+               self.__send_LEADER_ACK(m.sender_id)
                
         
         # Se um Servidor pedir eleição mas líder está vivo    
@@ -232,8 +346,8 @@ class Node():
         #         self.__send_LEADER_ACK()
                 
                 
-        elif m["type"] == MessageEnum.LEADER_ACK.value and not self._ele.leader_is_alive():
-            leader_id: int = m["payload"].split(":")[1]
+        elif isinstance(m, LeaderAckMessage) and not self._ele.leader_is_alive():
+            leader_id: int = m.leader
             self._ele.set_leader(leader_id)
             logger.info(f"⬇️ Servidor ID {self._process_id} detctou que o Servidor {leader_id} é o atual líder")
             
@@ -241,66 +355,464 @@ class Node():
                 self._is_send_leader_search_message = False
                 
                 
-    def __handle_message(self, message: dict) -> None:
+    def __send_JOIN_SNAPSHOT(self, peer_id: int) -> None:
+        """
+        Responde ao JOIN_REQUEST com o estado do líder: rodada atual (no cabeçalho),
+        última decisão do consenso e visão dos membros, incluindo o líder
+        """
+        
+        view: View = self._membership.view()
+            
+        m: bytes = message(
+            message_enum=MessageEnum.JOIN_SNAPSHOT,
+            sender_id=self._process_id,
+            round=self.round,
+            leader=self._process_id,
+            decided_round=self.consensus_module.decided_round,
+            decided_value=self.consensus_module.decided_value or 0,
+            view=view.version,
+            members=view.members
+        )
+        
+        logger.info(f"📸 Servidor ID {self._process_id} envia o estado do cluster para o Servidor {peer_id}")
+        
+        Message.send_to(m, peer_id, sender=self._reliable)
+        
+        
+    def __install_snapshot(self, m: JoinSnapshotMessage) -> None:
+        """
+        Instala o estado recebido do líder e inicia o laço principal, sem aguardar o 
+        fim da janela de pesquisa do líder
+        """
+        
+        with self._send_leader_search_message_lock:
+            # Cópia atrasada, ou o líder já foi encontrado pelo LEADER_ACK
+            if not self._is_send_leader_search_message:
+                return
+            
+            self._is_send_leader_search_message = False
+            
+        view: View = View(m.view, m.members)
+        members: list[int] = sorted(view.members)
+        
+        self._membership.install(view)
+        
+        if self._df is not None:
+            self._df.install_members(members)
+            
+        if m.round > self.round:
+            self.round = m.round
+            
+        if m.decided_round > 0:
+            self.consensus_module.record_decision(m.decided_round, m.decided_value)
+            
+        logger.info(f"📸 Servidor ID {self._process_id} instalou o estado do líder {m.leader}: rodada {m.round}, ativos {members}")
+        
+        self._ele.set_leader(m.leader)
+        
+        self._main_active = True
+        self._wake()
+        
+        
+    def __handle_join_message(self, m: TypedMessage) -> None:
+        if isinstance(m, JoinRequestMessage):
+            if self._df is not None and self._ele.is_leader():
+                self.__admit(m.sender_id)
+                self.__send_JOIN_SNAPSHOT(m.sender_id)
+                
+        elif isinstance(m, JoinSnapshotMessage):
+            self.__install_snapshot(m)
+            
+            
+    def __handle_leave_message(self, m: TypedMessage) -> None:
+        """
+        Um nó anunciou a sua saída (ver stop): é marcado como suspeito imediatamente e, se 
+        era o líder, o líder é descartado. As duas mudanças acordam o laço principal, que 
+        inicia a eleição sem aguardar o timeout do DF
         """
-        Processa as mensagens recebidas pela camada de transporte
+        
+        if not isinstance(m, LeaveMessage):
+            return
+        
+        logger.info(f"👋 Servidor ID {self._process_id} detectou a saída do Servidor {m.sender_id}")
+        
+        if self._df is not None:
+            self._df.mark_down(m.sender_id)
+            
+        if self._ele.get_leader() == m.sender_id:
+            self._ele.set_leader(None)
+            
+        elif self._ele.is_leader():
+            self.__update_view(remove=[m.sender_id])
+            
+            
+    def __handle_df_message(self, m: TypedMessage) -> None:
+        # HEARTBEATs recebidos antes do início do DF são ignorados
+        if self._df is None:
+            return
+        
+        # Apenas membros da visão são monitorados, o líder admite quem ainda não é membro
+        if m.sender_id not in self._membership:
+            self.__admit(m.sender_id)
+            return
+        
+        self._df.handle_df_message(m)
+            
+            
+    # Visão dos membros
+    
+    def __send_VIEW(self, view: View, peer_id: int | None = None) -> None:
+        m: bytes = message(
+            message_enum=MessageEnum.VIEW,
+            sender_id=self._process_id,
+            version=view.version,
+            members=view.members
+        )
+        
+        if peer_id is None:
+            Message.send_multicast(m, sender=self._reliable)
+        else:
+            Message.send_to(m, peer_id, sender=self._reliable)
+        
+        
+    def __update_view(self, add: Iterable[int] = (), remove: Iterable[int] = (), force: bool = False) -> None:
+        """
+        Altera a visão como líder e difunde a nova versão, se houve alteração
+        """
+        
+        view: View | None = self._membership.update(add, remove, force)
+        
+        if view is not None:
+            self.__send_VIEW(view)
+            
+            
+    def __admit(self, process_id: int) -> None:
+        if self._ele.is_leader():
+            self.__update_view(add=[process_id])
+            
+            
+    def __handle_view_message(self, m: TypedMessage) -> None:
+        if not isinstance(m, ViewMessage):
+            return
+        
+        if self._membership.install(View(m.version, m.members)):
+            # Visão mais recente que a do líder, enviada por um membro: o líder a difunde com uma nova versão
+            if self._ele.is_leader():
+                self._announce_view = True
+                self._wake()
+            
+        elif m.sender_id == self._ele.get_leader() and self._membership.view().version > m.version:
+            # O líder possui uma visão mais antiga (ex.: não era membro quando foi eleito), ou
+            # é uma retransmissão atrasada, que o líder descarta
+            self.__send_VIEW(self._membership.view(), m.sender_id)
+            
+            
+    def __on_view_change(self, view: View) -> None:
+        """
+        O DF passa a monitorar e a eleição a considerar apenas os membros da nova visão
+        """
+        
+        if self._df is not None:
+            self._df.set_members([id for id in view.members if id != self._process_id])
+            
+        self._ele.set_members(sorted(view.members))
+            
+        self._wake()
+            
+            
+    def __register_routes(self, queued_subsystems: tuple[str, ...]) -> None:
+        """
+        Registra no roteador os tipos de mensagem tratados por cada subsistema
+        """
+        
+        routes: list[tuple[str, list[MessageEnum], Callable[[TypedMessage], None]]] = [
+            ("df", [MessageEnum.HEARTBEAT], self.__handle_df_message),
+            ("leave", [MessageEnum.LEAVE], self.__handle_leave_message),
+            ("view", [MessageEnum.VIEW], self.__handle_view_message),
+            ("leader_search", [MessageEnum.LEADER_SEARCH, MessageEnum.LEADER_ACK], self.__handle_leader_search_message),
+            ("join", [MessageEnum.JOIN_REQUEST, MessageEnum.JOIN_SNAPSHOT], self.__handle_join_message),
+            ("election", [MessageEnum.ELECTION, MessageEnum.ANSWER, MessageEnum.COORDINATOR], self._ele.handle_election_message),
+            ("consensus", [MessageEnum.BIZANTINE_START, MessageEnum.BIZANTINE_VOTE, MessageEnum.BIZANTINE_DECIDE], self.consensus_module.handle_message),
+            ("total_order", [MessageEnum.TOB_DATA, MessageEnum.TOB_ORDER], self.total_order.handle_message),
+            ("reliable", [MessageEnum.NACK], self._reliable.handle_nack),
+        ]
+        
+        for subsystem, types, handler in routes:
+            if self._planes is not None:
+                types = [t for t in types if PLANES[t] in self._planes]
+                
+            if types:
+                self._router.register(subsystem, types, handler, queued=subsystem in queued_subsystems)
+            
+            
+    def _periodic_step(self) -> None:
+        """
+        Tarefas periódicas executadas a cada HEARTBEAT do DF: difusão do LEADER_SEARCH
+        durante a pesquisa do líder, reenvio do ELECTION enquanto o nó é candidato,
+        NACKs/reenvios pendentes do canal confiável e lacunas da ordem total
+        """
+        
+        self._mark_ready("heartbeat")
+        self.__diffusion_send_LEADER_SEARCH()
+        self._ele.resend_ELECTION_message()
+        self._reliable.tick()
+        self.total_order.tick()
+        
+        
+    def __handle_message(self, message: TypedMessage) -> None:
+        """
+        Processa as mensagens recebidas pela camada de transporte, a mensagem é
+        entregue apenas aos subsistemas registrados para o seu tipo
 
         Args:
-            message (dict): mensagem que foi recebida pelo sistema 
-            addr (tuple): endereço do remetente (host, port)
+            message (TypedMessage): mensagem que foi recebida pelo sistema 
         """
         # Mensagens do prórpio id são ignoradas 
-        if message.get("sender_id") == self._process_id:
+        if message.sender_id == self._process_id:
             return
         
+        self._router.dispatch(message)
         
-        self._df.handle_df_message(message)
-        self.__handle_leader_search_message(message)
+    def _on_message(self, m: bytes) -> None:
+        """
+        Decodifica e processa uma mensagem recebida pela camada de transporte, 
+        as respostas geradas são agrupadas em um único envio
+
+        Args:
+            m (bytes): mensagem recebida, pode ser uma memoryview do buffer de recebimento
+        """
         
-        self.__diffusion_send_LEADER_SEARCH()
-            
-        self._ele.handle_election_message(message)
+        # Mensagens do próprio id (loopback multicast) e cópias já recebidas são descartadas pelo cabeçalho
+        sender_id: int = peek_header(m)[1]
+        
+        if sender_id == self._process_id:
+            return
         
-        # Put consensus-related messages in the queue for the leader to process
-        if message.get("type") in [
-            MessageEnum.BIZANTINE_START.value,
-            MessageEnum.BIZANTINE_VOTE.value,
-            MessageEnum.BIZANTINE_DECIDE.value,
-        ]:
-            self._message_queue.put(message)
-        self.consensus_module.handle_message(message)
+        msg_id: int | None = peek_message_id(m)
         
-    def __listen_thread(self) -> None:
-        def receive_message(m: bytes):
-            message: dict = handle_message(m)
+        if msg_id is not None and self._duplicates.seen(sender_id, msg_id):
+            return
+        
+        message: TypedMessage = decode_message(m)
+        
+        with self._transport.batch():
+            # Cópias de mensagens do canal confiável já recebidas são descartadas
+            if message.flags & FLAG_RELIABLE and not self._reliable.accept(message):
+                return
             
             self.__handle_message(message)
         
-        Message.recv_multicast(receive_message)
+    def receive_stats(self) -> dict:
+        """
+        Retorna os contadores do recebimento do transporte do nó
 
+        Returns:
+            dict: no UdpTransport received, dropped_kernel, dropped_ring, processed e pending, e
+            duplicate_ids (cópias descartadas pelo id da mensagem)
+        """
         
-    # MAIN THREAD 
+        return {**self._transport.stats(), "duplicate_ids": self._duplicates.stats()["duplicates"]}
     
-    def __main_node_loop_thread(self) -> None:   
-        self.__send_leader_search_message(2)
-        while True:
-            try:
-                if self.__num_active_processes() >= 1:
-                    if not self.__leader_is_active():  
-                        self._ele.set_leader(None)
-                        self._ele.start()
-                    else:
-                        logger.info(f"🫡 Nó {self._ele.get_leader()} é o atual líder")
-                        if self._ele.is_leader():
-                            self.consensus_module.run_leader_consensus()
+    
+    def handler_stats(self) -> dict:
+        """
+        Retorna o tempo de execução dos handlers por tipo de mensagem
+
+        Returns:
+            dict: count, avg_us e max_us por tipo e os descartes das filas dos subsistemas
+        """
+        
+        return self._router.stats()
+    
+    
+    def __log_receive_drops(self) -> None:
+        """
+        Avisa quando datagramas foram descartados desde o último ciclo, permitindo
+        diferenciar HEARTBEATs perdidos de processos falhos
+        """
+        
+        stats: dict = self.receive_stats()
+        
+        for key in ("dropped_kernel", "dropped_ring"):
+            lost: int = stats.get(key, 0) - self._last_recv_stats.get(key, 0)
+            
+            if lost > 0:
+                logger.warning(f"⚠️ Servidor {self._process_id} descartou {lost} datagrama(s) no recebimento ({key})")
                 
-                else:
+        self._last_recv_stats = stats
+
+        
+    # MAIN THREAD 
+    
+    def _update_election_members(self) -> None:
+        """
+        A eleição considera os membros ativos da visão, o maior id entre eles vence 
+        imediatamente, sem aguardar o timeout por membros ausentes
+        """
+        
+        self._ele.set_members([self._process_id, *self.__list_active_processes()])
+        
+        
+    def _start_election(self) -> None:
+        """
+        Inicia uma eleição, o timeout da eleição é um temporizador do escalonador
+        """
+        
+        if self._election_timer is not None:
+            return
+        
+        self._update_election_members()
+        
+        if self._ele.start_nowait():
+            self._election_timer = self._scheduler.call_later(self._election_timeout, self.__election_timeout)
+            
+            
+    def __election_timeout(self) -> None:
+        self._election_timer = None
+        self._ele.election_timeout()
+        
+        
+    def _run_consensus(self) -> None:
+        """
+        Abre uma rodada de consenso como líder, a decisão é um temporizador do escalonador
+        após o prazo da rodada
+        """
+        
+        if self._consensus_timer is not None:
+            return
+        
+        self.consensus_module.start_round()
+        self._consensus_timer = self._scheduler.call_later(self.consensus_module.timeout, self.__decide)
+        
+        
+    def __decide(self) -> None:
+        self._consensus_timer = None
+        
+        with self._transport.batch():
+            self.consensus_module.decide()
+    
+    
+    def _node_step(self) -> None:
+        """
+        Um ciclo da tarefa principal do nó: inicia uma eleição se o líder não estiver 
+        ativo ou executa uma rodada de consenso se o nó for o líder
+        """
+        
+        try:
+            if self.__num_active_processes() >= 1:
+                if not self.__leader_is_active():  
                     self._ele.set_leader(None)
+                    self._start_election()
+                else:
+                    logger.info(f"🫡 Nó {self._ele.get_leader()} é o atual líder")
+                    if self._ele.is_leader():
+                        # Membros suspeitos saem da visão, e são admitidos novamente pelo próximo HEARTBEAT.
+                        # Um novo líder difunde a sua visão
+                        announce, self._announce_view = self._announce_view, False
+                        self.__update_view(add=[self._process_id], remove=self._df.suspected_list(), force=announce)
+                        self._run_consensus()
+            
+            else:
+                self._ele.set_leader(None)
+        except Exception as e:
+            print(f"error: {e}")
+            logger.warning(f"⚠️ Detector de falhas não foi iniciado, não é possível iniciar a tarefa do Servidor")
+        self.__log_receive_drops()
+        logger.info(f"🤝 Servidor {self._process_id} está conectado a {self.__num_active_processes()} outros Servidores")
+    
+    
+    def __on_leader_change(self, leader: int | None) -> None:
+        if leader is not None:
+            self._mark_ready("leader")
+            
+            if leader == self._process_id:
+                self._announce_view = True
+            
+            # Eleição decidida, o timeout pendente não deve bloquear a próxima eleição (ex.: saída do novo líder)
+            if self._ele.current_state.id != "candidate":
+                self._cancel_election_timer()
+            
+        self._wake()
+        
+        
+    def _cancel_election_timer(self) -> None:
+        timer, self._election_timer = self._election_timer, None
+        
+        if timer is not None:
+            timer.cancel()
+        
+        
+    def _mark_ready(self, event: str) -> None:
+        """
+        Registra a primeira ocorrência de um evento de prontidão (ver READY_EVENTS)
+        """
+        
+        with self._ready_lock:
+            if event in self._ready:
+                return
+            
+            elapsed: float = time.monotonic() - self._created
+            self._ready[event] = elapsed
+        
+        if self.on_ready is not None:
+            try:
+                self.on_ready(event, elapsed)
             except Exception as e:
-                print(f"error: {e}")
-                logger.warning(f"⚠️ Detector de falhas não foi iniciado, não é possível iniciar a tarefa do Servidor")
-            logger.info(f"🤝 Servidor {self._process_id} está conectado a {self.__num_active_processes()} outros Servidores")
-            time.sleep(2)
+                logger.error(f"❌ Erro ao informar a prontidão do Servidor {self._process_id}\nException:{e}")
+                
+                
+    def readiness(self) -> dict[str, float]:
+        """
+        Returns:
+            dict[str, float]: instante, em segundos desde a criação do nó, dos eventos de
+            prontidão (READY_EVENTS) já ocorridos
+        """
+        
+        return dict(self._ready)
+        
+        
+    def _wake(self) -> None:
+        """
+        Antecipa um ciclo do laço principal no escalonador, chamado pelo DF (lista de
+        suspeitos mudou) e pela eleição (líder mudou). Vários avisos antes da execução
+        resultam em um único ciclo, e os avisos anteriores ao início do laço principal
+        (janela inicial de pesquisa do líder, até o estado do líder ser instalado) são ignorados
+        """
+        
+        with self._wake_lock:
+            if not self._main_active or self._wake_pending:
+                return
+            
+            self._wake_pending = True
+            
+        self._scheduler.call_soon(self.__wake_step)
+        
+        
+    def __wake_step(self) -> None:
+        with self._wake_lock:
+            self._wake_pending = False
+            
+        self.__main_step()
+        
+        
+    def __df_tick(self) -> None:
+        """
+        Ciclo do DF no escalonador, os envios do ciclo são agrupados
+        """
+        
+        with self._transport.batch():
+            self._df.tick()
+            
+            
+    def __main_step(self) -> None:
+        # Ciclo já enfileirado no escalonador quando o nó saiu (ver stop)
+        if self._stopped:
+            return
+        
+        self._main_active = True
+        
+        with self._transport.batch():
+            self._node_step()
                 
     # Métodos para o APP
 
@@ -310,14 +822,73 @@ class Node():
             d=self._df_d,
             t=self._df_t,
             process_id=self._process_id,
-            processes_list=self._processes_id
+            processes_list=self._membership.peers(),
+            transport=self._transport,
+            autostart=False,
+            on_tick=self._periodic_step,
+            on_change=self._wake
         )
         
-        self._main_thread = threading.Thread(target=self.__main_node_loop_thread)
-        self._listen_thread = threading.Thread(target=self.__listen_thread)
-        
-        self.__main_thread_start()
+        # O recebimento é iniciado antes do primeiro HEARTBEAT (e JOIN_REQUEST), assim o
+        # estado enviado pelo líder não chega antes do socket existir
         self.__listen_thread_start()
+        
+        # HEARTBEATs do DF a cada t, e o laço principal após a janela inicial de pesquisa do
+        # líder, ou assim que o estado do líder for instalado
+        self._df_timer = self._scheduler.call_every(self._df_t, self.__df_tick)
+        self.__send_leader_search_message(2)
+        self._main_timer = self._scheduler.call_every(self._main_interval, self.__main_step, delay=2)
+        
+        self._scheduler.start()
+        
+        
+    def _send_leave(self) -> None:
+        """
+        Anuncia a saída do nó para o cluster. O nó não reenvia mensagens após a saída, 
+        portanto o LEAVE não utiliza o canal confiável: a mesma mensagem (mesmo id) é 
+        enviada duas vezes e a cópia é descartada pelo DuplicateFilter de quem recebeu ambas
+        """
+        
+        m: bytes = message(message_enum=MessageEnum.LEAVE, sender_id=self._process_id)
+        
+        for _ in range(2):
+            Message.send_multicast(m, sender=self._transport)
+            
+        logger.info(f"👋 Servidor ID {self._process_id} anunciou a sua saída do cluster")
+        
+        
+    def stop(self) -> None:
+        """
+        Saída graciosa do nó: encerra os temporizadores, envia os lotes pendentes da 
+        ordem total, anuncia a saída (LEAVE) e encerra o recebimento. Os outros nós 
+        não aguardam o timeout do DF, e se o nó era o líder a eleição começa imediatamente.
+        O escalonador é encerrado apenas se pertencer ao nó (ver NodeHost)
+        """
+        
+        if self._stopped:
+            return
+        
+        self._stopped = True
+        
+        # Os avisos de mudança deixam de acordar o laço principal
+        self._main_active = False
+        
+        for timer in (self._df_timer, self._main_timer, self._search_timer, self._election_timer, self._consensus_timer):
+            if timer is not None:
+                timer.cancel()
+                
+        # Nenhum HEARTBEAT é enviado após o LEAVE
+        if self._owns_scheduler:
+            self._scheduler.stop()
+            
+        self.total_order.flush()
+        self._send_leave()
+        
+        self._transport.stop()
+        self._router.stop()
+        
+        if self._df is not None:
+            self._df.stop()
 
 
     def node_is_leader(self) -> bool:
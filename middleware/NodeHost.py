@@ -0,0 +1,103 @@
+"""
+    Execução de vários nós no mesmo processo
+
+    Cada nó executado por main.py possui um interpretador próprio, com os seus
+    sockets multicast e as suas threads de recebimento e de temporizadores. O NodeHost
+    executa K nós em um único processo compartilhando:
+
+    * o transporte (UdpHub): um socket multicast por grupo e uma thread para os
+      sockets unicast de todos os nós, ver HostTransport
+    * o escalonador (Scheduler): os temporizadores de todos os nós em uma única thread
+
+    Cada nó mantém apenas o seu estado (DF, eleição, consenso, canal confiável) e o
+    seu socket unicast. O protocolo é o mesmo, portanto os nós de um NodeHost
+    interoperam com nós executados em outros processos ou hosts.
+"""
+
+import logging
+
+from .Node import Node
+from .Scheduler import Scheduler
+from .message.Message import ClusterConfig
+from .message.HostTransport import UdpHub
+
+logger = logging.getLogger(__name__)
+
+
+class NodeHost():
+    def __init__(self,
+                 local_ids: list[int],
+                 processes_id: list[int],
+                 df_d: int,
+                 df_t: int,
+                 election_timeout: int,
+                 cluster: ClusterConfig | None = None,
+                 planes: tuple[str, ...] | None = None,
+                 node_cls: type[Node] = Node) -> None:
+        """
+        Args:
+            local_ids (list[int]): ids dos nós executados neste processo
+            processes_id (list[int]): visão inicial dos membros do cluster (ver Membership)
+            df_d (int): tempo máximo de transmissão de mensagens do DF
+            df_t (int): intervalo entre HEARTBEATs do DF
+            election_timeout (int): timeout da eleição
+            cluster (ClusterConfig | None): endereços de rede do cluster, caso None o padrão
+            planes (tuple[str, ...] | None): planos recebidos pelos nós, caso None todos
+            node_cls (type[Node]): classe dos nós (ex.: App de main.py)
+        """
+
+        self._hub: UdpHub = UdpHub(cluster=cluster, planes=planes)
+
+        # Thread única dos temporizadores de todos os nós, mantém o processo em execução
+        self._scheduler: Scheduler = Scheduler(name="node-host", daemon=False)
+
+        self.nodes: dict[int, Node] = {
+            id: node_cls(
+                process_id=id,
+                processes_id=processes_id,
+                df_d=df_d,
+                df_t=df_t,
+                election_timeout=election_timeout,
+                transport=self._hub.transport(id),
+                planes=planes,
+                scheduler=self._scheduler
+            )
+            for id in local_ids
+        }
+
+
+    def start(self) -> None:
+        """
+        Inicia todos os nós do processo
+        """
+
+        for node in self.nodes.values():
+            node.init_node()
+
+        logger.info(f"✅ {len(self.nodes)} Servidores iniciados no mesmo processo: {list(self.nodes)}")
+
+
+    def stop(self) -> None:
+        """
+        Saída graciosa de todos os nós do processo (ver Node.stop), e encerra o
+        escalonador e o transporte compartilhados
+        """
+
+        for node in self.nodes.values():
+            node.stop()
+
+        self._scheduler.stop()
+        self._hub.close()
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: nodes, contadores do recebimento compartilhado (ver UdpHub.stats) e
+            do escalonador (prefixo scheduler_)
+        """
+
+        return {
+            **self._hub.stats(),
+            **{f"scheduler_{k}": v for k, v in self._scheduler.stats().items()},
+        }
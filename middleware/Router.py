@@ -0,0 +1,177 @@
+"""
+    Roteamento das mensagens recebidas para os subsistemas do nó
+
+    Cada subsistema (DF, Eleição, Pesquisa do Líder, Consenso) registra os tipos
+    de mensagem (MessageEnum) que trata, e cada mensagem recebida é entregue
+    apenas aos handlers registrados para o seu tipo, com busca O(1) pelo valor do
+    tipo no cabeçalho. Assim um HEARTBEAT nunca chega ao código da eleição ou do consenso.
+
+    Um subsistema pode ser registrado com uma fila própria (queued=True), sendo os
+    seus handlers executados por uma thread dedicada, sem atrasar os demais subsistemas.
+
+    O tempo de execução dos handlers é medido por tipo de mensagem (ver stats).
+"""
+
+import time
+import queue
+import logging
+import threading
+
+from typing import Callable
+
+from .message.MessageEnum import MessageEnum
+from .message.TypedMessage import TypedMessage
+
+logger = logging.getLogger(__name__)
+
+
+class _TypeStats():
+    __slots__ = ("count", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+
+
+class _SubsystemWorker():
+    """
+    Fila e thread que executam os handlers de um subsistema registrado com queued=True
+    """
+
+    def __init__(self, name: str, maxsize: int, run: Callable[[Callable, TypedMessage], None]) -> None:
+        self.name: str = name
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.dropped: int = 0
+
+        self._run: Callable[[Callable, TypedMessage], None] = run
+        self._thread: threading.Thread = threading.Thread(target=self.__worker_thread, daemon=True)
+        self._thread.start()
+
+
+    def put(self, handler: Callable, m: TypedMessage) -> None:
+        try:
+            self.queue.put_nowait((handler, m))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"⚠️ Fila do subsistema {self.name} cheia, mensagem descartada")
+
+
+    def stop(self) -> None:
+        self.queue.put(None)
+        self._thread.join(timeout=1)
+
+
+    def __worker_thread(self) -> None:
+        while True:
+            item: tuple | None = self.queue.get()
+
+            if item is None:
+                return
+
+            self._run(*item)
+
+
+class Router():
+    def __init__(self) -> None:
+        # valor do tipo -> [(handler, worker do subsistema ou None)]
+        self._routes: dict[int, list[tuple[Callable, _SubsystemWorker | None]]] = {}
+        self._workers: dict[str, _SubsystemWorker] = {}
+
+        self._stats: dict[int, _TypeStats] = {}
+        self._stats_lock: threading.Lock = threading.Lock()
+
+
+    def register(self,
+                 subsystem: str,
+                 types: list[MessageEnum],
+                 handler: Callable[[TypedMessage], None],
+                 queued: bool = False,
+                 queue_size: int = 1024) -> None:
+        """
+        Registra o handler de um subsistema para os tipos de mensagem informados
+
+        Args:
+            subsystem (str): nome do subsistema (ex.: "df", "election")
+            types (list[MessageEnum]): tipos de mensagem tratados pelo handler
+            handler (Callable): função que recebe a mensagem tipada
+            queued (bool): se True o handler é executado pela thread do subsistema
+            queue_size (int): tamanho máximo da fila do subsistema
+        """
+
+        worker: _SubsystemWorker | None = None
+
+        if queued:
+            worker = self._workers.get(subsystem)
+
+            if worker is None:
+                worker = _SubsystemWorker(subsystem, queue_size, self.__run)
+                self._workers[subsystem] = worker
+
+        for message_enum in types:
+            self._routes.setdefault(message_enum.value, []).append((handler, worker))
+
+
+    def dispatch(self, m: TypedMessage) -> None:
+        """
+        Entrega a mensagem aos handlers registrados para o seu tipo
+
+        Args:
+            m (TypedMessage): mensagem recebida
+        """
+
+        for handler, worker in self._routes.get(m.type, ()):
+            if worker is None:
+                self.__run(handler, m)
+            else:
+                worker.put(handler, m)
+
+
+    def __run(self, handler: Callable[[TypedMessage], None], m: TypedMessage) -> None:
+        start: int = time.perf_counter_ns()
+
+        try:
+            handler(m)
+        except Exception as e:
+            logger.error(f"❌ Erro ao processar mensagem {m!r}\nException:{e}")
+
+        elapsed: int = time.perf_counter_ns() - start
+
+        with self._stats_lock:
+            s: _TypeStats | None = self._stats.get(m.type)
+
+            if s is None:
+                s = self._stats[m.type] = _TypeStats()
+
+            s.count += 1
+            s.total_ns += elapsed
+
+            if elapsed > s.max_ns:
+                s.max_ns = elapsed
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: por nome do tipo de mensagem, count, avg_us e max_us dos handlers,
+            e os descartes das filas dos subsistemas em "dropped"
+        """
+
+        with self._stats_lock:
+            res: dict = {
+                MessageEnum(t).name: {
+                    "count": s.count,
+                    "avg_us": s.total_ns / s.count / 1000,
+                    "max_us": s.max_ns / 1000,
+                }
+                for t, s in self._stats.items()
+            }
+
+        res["dropped"] = {name: w.dropped for name, w in self._workers.items()}
+
+        return res
+
+
+    def stop(self) -> None:
+        for worker in self._workers.values():
+            worker.stop()
@@ -0,0 +1,296 @@
+"""
+    Escalonador de temporizadores executado em uma única thread
+
+    O Node possuía uma thread para cada tarefa periódica (HEARTBEAT do DF, laço
+    principal), e a eleição, a pesquisa do líder e o consenso bloqueavam a thread
+    principal com time.sleep. Com o Scheduler os subsistemas registram temporizadores
+    e uma única thread executa os callbacks no horário:
+
+    * call_later: executa uma vez após um atraso (timeout da eleição, prazo do consenso,
+      fim da pesquisa do líder, lote da ordem total)
+    * call_every: executa periodicamente em horários fixos (início + k * intervalo), sem
+      acumular o tempo de execução dos callbacks como um laço com sleep
+    * call_soon: fila de execução, para tarefas enviadas por outras threads (ex.: thread
+      de recebimento)
+
+    Todos os métodos podem ser chamados de qualquer thread. Os callbacks são executados
+    em ordem de horário, um de cada vez, portanto não devem bloquear: uma exceção é
+    registrada no log sem interromper o escalonador.
+
+    O LoopScheduler oferece call_later e call_soon sobre um event loop asyncio, para os
+    subsistemas compartilhados com o Node (ex.: lotes da TotalOrder) no AsyncNode, sem
+    uma thread de escalonador.
+"""
+
+import time
+import asyncio
+import heapq
+import logging
+import threading
+import itertools
+
+from collections import deque
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle():
+    """
+    Temporizador registrado no Scheduler, pode ser cancelado antes da execução
+    """
+
+    __slots__ = ("when", "interval", "callback", "args", "cancelled")
+
+    def __init__(self, when: float, interval: float | None, callback: Callable, args: tuple) -> None:
+        self.when: float = when
+        self.interval: float | None = interval
+        self.callback: Callable = callback
+        self.args: tuple = args
+        self.cancelled: bool = False
+
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Scheduler():
+    def __init__(self, name: str = "scheduler", daemon: bool = True) -> None:
+        """
+        Args:
+            name (str): nome da thread do escalonador
+            daemon (bool): se False a thread mantém o processo em execução (ex.: thread
+            principal do Node)
+        """
+
+        self._name: str = name
+        self._daemon: bool = daemon
+
+        # Temporizadores (horário, ordem de registro, temporizador) e fila de execução
+        self._timers: list[tuple[float, int, TimerHandle]] = []
+        self._ready: deque[tuple[Callable, tuple]] = deque()
+        self._order: itertools.count = itertools.count()
+        self._cond: threading.Condition = threading.Condition()
+
+        self._thread: threading.Thread | None = None
+        self._running: bool = False
+
+        self._stats: dict[str, float] = {
+            "timers": 0,
+            "callbacks": 0,
+            "errors": 0,
+            "late_max_ms": 0.0,
+            "late_total_ms": 0.0,
+        }
+
+
+    # Registro
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """
+        Executa callback(*args) uma vez após delay segundos
+        """
+
+        return self.__schedule(TimerHandle(time.monotonic() + delay, None, callback, args))
+
+
+    def call_every(self, interval: float, callback: Callable, *args, delay: float = 0.0) -> TimerHandle:
+        """
+        Executa callback(*args) a cada interval segundos, a primeira vez após delay segundos.
+        Se um callback atrasar mais de um intervalo, as execuções perdidas não são repetidas
+        """
+
+        return self.__schedule(TimerHandle(time.monotonic() + delay, interval, callback, args))
+
+
+    def call_soon(self, callback: Callable, *args) -> None:
+        """
+        Executa callback(*args) na thread do escalonador, após as tarefas já na fila
+        """
+
+        with self._cond:
+            self._ready.append((callback, args))
+            self._cond.notify()
+
+
+    def __schedule(self, handle: TimerHandle) -> TimerHandle:
+        with self._cond:
+            heapq.heappush(self._timers, (handle.when, next(self._order), handle))
+
+            # Acorda a thread apenas se o novo temporizador for o próximo
+            if self._timers[0][2] is handle:
+                self._cond.notify()
+
+        return handle
+
+
+    # Execução
+
+    def start(self) -> None:
+        """
+        Inicia a thread do escalonador
+        """
+
+        with self._cond:
+            if self._thread is not None:
+                return
+
+            self._running = True
+            self._thread = threading.Thread(target=self.__loop, name=self._name, daemon=self._daemon)
+
+        self._thread.start()
+
+
+    def stop(self) -> None:
+        """
+        Encerra a thread do escalonador, os temporizadores pendentes não são executados
+        """
+
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+            thread, self._thread = self._thread, None
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+
+
+    def run_forever(self) -> None:
+        """
+        Executa os temporizadores e a fila na thread atual até stop()
+        """
+
+        with self._cond:
+            self._running = True
+
+        self.__loop()
+
+
+    def __loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._ready:
+                    if not self._timers:
+                        self._cond.wait()
+                        continue
+
+                    wait: float = self._timers[0][0] - time.monotonic()
+
+                    if wait <= 0:
+                        break
+
+                    self._cond.wait(wait)
+
+                if not self._running:
+                    return
+
+                now: float = time.monotonic()
+                batch: list[tuple[Callable, tuple]] = list(self._ready)
+                self._ready.clear()
+
+                while self._timers and self._timers[0][0] <= now:
+                    _, _, handle = heapq.heappop(self._timers)
+
+                    if handle.cancelled:
+                        continue
+
+                    late: float = (now - handle.when) * 1000
+
+                    self._stats["timers"] += 1
+                    self._stats["late_total_ms"] += late
+                    self._stats["late_max_ms"] = max(self._stats["late_max_ms"], late)
+
+                    if handle.interval is not None:
+                        # Horários fixos, pulando os perdidos
+                        handle.when += handle.interval * max(1, -(-(now - handle.when) // handle.interval))
+                        heapq.heappush(self._timers, (handle.when, next(self._order), handle))
+
+                    batch.append((self.__run_timer, (handle,)))
+
+            for callback, args in batch:
+                self.__run(callback, args)
+
+
+    def __run_timer(self, handle: TimerHandle) -> None:
+        # Cancelado por um callback anterior do mesmo lote
+        if not handle.cancelled:
+            handle.callback(*handle.args)
+
+
+    def __run(self, callback: Callable, args: tuple) -> None:
+        try:
+            callback(*args)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"❌ Erro ao executar tarefa do escalonador\nException:{e}")
+        finally:
+            self._stats["callbacks"] += 1
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: timers (temporizadores executados), callbacks, errors, late_max_ms e
+            late_avg_ms (atraso da execução em relação ao horário, o jitter do escalonador)
+            e pending (temporizadores registrados)
+        """
+
+        with self._cond:
+            stats: dict = dict(self._stats)
+            stats["late_avg_ms"] = stats.pop("late_total_ms") / max(stats["timers"], 1)
+            stats["pending"] = len(self._timers)
+
+        return stats
+
+
+class LoopScheduler():
+    """
+    Temporizadores de um event loop com a interface do Scheduler (call_later, call_soon e
+    TimerHandle.cancel). Deve ser associado ao event loop (bind) antes do primeiro uso
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """
+        Executa callback(*args) uma vez após delay segundos, no event loop
+        """
+
+        handle: TimerHandle = TimerHandle(time.monotonic() + delay, None, callback, args)
+
+        # Os temporizadores do event loop só podem ser registrados na thread do event loop
+        if self.__in_loop():
+            self._loop.call_later(delay, self.__run_timer, handle)
+        else:
+            self._loop.call_soon_threadsafe(self._loop.call_later, delay, self.__run_timer, handle)
+
+        return handle
+
+
+    def call_soon(self, callback: Callable, *args) -> None:
+        """
+        Executa callback(*args) no event loop, pode ser chamado de qualquer thread
+        """
+
+        self._loop.call_soon_threadsafe(callback, *args)
+
+
+    def __in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+    @staticmethod
+    def __run_timer(handle: TimerHandle) -> None:
+        # O cancelamento apenas marca o temporizador, que pode ter sido cancelado por outra thread
+        if not handle.cancelled:
+            handle.callback(*handle.args)
@@ -0,0 +1,381 @@
+"""
+    Difusão com ordem total sequenciada pelo líder
+
+    Qualquer nó difunde uma mensagem (TOB_DATA) para o grupo, e o líder eleito atribui
+    a ela um número de sequência global, anunciado em TOB_ORDER. Os nós guardam as
+    mensagens e as entregam para a aplicação (on_deliver) estritamente na ordem das
+    sequências, portanto todos os nós entregam as mesmas mensagens na mesma ordem,
+    permitindo construir serviços replicados sobre o cluster.
+
+    * Sob carga o líder agrupa as atribuições: um TOB_ORDER carrega até max_batch
+      entradas, enviado quando o lote enche ou batch_delay segundos após a primeira
+      entrada pendente
+    * TOB_DATA e TOB_ORDER utilizam o canal confiável do nó (ver Reliable), as perdas
+      são recuperadas por NACK
+    * A sequência pertence à visão (líder, época do líder). Cada nó entrega pela visão
+      do líder que conhece, guardando as sequências das outras visões recentes, assim
+      uma troca de líder (ou um líder que volta) não perde o progresso. O novo líder
+      sequencia as mensagens ainda não entregues, e uma mensagem já entregue em outra
+      visão não é entregue novamente
+    * Uma lacuna que não é recuperada em max_stall_ticks ticks é pulada, evitando que
+      uma perda definitiva bloqueie as entregas
+
+    A ordem é total dentro de uma visão. Mensagens em trânsito durante a troca de líder
+    podem ser entregues em ordens diferentes por nós que seguiam visões diferentes.
+"""
+
+import logging
+import threading
+
+from collections import OrderedDict
+from typing import Callable
+
+from .message.Message import Message, message
+from .message.MessageEnum import MessageEnum
+from .message.TypedMessage import TypedMessage, TobDataMessage, TobOrderMessage
+from .Scheduler import Scheduler, LoopScheduler, TimerHandle
+
+logger = logging.getLogger(__name__)
+
+# Identificador de uma mensagem difundida: (sender_id, época do remetente, id local)
+Key = tuple[int, int, int]
+
+# Visão da sequência: (id do líder, época do líder)
+View = tuple[int, int]
+
+
+class _ViewState():
+    """
+    Sequências recebidas de uma visão e a próxima a entregar
+    """
+
+    __slots__ = ("order", "next", "last_next", "stall")
+
+    def __init__(self) -> None:
+        self.order: dict[int, Key] = {}
+        self.next: int = 1
+
+        self.last_next: int = 1
+        self.stall: int = 0
+
+
+class TotalOrder():
+    def __init__(self,
+                 node,
+                 on_deliver: Callable[[int, str], None] | None = None,
+                 max_batch: int = 64,
+                 batch_delay: float = 0.005,
+                 max_stall_ticks: int = 5,
+                 history: int = 4096,
+                 max_views: int = 4,
+                 scheduler: Scheduler | LoopScheduler | None = None) -> None:
+        """
+        Args:
+            node (Node): nó ao qual o serviço pertence, utiliza o seu canal confiável
+            e o líder da sua eleição
+            on_deliver (Callable[[int, str], None] | None): recebe (sender_id, payload)
+            de cada mensagem, na ordem total
+            max_batch (int): máximo de atribuições por TOB_ORDER
+            batch_delay (float): espera máxima do líder para completar um lote, em segundos
+            max_stall_ticks (int): ticks sem progresso antes de pular uma lacuna
+            history (int): ids de mensagens entregues lembrados para descartar duplicadas
+            max_views (int): visões recentes guardadas
+            scheduler (Scheduler | LoopScheduler | None): escalonador do nó para o temporizador
+            dos lotes (LoopScheduler no AsyncNode), caso None cada lote utiliza um threading.Timer
+        """
+
+        self.node = node
+        self.on_deliver: Callable[[int, str], None] | None = on_deliver
+
+        self._max_batch: int = max_batch
+        self._batch_delay: float = batch_delay
+        self._max_stall_ticks: int = max_stall_ticks
+        self._history: int = history
+        self._max_views: int = max_views
+        self._scheduler: Scheduler | LoopScheduler | None = scheduler
+
+        self._lock: threading.Lock = threading.Lock()
+
+        # Entregas para a aplicação são feitas uma de cada vez, na ordem
+        self._deliver_lock: threading.RLock = threading.RLock()
+
+        self._local_id: int = 0
+
+        # Mensagens recebidas e ainda não entregues
+        self._data: dict[Key, str] = {}
+        self._delivered: OrderedDict[Key, None] = OrderedDict()
+
+        # Visões recentes e a época mais recente de cada líder
+        self._views: OrderedDict[View, _ViewState] = OrderedDict()
+        self._epochs: dict[int, int] = {}
+        self._last_view: View | None = None
+
+        # Sequenciador (apenas no líder), na visão do próprio nó
+        self._seq: int = 1
+        self._assigned: set[Key] = set()
+        self._pending: list[Key] = []
+        self._timer: TimerHandle | threading.Timer | None = None
+
+        self._stats: dict[str, int] = {
+            "broadcast": 0,
+            "delivered": 0,
+            "orders": 0,
+            "ordered": 0,
+            "skipped": 0,
+        }
+
+
+    # Metadados
+
+    def __is_leader(self) -> bool:
+        return self.node._ele.get_leader() == self.node._process_id
+
+
+    def __current(self) -> _ViewState | None:
+        """
+        Visão seguida pelo nó: a do líder conhecido ou, sem líder, a última que enviou TOB_ORDER
+        """
+
+        leader: int | None = self.node._ele.get_leader()
+
+        if leader is None:
+            view: View | None = self._last_view
+        elif leader in self._epochs:
+            view = (leader, self._epochs[leader])
+        else:
+            return None
+
+        return self._views.get(view)
+
+
+    # Envio
+
+    def broadcast(self, payload: str) -> None:
+        """
+        Difunde uma mensagem para todos os nós, entregue (inclusive neste nó) na ordem total
+
+        Args:
+            payload (str): conteúdo da mensagem
+        """
+
+        with self._lock:
+            self._local_id += 1
+
+            key: Key = (self.node._process_id, self.node._reliable.epoch, self._local_id)
+
+            self._data[key] = payload
+            self._stats["broadcast"] += 1
+
+        m: bytes = message(
+            message_enum=MessageEnum.TOB_DATA,
+            sender_id=self.node._process_id,
+            data_epoch=key[1],
+            local_id=key[2],
+            payload=payload
+        )
+
+        Message.send_multicast(m, sender=self.node._reliable)
+
+        self.__submit(key)
+
+
+    # Recebimento
+
+    def handle_message(self, msg: TypedMessage) -> None:
+        if isinstance(msg, TobDataMessage):
+            key: Key = (msg.sender_id, msg.data_epoch, msg.local_id)
+
+            with self._lock:
+                if key in self._delivered:
+                    return
+
+                self._data[key] = msg.payload
+
+            self.__submit(key)
+            self.__deliver()
+
+        elif isinstance(msg, TobOrderMessage):
+            with self._lock:
+                self.__apply_order((msg.sender_id, msg.epoch), msg.first, msg.entries)
+
+            self.__deliver()
+
+
+    def __apply_order(self, view: View, first: int, entries: tuple) -> None:
+        """
+        Registra as sequências de um TOB_ORDER na sua visão
+        """
+
+        state: _ViewState | None = self._views.get(view)
+
+        if state is None:
+            state = self._views[view] = _ViewState()
+
+            if len(self._views) > self._max_views:
+                self._views.popitem(last=False)
+
+        self._epochs[view[0]] = view[1]
+        self._last_view = view
+
+        for i, entry in enumerate(entries):
+            seq: int = first + i
+
+            if seq >= state.next:
+                state.order[seq] = tuple(entry)
+
+
+    # Sequenciador
+
+    def __submit(self, key: Key) -> None:
+        """
+        No líder, reserva uma sequência para a mensagem no próximo lote
+        """
+
+        if not self.__is_leader():
+            return
+
+        flush: bool = False
+
+        with self._lock:
+            if key in self._assigned or key in self._delivered:
+                return
+
+            self._assigned.add(key)
+            self._pending.append(key)
+
+            if len(self._pending) >= self._max_batch:
+                flush = True
+            elif self._timer is None and self._scheduler is not None:
+                self._timer = self._scheduler.call_later(self._batch_delay, self.flush)
+            elif self._timer is None:
+                self._timer = threading.Timer(self._batch_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush:
+            self.flush()
+
+
+    def flush(self) -> None:
+        """
+        Envia o TOB_ORDER com as atribuições pendentes do líder
+        """
+
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            batches: list[tuple[int, list[Key]]] = []
+
+            while self._pending:
+                batch, self._pending = self._pending[:self._max_batch], self._pending[self._max_batch:]
+                batches.append((self._seq, batch))
+
+                self.__apply_order((self.node._process_id, self.node._reliable.epoch), self._seq, tuple(batch))
+
+                self._seq += len(batch)
+                self._stats["orders"] += 1
+                self._stats["ordered"] += len(batch)
+
+        for first, batch in batches:
+            m: bytes = message(
+                message_enum=MessageEnum.TOB_ORDER,
+                sender_id=self.node._process_id,
+                first=first,
+                entries=batch
+            )
+
+            Message.send_multicast(m, sender=self.node._reliable)
+
+        self.__deliver()
+
+
+    # Entrega
+
+    def __deliver(self) -> None:
+        with self._deliver_lock:
+            ready: list[tuple[int, str]] = []
+
+            with self._lock:
+                state: _ViewState | None = self.__current()
+
+                while state is not None and state.next in state.order:
+                    key: Key = state.order[state.next]
+
+                    if key not in self._delivered:
+                        payload: str | None = self._data.get(key)
+
+                        # Aguarda o TOB_DATA da sequência
+                        if payload is None:
+                            break
+
+                        ready.append((key[0], payload))
+
+                        self._delivered[key] = None
+
+                        if len(self._delivered) > self._history:
+                            self._delivered.popitem(last=False)
+
+                    self._data.pop(key, None)
+                    self._assigned.discard(key)
+                    del state.order[state.next]
+                    state.next += 1
+
+                self._stats["delivered"] += len(ready)
+
+            if self.on_deliver is not None:
+                for sender_id, payload in ready:
+                    try:
+                        self.on_deliver(sender_id, payload)
+                    except Exception as e:
+                        logger.error(f"❌ Erro ao entregar mensagem ordenada\nException:{e}")
+
+
+    def tick(self) -> None:
+        """
+        Executado periodicamente pelo nó: o líder sequencia as mensagens que ainda
+        não possuem sequência (ex.: recebidas antes de assumir a liderança), e
+        uma lacuna sem progresso por max_stall_ticks ticks é pulada
+        """
+
+        if self.__is_leader():
+            with self._lock:
+                unassigned: list[Key] = [k for k in self._data if k not in self._assigned]
+
+            for key in unassigned:
+                self.__submit(key)
+
+        with self._lock:
+            state: _ViewState | None = self.__current()
+
+            if state is not None:
+                blocked: bool = bool(state.order) and state.next == state.last_next
+
+                state.stall = state.stall + 1 if blocked else 0
+                state.last_next = state.next
+
+                if state.stall > self._max_stall_ticks:
+                    # TOB_DATA perdido pula apenas a sua sequência, TOB_ORDER perdido pula até a próxima conhecida
+                    skip: int = state.next + 1 if state.next in state.order else min(state.order)
+
+                    logger.warning(f"⚠️ Servidor ID {self.node._process_id} pula as sequências {state.next}..{skip - 1} da ordem total")
+
+                    self._stats["skipped"] += skip - state.next
+                    state.order.pop(state.next, None)
+                    state.next = skip
+                    state.last_next = skip
+                    state.stall = 0
+
+        self.__deliver()
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: broadcast, delivered, orders, ordered (entradas sequenciadas pelo nó),
+            skipped e pending (mensagens aguardando entrega)
+        """
+
+        with self._lock:
+            return {**self._stats, "pending": len(self._data)}
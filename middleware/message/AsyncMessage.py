@@ -0,0 +1,248 @@
+"""
+   Transporte assíncrono (asyncio) para envio e recebimento de mensagens multicast
+
+   Substitui o laço bloqueante de Message.recv_multicast por um endpoint de datagramas
+   do asyncio (loop.create_datagram_endpoint), permitindo que vários nós executem no
+   mesmo event loop sem uma thread de escuta por nó.
+
+   Utiliza o mesmo formato de mensagens (Codec) e os mesmos tipos de MessageEnum,
+   portanto nós assíncronos e nós baseados em threads se comunicam normalmente.
+"""
+
+import asyncio
+import logging
+import itertools
+import random
+
+from typing import Callable
+
+from .Codec import split_datagram, fragment
+from .Message import Message, ClusterConfig, PeerBook, route, DEFAULT_CLUSTER, UNICAST_IP, MULTICAST_GROUP, MUSTICAST_PORT, RECV_BUFFER_SIZE
+from .Reassembler import Reassembler
+from .Transport import Transport
+
+logger = logging.getLogger(__name__)
+
+
+class MulticastProtocol(asyncio.DatagramProtocol):
+    """
+    Protocolo de datagramas que entrega cada mensagem recebida para a função f
+    """
+
+    def __init__(self, f: Callable[[bytes], None]) -> None:
+        self._f: Callable[[bytes], None] = f
+        self._reassembler: Reassembler = Reassembler()
+
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        try:
+            data = self._reassembler.feed(data)
+
+            if data is None:
+                return
+
+            messages: list[bytes] = split_datagram(data)
+        except ValueError as e:
+            logger.warning(f"⚠️ Datagrama inválido recebido de {addr}: {e}")
+            return
+
+        for m in messages:
+            self._f(m)
+
+
+    def error_received(self, exc: Exception) -> None:
+        logger.error(f"❌ Erro no transporte multicast\nException:{exc}")
+
+
+class AsyncMulticastSender():
+    """
+    Remetente que envia as mensagens pelo transporte do asyncio, possui a mesma
+    interface de envio do MulticastSender. O transporte é associado quando o
+    endpoint é criado no event loop (ver create_multicast_endpoint)
+    """
+
+    def __init__(self, 
+                 group: str = MULTICAST_GROUP, 
+                 port: int = MUSTICAST_PORT, 
+                 mtu: int = RECV_BUFFER_SIZE,
+                 peers: PeerBook | None = None,
+                 routes: dict[int, tuple[str, int]] | None = None) -> None:
+        """
+        Args:
+            group (str): grupo multicast de destino
+            port (int): porta multicast de destino
+            mtu (int): tamanho máximo de um datagrama, mensagens maiores são fragmentadas
+            peers (PeerBook | None): endereços unicast dos nós utilizados por send_to
+            routes (dict[int, tuple[str, int]] | None): grupo de destino por valor do tipo
+            de mensagem (ver ClusterConfig.routes), os outros tipos são enviados para group
+        """
+
+        self._group: tuple = (group, port)
+        self._routes: dict[int, tuple[str, int]] = routes or {}
+        self._mtu: int = mtu
+        self._peers: PeerBook = peers if peers is not None else PeerBook()
+        self._transport: asyncio.DatagramTransport | None = None
+
+        self._fragment_ids: itertools.count = itertools.count(random.getrandbits(32))
+
+
+    def attach(self, transport: asyncio.DatagramTransport) -> None:
+        self._transport = transport
+
+
+    def __sendto(self, message: bytes, address: tuple) -> bool:
+        if self._transport is None or self._transport.is_closing():
+            logger.error("❌ Não foi possível enviar os dados\nException: transporte assíncrono não iniciado")
+            return False
+
+        if len(message) > self._mtu:
+            for d in fragment(message, next(self._fragment_ids), self._mtu):
+                self._transport.sendto(d, address)
+        else:
+            self._transport.sendto(message, address)
+
+        return True
+
+
+    def send(self, message: bytes) -> bool:
+        return self.__sendto(message, route(message, self._routes, self._group))
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        return self.__sendto(message, (ip, port))
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        return self.__sendto(message, self._peers.address(peer_id))
+
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+async def create_multicast_endpoint(f: Callable[[bytes], None],
+                                    sender: AsyncMulticastSender | None = None,
+                                    cluster: ClusterConfig | None = None,
+                                    address: tuple[str, int] | None = None) -> asyncio.DatagramTransport:
+    """
+    Cria um endpoint multicast no event loop atual, cada mensagem recebida é
+    entregue para f
+
+    Args:
+        f (Callable): função de primeira ordem com as operações que devem
+        ser feita com cada mensagem
+        sender (AsyncMulticastSender | None): remetente que passa a enviar pelo endpoint criado
+        cluster (ClusterConfig | None): cluster cujo grupo é escutado, caso None utiliza o cluster padrão
+        address (tuple[str, int] | None): grupo de um plano do cluster, caso None o grupo do cluster
+
+    Returns:
+        asyncio.DatagramTransport: transporte do endpoint
+    """
+
+    sock = Message.create_socket_multicast(cluster, address)
+    sock.setblocking(False)
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: MulticastProtocol(f),
+        sock=sock
+    )
+
+    if sender is not None:
+        sender.attach(transport)
+
+    return transport
+
+
+async def create_unicast_endpoint(f: Callable[[bytes], None], address: tuple[str, int]) -> asyncio.DatagramTransport:
+    """
+    Cria o endpoint onde o nó recebe as mensagens enviadas diretamente para ele (send_to)
+
+    Args:
+        f (Callable): função de primeira ordem com as operações que devem
+        ser feita com cada mensagem
+        address (tuple[str, int]): endereço unicast do nó (ver PeerBook)
+
+    Returns:
+        asyncio.DatagramTransport: transporte do endpoint
+    """
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: MulticastProtocol(f),
+        local_addr=address
+    )
+
+    return transport
+
+
+class AsyncUdpTransport(Transport):
+    """
+    Transporte UDP sobre o event loop do asyncio: endpoint multicast do grupo e
+    endpoint unicast do nó, com envio pelo AsyncMulticastSender
+    """
+
+    def __init__(self,
+                 process_id: int,
+                 cluster: ClusterConfig | None = None,
+                 peers: PeerBook | None = None,
+                 sender: AsyncMulticastSender | None = None,
+                 planes: tuple[str, ...] | None = None) -> None:
+        """
+        Args:
+            process_id (int): id do nó, define o endereço unicast onde o nó escuta
+            cluster (ClusterConfig | None): grupo e porta do cluster, caso None utiliza o cluster padrão
+            peers (PeerBook | None): endereços unicast dos nós, caso None utiliza os do cluster
+            sender (AsyncMulticastSender | None): remetente assíncrono, caso None é criado um para o cluster
+            planes (tuple[str, ...] | None): planos recebidos pelo nó, caso None todos
+        """
+
+        self._process_id: int = process_id
+        self._cluster: ClusterConfig = cluster if cluster is not None else DEFAULT_CLUSTER
+        self._peers: PeerBook = peers if peers is not None else self._cluster.peers()
+        self._sender: AsyncMulticastSender = sender if sender is not None else AsyncMulticastSender(
+            group=self._cluster.group,
+            port=self._cluster.port,
+            peers=self._peers,
+            routes=self._cluster.routes()
+        )
+        self._planes: tuple[str, ...] | None = planes
+
+        self._endpoints: list[asyncio.DatagramTransport] = []
+
+
+    def send(self, message: bytes) -> bool:
+        return self._sender.send(message)
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        return self._sender.send_to(peer_id, message)
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        return self._sender.send_unicast(message, port, ip)
+
+
+    def start(self, f: Callable[[bytes], None]) -> None:
+        raise RuntimeError("AsyncUdpTransport deve ser iniciado com astart dentro de um event loop")
+
+
+    async def astart(self, f: Callable[[bytes], None]) -> None:
+        # O remetente envia pelo endpoint do primeiro grupo, para qualquer grupo do cluster
+        for i, address in enumerate(self._cluster.addresses(self._planes)):
+            self._endpoints.append(
+                await create_multicast_endpoint(f, sender=self._sender if i == 0 else None, cluster=self._cluster, address=address)
+            )
+
+        self._endpoints.append(await create_unicast_endpoint(f, self._peers.address(self._process_id)))
+
+
+    def stop(self) -> None:
+        for endpoint in self._endpoints:
+            endpoint.close()
+
+        self._endpoints = []
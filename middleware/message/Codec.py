@@ -0,0 +1,765 @@
+"""
+   Codificação binária das mensagens trocadas entre os nós
+
+   Cada datagrama possui um cabeçalho de tamanho fixo seguido pelo payload:
+
+        +---------+------+-------+-----------+--------------+-------------+
+        | versão  | tipo | flags | sender_id | round/termo  | tam. payload|
+        |   B     |  B   |   B   |     I     |      I       |      I      |
+        +---------+------+-------+-----------+--------------+-------------+
+
+   O payload de cada MessageEnum possui um layout tipado (ex.: LEADER_ACK carrega
+   o id do líder como inteiro, BIZANTINE_VOTE carrega o voto), assim os handlers
+   não precisam mais interpretar strings como "LEADER_ACK:7" ou "3:48200".
+
+   Datagramas JSON legados (que começam com '{') continuam sendo decodificados,
+   permitindo a atualização gradual dos nós do sistema.
+
+   Como o cabeçalho informa o tamanho do payload, várias mensagens binárias podem
+   ser concatenadas em um único datagrama (batch) e separadas novamente no recebimento.
+   O payload de uma mensagem é limitado a MAX_PAYLOAD_SIZE (ver encode), o tamanho no
+   cabeçalho (I) conta também as extensões. A versão 1 do formato utilizava H para o
+   tamanho, limitando as mensagens a 64 KiB, e não é mais aceita.
+
+   Mensagens maiores que o tamanho máximo de um datagrama são divididas em fragmentos,
+   cada um com o cabeçalho próprio:
+
+        +---------+-----------+--------+--------+------------+--------------+
+        | prefixo | sender_id | msg_id | índice | quantidade | tamanho total|
+        |   B     |     I     |   I    |   H    |     H      |      I       |
+        +---------+-----------+--------+--------+------------+--------------+
+
+   e remontadas no recebimento pelo Reassembler.
+
+   No recebimento cada mensagem é decodificada uma única vez por decode_message em um
+   objeto tipado (ver TypedMessage), compartilhado por todos os subsistemas do nó.
+
+   Payloads a partir do limite configurado em configure_compression são comprimidos
+   com zlib e marcados com FLAG_COMPRESSED nas flags do cabeçalho (ver Compression),
+   o tamanho do payload no cabeçalho é o tamanho comprimido.
+
+   Mensagens do canal confiável (ver Reliable) possuem a flag FLAG_RELIABLE e uma
+   extensão entre o cabeçalho e o payload, contada no tamanho do payload:
+
+        +---------+-----------+
+        |  época  | sequência |
+        |    I    |     I     |
+        +---------+-----------+
+
+   FLAG_DIRECT indica que a sequência é a das mensagens direcionadas ao nó de destino.
+
+   Cada mensagem binária recebe em encode um id do remetente (FLAG_MESSAGE_ID), em uma
+   extensão logo após o cabeçalho (antes da extensão do canal confiável), contada no
+   tamanho do payload:
+
+        +--------+
+        | msg_id |
+        |   I    |
+        +--------+
+
+   Os reenvios da mesma mensagem codificada (retransmissões do canal confiável, repetições
+   do ELECTION e do LEADER_SEARCH) mantêm o id, e as cópias são descartadas no recebimento
+   pelo cabeçalho, antes da decodificação (ver peek_message_id e DuplicateFilter).
+"""
+
+import json
+import random
+import struct
+import itertools
+
+from .Compression import Compression, FLAG_COMPRESSED, MAX_PAYLOAD_SIZE
+from .MessageEnum import MessageEnum
+from .TypedMessage import MESSAGE_CLASSES, TypedMessage
+
+
+WIRE_VERSION: int = 2
+
+# versão, tipo, flags, sender_id, round/termo, tamanho do payload
+HEADER: struct.Struct = struct.Struct("!BBBIII")
+HEADER_SIZE: int = HEADER.size
+
+# Apenas o tipo e o sender_id do cabeçalho, lidos sem decodificar a mensagem
+_TYPE_SENDER: struct.Struct = struct.Struct("!xBxI")
+
+# Primeiro byte de um datagrama JSON legado
+LEGACY_JSON_PREFIX: int = ord("{")
+
+# Primeiro byte de um fragmento: prefixo, sender_id, msg_id, índice, quantidade, tamanho total
+FRAGMENT_PREFIX: int = 0xF1
+FRAGMENT_HEADER: struct.Struct = struct.Struct("!BIIHHI")
+FRAGMENT_HEADER_SIZE: int = FRAGMENT_HEADER.size
+
+# Canal confiável: flags do cabeçalho e extensão época, sequência
+FLAG_RELIABLE: int = 0x02
+FLAG_DIRECT: int = 0x04
+RELIABLE_HEADER: struct.Struct = struct.Struct("!II")
+RELIABLE_HEADER_SIZE: int = RELIABLE_HEADER.size
+
+# Id da mensagem: flag do cabeçalho e extensão msg_id
+FLAG_MESSAGE_ID: int = 0x08
+MESSAGE_ID: struct.Struct = struct.Struct("!I")
+MESSAGE_ID_SIZE: int = MESSAGE_ID.size
+
+# Maior mensagem codificada: cabeçalho, extensões e o maior payload
+MAX_MESSAGE_SIZE: int = HEADER_SIZE + MESSAGE_ID_SIZE + RELIABLE_HEADER_SIZE + MAX_PAYLOAD_SIZE
+
+# Próximo id de cada remetente do processo, iniciado em um valor aleatório para que
+# um nó reiniciado não repita os ids da execução anterior
+_message_ids: dict[int, itertools.count] = {}
+
+# Compressão dos payloads, compartilhada por todos os nós do processo (desativada por padrão)
+_compression: Compression = Compression(threshold=None)
+
+
+class PayloadLayout():
+    """
+    Layout tipado do payload de um tipo de mensagem
+
+    O formato legado (string) de cada tipo é descrito por um template separado
+    por ':', por exemplo "LEADER_ACK:{leader}" ou "{round}:{vote}", utilizado
+    para converter os payloads JSON antigos em campos tipados e vice-versa.
+    """
+
+    def __init__(self, fmt: str, fields: tuple[str, ...], legacy: str) -> None:
+        self.struct: struct.Struct = struct.Struct("!" + fmt)
+        self.fields: tuple[str, ...] = fields
+        self.legacy: str = legacy
+
+
+    def pack(self, fields: dict) -> bytes:
+        return self.struct.pack(*(fields[f] for f in self.fields))
+
+
+    def unpack(self, data: bytes) -> dict:
+        return dict(zip(self.fields, self.struct.unpack(data)))
+
+
+    def unpack_from(self, data: bytes, offset: int, length: int) -> tuple:
+        """
+        Lê os campos do payload diretamente do datagrama a partir de offset
+
+        Args:
+            data (bytes): datagrama recebido
+            offset (int): posição do início do payload
+            length (int): tamanho do payload
+
+        Returns:
+            tuple: valores dos campos, na ordem de fields
+        """
+
+        if not self.fields:
+            return ()
+
+        return self.struct.unpack_from(data, offset)
+
+
+    def from_legacy(self, payload: str) -> dict:
+        """
+        Converte um payload legado em campos tipados (incluindo o round quando presente)
+
+        Args:
+            payload (str): payload no formato de string antigo
+
+        Returns:
+            dict: campos extraídos do payload
+        """
+
+        res: dict = {}
+
+        for token, value in zip(self.legacy.split(":"), str(payload).split(":")):
+            if token.startswith("{") and token.endswith("}"):
+                res[token[1:-1]] = int(value)
+
+        return res
+
+
+class TextLayout(PayloadLayout):
+    """
+    Layout de payload livre, codificado como texto UTF-8
+    """
+
+    def __init__(self) -> None:
+        self.fields: tuple[str, ...] = ("payload",)
+
+
+    def pack(self, fields: dict) -> bytes:
+        return str(fields.get("payload", "")).encode("utf-8")
+
+
+    def unpack(self, data: bytes) -> dict:
+        return {"payload": bytes(data).decode("utf-8")}
+
+
+    def unpack_from(self, data: bytes, offset: int, length: int) -> tuple:
+        return (bytes(data[offset:offset + length]).decode("utf-8"),)
+
+
+    def from_legacy(self, payload: str) -> dict:
+        return {"payload": payload}
+
+
+class PrefixedTextLayout(PayloadLayout):
+    """
+    Layout com campos fixos seguidos por um payload livre em texto UTF-8 (campo payload)
+
+    Tipos novos, o payload em string é apenas o texto
+    """
+
+    def __init__(self, fmt: str, fields: tuple[str, ...]) -> None:
+        self.struct: struct.Struct = struct.Struct("!" + fmt)
+        self.fields: tuple[str, ...] = fields + ("payload",)
+
+
+    def pack(self, fields: dict) -> bytes:
+        return self.struct.pack(*(fields[f] for f in self.fields[:-1])) + str(fields.get("payload", "")).encode("utf-8")
+
+
+    def unpack(self, data: bytes) -> dict:
+        return dict(zip(self.fields, self.unpack_from(data, 0, len(data))))
+
+
+    def unpack_from(self, data: bytes, offset: int, length: int) -> tuple:
+        size: int = self.struct.size
+
+        return self.struct.unpack_from(data, offset) + (bytes(data[offset + size:offset + length]).decode("utf-8"),)
+
+
+    def from_legacy(self, payload: str) -> dict:
+        return {"payload": payload}
+
+
+class SequenceLayout(PayloadLayout):
+    """
+    Layout de uma lista de entradas de tamanho fixo: primeiro número de sequência,
+    quantidade e as entradas (ver TOB_ORDER)
+
+    Tipos novos, sem formato legado
+    """
+
+    def __init__(self, entry: str) -> None:
+        self.struct: struct.Struct = struct.Struct("!QH")
+        self.entry: struct.Struct = struct.Struct("!" + entry)
+        self.fields: tuple[str, ...] = ("first", "entries")
+
+
+    def pack(self, fields: dict) -> bytes:
+        entries: list[tuple] = list(fields["entries"])
+
+        return self.struct.pack(fields["first"], len(entries)) + b"".join(self.entry.pack(*e) for e in entries)
+
+
+    def unpack(self, data: bytes) -> dict:
+        return dict(zip(self.fields, self.unpack_from(data, 0, len(data))))
+
+
+    def unpack_from(self, data: bytes, offset: int, length: int) -> tuple:
+        first, count = self.struct.unpack_from(data, offset)
+
+        if self.struct.size + count * self.entry.size > length:
+            raise ValueError("Lista de entradas truncada")
+
+        return first, tuple(self.entry.iter_unpack(bytes(data[offset + self.struct.size:offset + self.struct.size + count * self.entry.size])))
+
+
+    def from_legacy(self, payload: str) -> dict:
+        return {}
+
+
+class MembersLayout(PayloadLayout):
+    """
+    Layout com campos fixos seguidos pelos ids dos membros (campo members), em ordem
+    crescente e ocupando o restante do payload, ver JOIN_SNAPSHOT e VIEW. O tamanho
+    depende apenas da quantidade de membros, qualquer id de 32 bits é aceito
+
+    Tipos novos, sem formato legado
+    """
+
+    ID: struct.Struct = struct.Struct("!I")
+
+    def __init__(self, fmt: str, fields: tuple[str, ...]) -> None:
+        self.struct: struct.Struct = struct.Struct("!" + fmt)
+        self.fields: tuple[str, ...] = fields + ("members",)
+
+
+    def pack(self, fields: dict) -> bytes:
+        members: list[int] = sorted(fields["members"])
+
+        return self.struct.pack(*(fields[f] for f in self.fields[:-1])) + struct.pack(f"!{len(members)}I", *members)
+
+
+    def unpack(self, data: bytes) -> dict:
+        return dict(zip(self.fields, self.unpack_from(data, 0, len(data))))
+
+
+    def unpack_from(self, data: bytes, offset: int, length: int) -> tuple:
+        size: int = self.struct.size
+
+        if length < size or (length - size) % self.ID.size:
+            raise ValueError("Lista de membros truncada")
+
+        return self.struct.unpack_from(data, offset) + (struct.unpack_from(f"!{(length - size) // self.ID.size}I", data, offset + size),)
+
+
+    def from_legacy(self, payload: str) -> dict:
+        return {}
+
+
+LAYOUTS: dict[MessageEnum, PayloadLayout] = {
+    MessageEnum.TEST:               TextLayout(),
+    MessageEnum.REQUEST_VALUE:      TextLayout(),
+
+    # Algoritmo do Valentão
+    MessageEnum.ELECTION:           PayloadLayout("", (), "ELECTION"),
+    MessageEnum.ANSWER:             PayloadLayout("", (), "ANSWER_ACK"),
+    MessageEnum.COORDINATOR:        PayloadLayout("", (), "COORDINATOR"),
+
+    # Detector de Falhas
+    MessageEnum.HEARTBEAT:          PayloadLayout("", (), "HEARTBEAT"),
+
+    # Pesquisa do Líder
+    MessageEnum.LEADER_SEARCH:      PayloadLayout("", (), "LEADER_SEARCH"),
+    MessageEnum.LEADER_ACK:         PayloadLayout("i", ("leader",), "LEADER_ACK:{leader}"),
+
+    # Bizantino, a rodada é transportada no cabeçalho
+    MessageEnum.BIZANTINE_START:    PayloadLayout("", (), "{round}"),
+    MessageEnum.BIZANTINE_VOTE:     PayloadLayout("q", ("vote",), "{round}:{vote}"),
+    MessageEnum.BIZANTINE_DECIDE:   PayloadLayout("q", ("value",), "{value}"),
+
+    # Canal confiável
+    MessageEnum.NACK:               PayloadLayout("IIIBB", ("target_epoch", "first", "last", "direct", "plane"),
+                                                  "NACK:{target_epoch}:{first}:{last}:{direct}:{plane}"),
+
+    # Difusão com ordem total, entradas (sender_id, época, id local)
+    MessageEnum.TOB_DATA:           PrefixedTextLayout("II", ("data_epoch", "local_id")),
+    MessageEnum.TOB_ORDER:          SequenceLayout("III"),
+
+    # Entrada no cluster, estado do líder: líder, última decisão do consenso (rodada, valor) e visão (versão, membros)
+    MessageEnum.JOIN_REQUEST:       PayloadLayout("", (), "JOIN_REQUEST"),
+    MessageEnum.JOIN_SNAPSHOT:      MembersLayout("iIqI", ("leader", "decided_round", "decided_value", "view")),
+
+    # Saída do cluster
+    MessageEnum.LEAVE:              PayloadLayout("", (), "LEAVE"),
+
+    # Visão dos membros do cluster (versão, membros)
+    MessageEnum.VIEW:               MembersLayout("I", ("version",)),
+}
+
+# Índice (layout, classe tipada) pelo valor do tipo, evita a construção do Enum a cada mensagem recebida
+_DECODERS_BY_VALUE: dict[int, tuple[PayloadLayout, type[TypedMessage]]] = {
+    k.value: (v, MESSAGE_CLASSES[k]) for k, v in LAYOUTS.items()
+}
+
+
+def encode(message_enum: MessageEnum, sender_id: int, round: int = 0, flags: int = 0, **fields) -> bytes:
+    """
+    Codifica uma mensagem no formato binário
+
+    Args:
+        message_enum (MessageEnum): tipo da mensagem
+        sender_id (int): id do nó que envia a mensagem
+        round (int): rodada/termo ao qual a mensagem pertence
+        flags (int): flags do cabeçalho
+        **fields: campos tipados do payload, conforme o layout do tipo
+
+    Raises:
+        ValueError: se o payload for maior que MAX_PAYLOAD_SIZE
+
+    Returns:
+        bytes: mensagem codificada, com um novo id do remetente
+    """
+
+    payload: bytes = LAYOUTS[message_enum].pack(fields)
+
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Payload de {message_enum.name} com {len(payload)} bytes excede o máximo de {MAX_PAYLOAD_SIZE} bytes")
+    compressed: bytes | None = _compression.compress(payload)
+
+    if compressed is not None:
+        payload = compressed
+        flags |= FLAG_COMPRESSED
+
+    return HEADER.pack(
+        WIRE_VERSION,
+        message_enum.value,
+        flags | FLAG_MESSAGE_ID,
+        sender_id,
+        round,
+        MESSAGE_ID_SIZE + len(payload)
+    ) + MESSAGE_ID.pack(next_message_id(sender_id)) + payload
+
+
+def next_message_id(sender_id: int) -> int:
+    """
+    Returns:
+        int: próximo id das mensagens do remetente (32 bits)
+    """
+
+    ids: itertools.count | None = _message_ids.get(sender_id)
+
+    if ids is None:
+        ids = _message_ids.setdefault(sender_id, itertools.count(random.getrandbits(32)))
+
+    return next(ids) & 0xFFFFFFFF
+
+
+def decode_message(data: bytes) -> TypedMessage:
+    """
+    Decodifica uma mensagem binária, ou um datagrama JSON legado, no objeto
+    tipado do seu MessageEnum
+
+    Args:
+        data (bytes): datagrama recebido (bytes, bytearray ou memoryview), os campos são
+        lidos diretamente do buffer sem copiá-lo
+
+    Raises:
+        ValueError: se a versão do formato não for suportada, a mensagem estiver truncada,
+        o tipo for desconhecido ou o payload comprimido for inválido
+
+    Returns:
+        TypedMessage: mensagem com os campos do cabeçalho e do payload
+    """
+
+    if data[0] == LEGACY_JSON_PREFIX:
+        return typed_from_dict(decode_legacy(data))
+
+    version, type_value, flags, sender_id, round, length = HEADER.unpack_from(data)
+
+    if version != WIRE_VERSION:
+        raise ValueError(f"Versão do formato de mensagem não suportada: {version}")
+
+    if len(data) < HEADER_SIZE + length:
+        raise ValueError("Mensagem truncada")
+
+    decoder: tuple[PayloadLayout, type[TypedMessage]] | None = _DECODERS_BY_VALUE.get(type_value)
+
+    if decoder is None:
+        raise ValueError(f"Tipo de mensagem desconhecido: {type_value}")
+
+    layout, cls = decoder
+    offset: int = HEADER_SIZE
+    epoch: int = 0
+    seq: int = 0
+
+    # O id é utilizado apenas no recebimento, antes da decodificação
+    if flags & FLAG_MESSAGE_ID:
+        if length < MESSAGE_ID_SIZE:
+            raise ValueError("Id da mensagem truncado")
+
+        offset += MESSAGE_ID_SIZE
+        length -= MESSAGE_ID_SIZE
+        flags &= ~FLAG_MESSAGE_ID
+
+    if flags & FLAG_RELIABLE:
+        if length < RELIABLE_HEADER_SIZE:
+            raise ValueError("Extensão do canal confiável truncada")
+
+        epoch, seq = RELIABLE_HEADER.unpack_from(data, offset)
+        offset += RELIABLE_HEADER_SIZE
+        length -= RELIABLE_HEADER_SIZE
+
+    if flags & FLAG_COMPRESSED:
+        payload: bytes = _compression.decompress(data[offset:offset + length])
+        m: TypedMessage = cls(type_value, sender_id, round, flags & ~FLAG_COMPRESSED, *layout.unpack_from(payload, 0, len(payload)))
+    else:
+        m = cls(type_value, sender_id, round, flags, *layout.unpack_from(data, offset, length))
+
+    m.epoch = epoch
+    m.seq = seq
+
+    return m
+
+
+def stamp_reliable(data: bytes, epoch: int, seq: int, direct: bool = False) -> bytes:
+    """
+    Marca uma mensagem binária como mensagem do canal confiável, inserindo a
+    extensão (época, sequência) entre o cabeçalho (e o id da mensagem) e o payload
+
+    Args:
+        data (bytes): mensagem codificada por encode
+        epoch (int): época do remetente, muda a cada reinício do nó
+        seq (int): número de sequência da mensagem
+        direct (bool): True se a sequência for a das mensagens direcionadas a um nó
+
+    Raises:
+        ValueError: se a mensagem não estiver no formato binário ou já for confiável
+
+    Returns:
+        bytes: mensagem com a extensão do canal confiável
+    """
+
+    if data[0] == LEGACY_JSON_PREFIX:
+        raise ValueError("Mensagens JSON legadas não podem utilizar o canal confiável")
+
+    version, type_value, flags, sender_id, round, length = HEADER.unpack_from(data)
+
+    if flags & FLAG_RELIABLE:
+        raise ValueError("Mensagem já pertence ao canal confiável")
+
+    offset: int = HEADER_SIZE + (MESSAGE_ID_SIZE if flags & FLAG_MESSAGE_ID else 0)
+    flags |= FLAG_RELIABLE | (FLAG_DIRECT if direct else 0)
+
+    return (
+        HEADER.pack(version, type_value, flags, sender_id, round, length + RELIABLE_HEADER_SIZE)
+        + bytes(data[HEADER_SIZE:offset])
+        + RELIABLE_HEADER.pack(epoch, seq)
+        + bytes(data[offset:HEADER_SIZE + length])
+    )
+
+
+def configure_compression(threshold: int | None = 512,
+                          level: int = 6,
+                          zdict: bytes | None = None,
+                          max_size: int = MAX_PAYLOAD_SIZE) -> None:
+    """
+    Configura a compressão dos payloads enviados pelo processo
+
+    Args:
+        threshold (int | None): tamanho mínimo do payload para ser comprimido, caso None
+        desativa a compressão (mensagens comprimidas recebidas continuam sendo lidas)
+        level (int): nível de compressão do zlib (1 a 9)
+        zdict (bytes | None): dicionário pré-definido, caso informado deve ser o mesmo
+        em todos os nós
+        max_size (int): tamanho máximo do payload descomprimido aceito no recebimento
+    """
+
+    global _compression
+    _compression = Compression(threshold, level, zdict, max_size)
+
+
+def compression_stats() -> dict:
+    """
+    Returns:
+        dict: contadores da compressão (ver Compression.stats)
+    """
+
+    return _compression.stats()
+
+
+def decode(data: bytes) -> dict:
+    """
+    Decodifica uma mensagem binária, ou um datagrama JSON legado, em um dict
+
+    Args:
+        data (bytes): datagrama recebido (bytes, bytearray ou memoryview)
+
+    Raises:
+        ValueError: se a versão do formato não for suportada ou a mensagem estiver truncada
+
+    Returns:
+        dict: mensagem com as chaves type, sender_id, round e os campos tipados
+    """
+
+    if data[0] == LEGACY_JSON_PREFIX:
+        return decode_legacy(data)
+
+    return decode_message(data).to_dict()
+
+
+def typed_from_dict(m: dict) -> TypedMessage:
+    """
+    Converte uma mensagem em dict (ex.: JSON legado) no objeto tipado
+
+    Args:
+        m (dict): mensagem com type, sender_id, round e os campos tipados
+
+    Raises:
+        ValueError: se o tipo for desconhecido ou faltar algum campo do payload
+
+    Returns:
+        TypedMessage: mensagem tipada
+    """
+
+    decoder: tuple[PayloadLayout, type[TypedMessage]] | None = _DECODERS_BY_VALUE.get(m.get("type"))
+
+    if decoder is None:
+        raise ValueError(f"Tipo de mensagem desconhecido: {m.get('type')}")
+
+    cls: type[TypedMessage] = decoder[1]
+
+    try:
+        return cls(m["type"], m["sender_id"], m.get("round", 0), 0, *(m[f] for f in cls.FIELDS))
+    except KeyError as e:
+        raise ValueError(f"Campo ausente na mensagem: {e}")
+
+
+def peek_header(data: bytes) -> tuple[int, int]:
+    """
+    Lê apenas o tipo e o sender_id de uma mensagem, sem criar o dict da mensagem.
+    Permite descartar mensagens (ex.: as enviadas pelo próprio nó) antes da decodificação
+
+    Args:
+        data (bytes): mensagem recebida (bytes, bytearray ou memoryview)
+
+    Returns:
+        tuple[int, int]: valor do tipo da mensagem e id do remetente
+    """
+
+    if data[0] == LEGACY_JSON_PREFIX:
+        m: dict = decode_legacy(data)
+        return m["type"], m["sender_id"]
+
+    return _TYPE_SENDER.unpack_from(data)
+
+
+def peek_message_id(data: bytes) -> int | None:
+    """
+    Lê apenas o id de uma mensagem, sem decodificá-la, para descartar as cópias já recebidas
+
+    Args:
+        data (bytes): mensagem recebida (bytes, bytearray ou memoryview)
+
+    Returns:
+        int | None: id da mensagem, ou None se a mensagem não possuir id (ex.: JSON legado)
+    """
+
+    if data[0] == LEGACY_JSON_PREFIX or not data[2] & FLAG_MESSAGE_ID or len(data) < HEADER_SIZE + MESSAGE_ID_SIZE:
+        return None
+
+    return MESSAGE_ID.unpack_from(data, HEADER_SIZE)[0]
+
+
+def decode_legacy(data: bytes) -> dict:
+    """
+    Decodifica um datagrama JSON legado, completando os campos tipados a partir
+    do payload em string
+
+    Args:
+        data (bytes): datagrama JSON
+
+    Returns:
+        dict: mensagem no mesmo formato devolvido por decode
+    """
+
+    m: dict = json.loads(bytes(data).decode("utf-8"))
+
+    m.setdefault("round", 0)
+
+    try:
+        m.update(LAYOUTS[MessageEnum(m["type"])].from_legacy(m.get("payload", "")))
+    except (ValueError, KeyError):
+        pass
+
+    return m
+
+
+def pack_batch(messages: list[bytes], mtu: int) -> list[bytes]:
+    """
+    Agrupa mensagens binárias em datagramas de no máximo mtu bytes, mantendo a ordem.
+    Mensagens JSON legadas ou maiores que o mtu seguem sozinhas em um datagrama
+
+    Args:
+        messages (list[bytes]): mensagens codificadas
+        mtu (int): tamanho máximo de cada datagrama
+
+    Returns:
+        list[bytes]: datagramas prontos para o envio
+    """
+
+    datagrams: list[bytes] = []
+    current: list[bytes] = []
+    size: int = 0
+
+    for m in messages:
+        if m[0] == LEGACY_JSON_PREFIX or size + len(m) > mtu:
+            if current:
+                datagrams.append(b"".join(current))
+
+            current, size = [], 0
+
+        if m[0] == LEGACY_JSON_PREFIX:
+            datagrams.append(m)
+            continue
+
+        current.append(m)
+        size += len(m)
+
+    if current:
+        datagrams.append(b"".join(current))
+
+    return datagrams
+
+
+def split_datagram(data: bytes) -> list[bytes]:
+    """
+    Separa um datagrama nas mensagens que o compõem
+
+    Args:
+        data (bytes): datagrama recebido, com uma ou mais mensagens binárias ou um JSON legado
+
+    Raises:
+        ValueError: se alguma mensagem do datagrama estiver truncada
+
+    Returns:
+        list[bytes]: mensagens individuais
+    """
+
+    if data[0] == LEGACY_JSON_PREFIX:
+        return [data]
+
+    messages: list[bytes] = []
+    offset: int = 0
+    total: int = len(data)
+
+    while offset < total:
+        if total - offset < HEADER_SIZE:
+            raise ValueError("Mensagem truncada")
+
+        end: int = offset + HEADER_SIZE + HEADER.unpack_from(data, offset)[5]
+
+        if end > total:
+            raise ValueError("Mensagem truncada")
+
+        messages.append(data[offset:end])
+        offset = end
+
+    return messages
+
+
+def is_fragment(data: bytes) -> bool:
+    return data[0] == FRAGMENT_PREFIX
+
+
+def fragment_size(total: int, count: int) -> int:
+    """
+    Tamanho de cada fragmento (exceto o último) de uma mensagem de total bytes
+    dividida em count fragmentos, utilizado para calcular a posição de cada fragmento
+    """
+
+    return -(-total // count)
+
+
+def fragment(data: bytes, msg_id: int, mtu: int) -> list[bytes]:
+    """
+    Divide uma mensagem (ou batch) em fragmentos de no máximo mtu bytes
+
+    Args:
+        data (bytes): mensagem codificada
+        msg_id (int): identificador da mensagem, único para o remetente
+        mtu (int): tamanho máximo de cada datagrama
+
+    Returns:
+        list[bytes]: fragmentos prontos para o envio
+    """
+
+    total: int = len(data)
+    count: int = -(-total // (mtu - FRAGMENT_HEADER_SIZE))
+    size: int = fragment_size(total, count)
+
+    sender_id: int = 0
+
+    if data[0] == WIRE_VERSION:
+        sender_id = HEADER.unpack_from(data)[3]
+
+    view: memoryview = memoryview(data)
+
+    return [
+        FRAGMENT_HEADER.pack(
+            FRAGMENT_PREFIX,
+            sender_id,
+            msg_id & 0xFFFFFFFF,
+            i,
+            count,
+            total
+        ) + view[i * size:(i + 1) * size]
+        for i in range(count)
+    ]
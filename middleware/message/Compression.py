@@ -0,0 +1,149 @@
+"""
+   Compressão dos payloads das mensagens (zlib)
+
+   Payloads a partir de um tamanho mínimo (threshold) são comprimidos com zlib e a
+   mensagem é marcada com a flag FLAG_COMPRESSED no cabeçalho (ver Codec). Payloads
+   menores, ou que não diminuem ao serem comprimidos, seguem sem compressão, assim
+   as mensagens pequenas e frequentes (HEARTBEAT, ELECTION, votos) não pagam o custo.
+
+   O payload descomprimido é limitado a MAX_PAYLOAD_SIZE, o maior payload que uma
+   mensagem pode carregar (ver Codec.encode), assim uma mensagem pequena não expande
+   sem limite no recebimento.
+
+   Os contadores (ver stats) informam os bytes economizados e o tempo de CPU gasto
+   na compressão e na descompressão.
+"""
+
+import time
+import zlib
+import threading
+
+
+# Flag do cabeçalho que indica payload comprimido
+FLAG_COMPRESSED: int = 0x01
+
+# Maior payload de uma mensagem, sem as extensões do cabeçalho: o mesmo limite de
+# memória das remontagens do Reassembler, acima dele a mensagem não seria remontada
+MAX_PAYLOAD_SIZE: int = 4 * 1024 * 1024
+
+
+class Compression():
+    def __init__(self,
+                 threshold: int | None = 512,
+                 level: int = 6,
+                 zdict: bytes | None = None,
+                 max_size: int = MAX_PAYLOAD_SIZE) -> None:
+        """
+        Args:
+            threshold (int | None): tamanho mínimo do payload para ser comprimido, caso
+            None a compressão é desativada (as mensagens comprimidas continuam sendo lidas)
+            level (int): nível de compressão do zlib (1 a 9)
+            zdict (bytes | None): dicionário pré-definido, caso informado deve ser o mesmo
+            em todos os nós
+            max_size (int): tamanho máximo do payload descomprimido
+        """
+
+        self.threshold: int | None = threshold
+        self.level: int = level
+        self.max_size: int = max_size
+
+        # Argumentos do zlib, o dicionário é opcional
+        self._zdict: dict = {"zdict": zdict} if zdict is not None else {}
+
+        self._lock: threading.Lock = threading.Lock()
+
+        self._compressed: int = 0
+        self._bytes_in: int = 0
+        self._bytes_out: int = 0
+        self._compress_ns: int = 0
+        self._decompressed: int = 0
+        self._decompress_ns: int = 0
+
+
+    def compress(self, payload: bytes) -> bytes | None:
+        """
+        Args:
+            payload (bytes): payload da mensagem
+
+        Returns:
+            bytes | None: payload comprimido, ou None se o payload deve seguir sem compressão
+        """
+
+        if self.threshold is None or len(payload) < self.threshold or len(payload) > self.max_size:
+            return None
+
+        start: int = time.perf_counter_ns()
+
+        c = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS, **self._zdict)
+        res: bytes = c.compress(payload) + c.flush()
+
+        elapsed: int = time.perf_counter_ns() - start
+
+        with self._lock:
+            self._compress_ns += elapsed
+
+            if len(res) >= len(payload):
+                return None
+
+            self._compressed += 1
+            self._bytes_in += len(payload)
+            self._bytes_out += len(res)
+
+        return res
+
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Args:
+            data (bytes): payload comprimido
+
+        Raises:
+            ValueError: se o payload comprimido for inválido, incompleto ou se
+            descomprimido exceder max_size
+
+        Returns:
+            bytes: payload original
+        """
+
+        start: int = time.perf_counter_ns()
+
+        try:
+            d = zlib.decompressobj(-zlib.MAX_WBITS, **self._zdict)
+
+            # Descomprime no máximo um byte além do limite, o suficiente para detectar o excesso
+            res: bytes = d.decompress(data, self.max_size + 1)
+        except zlib.error as e:
+            raise ValueError(f"Payload comprimido inválido: {e}")
+
+        if len(res) > self.max_size:
+            raise ValueError(f"Payload descomprimido excede {self.max_size} bytes")
+
+        if not d.eof:
+            raise ValueError("Payload comprimido incompleto")
+
+        elapsed: int = time.perf_counter_ns() - start
+
+        with self._lock:
+            self._decompressed += 1
+            self._decompress_ns += elapsed
+
+        return res
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: compressed, bytes_in, bytes_out, bytes_saved, compress_ms,
+            decompressed e decompress_ms
+        """
+
+        with self._lock:
+            return {
+                "compressed": self._compressed,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "bytes_saved": self._bytes_in - self._bytes_out,
+                "compress_ms": self._compress_ns / 1e6,
+                "decompressed": self._decompressed,
+                "decompress_ms": self._decompress_ns / 1e6,
+            }
@@ -0,0 +1,133 @@
+"""
+   Descarte das mensagens já recebidas pelo id (remetente, msg_id)
+
+   Cada mensagem binária carrega um id do remetente (ver Codec.FLAG_MESSAGE_ID), mantido
+   nos reenvios da mesma mensagem codificada. O DuplicateFilter guarda, para cada
+   remetente, o maior id recebido e um bitmap dos window ids anteriores, assim uma
+   cópia é descartada pelo cabeçalho, antes da decodificação e do roteamento.
+
+   * ids à frente do maior recebido deslocam a janela
+   * ids dentro da janela são consultados no bitmap
+   * ids mais antigos que a janela não podem ser verificados e são aceitos (a
+     mensagem atrasada é entregue, como antes do filtro)
+   * um id muito distante do maior recebido (reset_distance) indica um remetente
+     reiniciado, com uma nova sequência aleatória de ids, e reinicia a janela
+"""
+
+import threading
+
+from collections import OrderedDict
+
+ID_SPACE: int = 1 << 32
+
+
+class _Window():
+    """
+    Maior id recebido de um remetente e o bitmap da janela (bit i: id top - i recebido)
+    """
+
+    __slots__ = ("top", "mask")
+
+    def __init__(self, top: int) -> None:
+        self.top: int = top
+        self.mask: int = 1
+
+
+class DuplicateFilter():
+    def __init__(self, window: int = 1024, max_senders: int = 1024, reset_distance: int = 1 << 20) -> None:
+        """
+        Args:
+            window (int): ids anteriores ao maior recebido lembrados por remetente
+            max_senders (int): remetentes lembrados, o menos recente é esquecido
+            reset_distance (int): distância a partir da qual o id indica um remetente reiniciado
+        """
+
+        self._window: int = window
+        self._full: int = (1 << window) - 1
+        self._max_senders: int = max_senders
+        self._reset_distance: int = reset_distance
+
+        self._lock: threading.Lock = threading.Lock()
+        self._senders: OrderedDict[int, _Window] = OrderedDict()
+
+        self._stats: dict[str, int] = {
+            "accepted": 0,
+            "duplicates": 0,
+            "resets": 0,
+        }
+
+
+    def seen(self, sender_id: int, msg_id: int) -> bool:
+        """
+        Registra o id de uma mensagem recebida
+
+        Args:
+            sender_id (int): id do remetente
+            msg_id (int): id da mensagem
+
+        Returns:
+            bool: True se a mensagem já foi recebida (cópia), False caso contrário
+        """
+
+        with self._lock:
+            w: _Window | None = self._senders.get(sender_id)
+
+            if w is None:
+                self._senders[sender_id] = _Window(msg_id)
+
+                if len(self._senders) > self._max_senders:
+                    self._senders.popitem(last=False)
+
+                self._stats["accepted"] += 1
+                return False
+
+            self._senders.move_to_end(sender_id)
+
+            # Distância circular, os ids utilizam 32 bits
+            ahead: int = (msg_id - w.top) % ID_SPACE
+            behind: int = ID_SPACE - ahead
+
+            if ahead and ahead < behind:
+                if ahead >= self._reset_distance:
+                    self._stats["resets"] += 1
+                    w.mask = 1
+                else:
+                    w.mask = ((w.mask << ahead) | 1) & self._full
+
+                w.top = msg_id
+
+            elif ahead == 0 or behind < self._window:
+                bit: int = 1 << (behind % ID_SPACE)
+
+                if w.mask & bit:
+                    self._stats["duplicates"] += 1
+                    return True
+
+                w.mask |= bit
+
+            elif behind >= self._reset_distance:
+                self._stats["resets"] += 1
+                w.top = msg_id
+                w.mask = 1
+
+            self._stats["accepted"] += 1
+            return False
+
+
+    def forget(self, sender_id: int) -> None:
+        """
+        Esquece a janela de um remetente (ex.: nó que saiu do cluster)
+        """
+
+        with self._lock:
+            self._senders.pop(sender_id, None)
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: accepted, duplicates e resets (remetentes reiniciados)
+        """
+
+        with self._lock:
+            return {**self._stats, "senders": len(self._senders)}
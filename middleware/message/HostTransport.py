@@ -0,0 +1,297 @@
+"""
+   Transporte dos nós executados no mesmo processo (ver NodeHost)
+
+   Com um UdpTransport por nó, cada nó possui os seus sockets multicast, o seu
+   remetente e duas threads por socket de recebimento (drenagem e worker). O UdpHub
+   é compartilhado pelos nós do processo:
+
+   * Multicast: um único socket (e MulticastReceiver) por grupo do cluster, cada
+     mensagem recebida é entregue para todos os nós do processo. As mensagens
+     multicast dos próprios nós do processo também chegam por este socket (loopback
+     multicast), e cada nó descarta as suas próprias mensagens pelo cabeçalho
+   * Unicast: cada nó continua escutando no seu endereço (ver PeerBook), pois os
+     outros processos enviam send_to para a porta do nó, mas os sockets de todos os
+     nós são lidos por uma única thread (selectors), que identifica o nó de destino
+     pelo socket
+   * Envio: um único MulticastSender, com um socket conectado por nó de destino
+     compartilhado por todos os nós do processo
+
+   Cada nó utiliza um HostTransport, com a interface do Transport, conectado ao hub.
+"""
+
+import socket
+import logging
+import selectors
+import threading
+
+from typing import Callable
+
+from .Codec import split_datagram
+from .Message import Message, ClusterConfig, MulticastSender, PeerBook, DEFAULT_CLUSTER, RECV_BUFFER_SIZE, UNICAST_IP
+from .Reassembler import Reassembler
+from .Receiver import MulticastReceiver
+from .Transport import Transport
+
+logger = logging.getLogger(__name__)
+
+
+class UdpHub():
+    def __init__(self,
+                 cluster: ClusterConfig | None = None,
+                 peers: PeerBook | None = None,
+                 rcvbuf: int | None = None,
+                 ring_size: int = 1024,
+                 planes: tuple[str, ...] | None = None) -> None:
+        """
+        Args:
+            cluster (ClusterConfig | None): grupo, porta e interface do cluster, caso None
+            utiliza o cluster padrão
+            peers (PeerBook | None): endereços unicast dos nós, caso None utiliza os do cluster
+            rcvbuf (int | None): tamanho do buffer de recebimento dos sockets (SO_RCVBUF)
+            ring_size (int): número máximo de datagramas multicast aguardando processamento
+            planes (tuple[str, ...] | None): planos recebidos pelos nós do processo, caso None todos
+        """
+
+        self._cluster: ClusterConfig = cluster if cluster is not None else DEFAULT_CLUSTER
+        self._peers: PeerBook = peers if peers is not None else self._cluster.peers()
+        self._sender: MulticastSender = self._cluster.sender(self._peers)
+
+        self._rcvbuf: int | None = rcvbuf
+        self._ring_size: int = ring_size
+        self._planes: tuple[str, ...] | None = planes
+
+        # id do nó -> função de tratamento do nó
+        self._nodes: dict[int, Callable[[bytes], None]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        self._receivers: list[MulticastReceiver] = []
+
+        # Sockets unicast dos nós, lidos pela thread unicast
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._socks: dict[int, socket.socket] = {}
+        self._reassembler: Reassembler = Reassembler()
+
+        self._unicast_thread: threading.Thread | None = None
+        self._stop_event: threading.Event = threading.Event()
+
+        self._unicast_received: int = 0
+        self._unicast_processed: int = 0
+
+
+    def transport(self, process_id: int) -> "HostTransport":
+        """
+        Cria o transporte de um nó do processo conectado a este hub
+        """
+
+        return HostTransport(self, process_id)
+
+
+    # Envio
+
+    def send(self, message: bytes) -> bool:
+        return self._sender.send(message)
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        return self._sender.send_to(peer_id, message)
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        return self._sender.send_unicast(message, port, ip)
+
+
+    # Recebimento
+
+    def attach(self, process_id: int, f: Callable[[bytes], None]) -> None:
+        """
+        Conecta um nó ao hub, o recebimento é iniciado com o primeiro nó
+        """
+
+        sock: socket.socket = Message.create_socket_unicast(self._peers.address(process_id))
+        sock.setblocking(False)
+
+        if self._rcvbuf is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._rcvbuf)
+
+        with self._lock:
+            self._nodes[process_id] = f
+            self._socks[process_id] = sock
+            self._selector.register(sock, selectors.EVENT_READ, process_id)
+
+            if self._unicast_thread is None:
+                self.__start()
+
+
+    def detach(self, process_id: int) -> None:
+        """
+        Desconecta um nó, o nó deixa de receber as mensagens e o seu endereço unicast é liberado
+        """
+
+        with self._lock:
+            self._nodes.pop(process_id, None)
+            sock: socket.socket | None = self._socks.pop(process_id, None)
+
+            if sock is not None:
+                self._selector.unregister(sock)
+                sock.close()
+
+
+    def __start(self) -> None:
+        self._receivers = [
+            MulticastReceiver(
+                self.__fanout,
+                sock=Message.create_socket_multicast(self._cluster, address),
+                rcvbuf=self._rcvbuf,
+                ring_size=self._ring_size
+            )
+            for address in self._cluster.addresses(self._planes)
+        ]
+
+        for receiver in self._receivers:
+            receiver.start()
+
+        self._unicast_thread = threading.Thread(target=self.__unicast_thread, name="hub-unicast", daemon=True)
+        self._unicast_thread.start()
+
+
+    def __fanout(self, m: bytes) -> None:
+        """
+        Entrega uma mensagem multicast para todos os nós do processo
+        """
+
+        with self._lock:
+            nodes: list[Callable[[bytes], None]] = list(self._nodes.values())
+
+        for f in nodes:
+            try:
+                f(m)
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar mensagem\nException:{e}")
+
+
+    def __unicast_thread(self) -> None:
+        """
+        Thread que lê os sockets unicast de todos os nós e entrega cada datagrama
+        para o nó dono do socket
+        """
+
+        buf: bytearray = bytearray(RECV_BUFFER_SIZE)
+        view: memoryview = memoryview(buf)
+
+        while not self._stop_event.is_set():
+            for key, _ in self._selector.select(timeout=0.5):
+                try:
+                    nbytes: int = key.fileobj.recv_into(buf)
+                except (BlockingIOError, OSError):
+                    continue
+
+                self._unicast_received += 1
+
+                with self._lock:
+                    f: Callable[[bytes], None] | None = self._nodes.get(key.data)
+
+                if f is not None:
+                    self.__process(f, view[:nbytes])
+
+
+    def __process(self, f: Callable[[bytes], None], view: memoryview) -> None:
+        try:
+            data: memoryview | bytearray | None = self._reassembler.feed(view)
+
+            if data is None:
+                return
+
+            messages: list[memoryview] = split_datagram(data)
+        except (ValueError, IndexError) as e:
+            logger.warning(f"⚠️ Datagrama inválido descartado: {e}")
+            return
+
+        for m in messages:
+            try:
+                f(m)
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar mensagem\nException:{e}")
+
+            self._unicast_processed += 1
+
+
+    def close(self) -> None:
+        """
+        Encerra o recebimento de todos os nós e fecha os sockets do hub
+        """
+
+        self._stop_event.set()
+
+        for receiver in self._receivers:
+            receiver.stop()
+
+        if self._unicast_thread is not None:
+            self._unicast_thread.join(timeout=1)
+
+        with self._lock:
+            for sock in self._socks.values():
+                sock.close()
+
+            self._nodes.clear()
+            self._socks.clear()
+
+        self._selector.close()
+        self._sender.close()
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: contadores dos MulticastReceiver somados, com o unicast de todos os
+            nós em received e processed, e nodes (nós conectados)
+        """
+
+        stats: dict = {"received": self._unicast_received, "processed": self._unicast_processed}
+
+        for receiver in self._receivers:
+            for key, value in receiver.stats().items():
+                stats[key] = stats.get(key, 0) + value
+
+        with self._lock:
+            stats["nodes"] = len(self._nodes)
+
+        return stats
+
+
+class HostTransport(Transport):
+    """
+    Transporte de um nó conectado a um UdpHub
+    """
+
+    def __init__(self, hub: UdpHub, process_id: int) -> None:
+        self._hub: UdpHub = hub
+        self._process_id: int = process_id
+
+
+    def send(self, message: bytes) -> bool:
+        return self._hub.send(message)
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        return self._hub.send_to(peer_id, message)
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        return self._hub.send_unicast(message, port, ip)
+
+
+    def start(self, f: Callable[[bytes], None]) -> None:
+        self._hub.attach(self._process_id, f)
+
+
+    def stop(self) -> None:
+        self._hub.detach(self._process_id)
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: contadores do hub, compartilhados pelos nós do processo
+        """
+
+        return self._hub.stats()
@@ -0,0 +1,241 @@
+"""
+   Transporte em memória para executar muitos nós no mesmo processo
+
+   Uma LoopbackNetwork conecta os LoopbackTransport dos nós de um experimento: um
+   envio multicast é entregue para todos os outros nós da rede e um send_to apenas
+   para o nó de destino, sem sockets. Cada entrega pode sofrer uma latência
+   (fixa + variação aleatória) e ser perdida com uma probabilidade configurável,
+   permitindo medir o comportamento do protocolo com centenas de nós em um único host.
+
+   Como nos grupos multicast de cada plano (ver ClusterConfig), um nó inscrito apenas
+   em alguns planos não recebe as mensagens multicast dos outros planos.
+
+   As entregas são feitas por uma thread da rede, em ordem de horário de entrega,
+   nunca dentro da chamada de envio, assim um nó que envia enquanto trata uma
+   mensagem não executa o código de outro nó na sua própria pilha.
+"""
+
+import time
+import heapq
+import random
+import logging
+import threading
+import itertools
+
+from typing import Callable
+
+from .Codec import split_datagram
+from .Message import plane_of
+from .Transport import Transport
+
+logger = logging.getLogger(__name__)
+
+
+class LoopbackNetwork():
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0, seed: int | None = None) -> None:
+        """
+        Args:
+            latency (float): atraso fixo de cada entrega, em segundos
+            jitter (float): variação máxima aleatória somada à latência, em segundos
+            loss (float): probabilidade (0 a 1) de cada entrega ser perdida
+            seed (int | None): semente do gerador aleatório, para experimentos reproduzíveis
+        """
+
+        self._latency: float = latency
+        self._jitter: float = jitter
+        self._loss: float = loss
+        self._random: random.Random = random.Random(seed)
+
+        # id do nó -> função de tratamento do nó
+        self._nodes: dict[int, Callable[[bytes], None]] = {}
+
+        # id do nó -> planos recebidos pelo nó (None para todos)
+        self._planes: dict[int, tuple[str, ...] | None] = {}
+
+        # Entregas pendentes (horário, ordem de envio, id de destino, datagrama)
+        self._queue: list[tuple[float, int, int, bytes]] = []
+        self._order: itertools.count = itertools.count()
+        self._cond: threading.Condition = threading.Condition()
+
+        self._thread: threading.Thread | None = None
+        self._stopped: bool = False
+
+        self._sent: int = 0
+        self._delivered: int = 0
+        self._lost: int = 0
+
+
+    def transport(self, process_id: int, planes: tuple[str, ...] | None = None) -> "LoopbackTransport":
+        """
+        Cria o transporte de um nó conectado a esta rede
+
+        Args:
+            process_id (int): id do nó
+            planes (tuple[str, ...] | None): planos recebidos pelo nó, caso None todos
+        """
+
+        return LoopbackTransport(self, process_id, planes)
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: sent, delivered, lost e pending da rede
+        """
+
+        with self._cond:
+            return {
+                "sent": self._sent,
+                "delivered": self._delivered,
+                "lost": self._lost,
+                "pending": len(self._queue),
+            }
+
+
+    def attach(self, process_id: int, f: Callable[[bytes], None], planes: tuple[str, ...] | None = None) -> None:
+        with self._cond:
+            self._nodes[process_id] = f
+            self._planes[process_id] = planes
+
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self.__delivery_thread, daemon=True)
+                self._thread.start()
+
+
+    def detach(self, process_id: int) -> None:
+        with self._cond:
+            self._nodes.pop(process_id, None)
+
+
+    def close(self) -> None:
+        """
+        Encerra a thread de entrega, as entregas pendentes são descartadas
+        """
+
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            thread.join(timeout=1)
+
+
+    def send(self, sender_id: int, data: bytes, peer_id: int | None = None) -> None:
+        """
+        Agenda a entrega de um datagrama
+
+        Args:
+            sender_id (int): id do nó que envia
+            data (bytes): datagrama
+            peer_id (int | None): nó de destino, caso None entrega para todos os outros nós
+        """
+
+        now: float = time.monotonic()
+        data = bytes(data)
+
+        # Datagramas agrupados possuem mensagens de um único plano (ver Message.send_batch)
+        plane: str | None = plane_of(data) if peer_id is None else None
+
+        with self._cond:
+            targets = self._nodes.keys() if peer_id is None else ((peer_id,) if peer_id in self._nodes else ())
+
+            for target in targets:
+                if target == sender_id:
+                    continue
+
+                planes: tuple[str, ...] | None = self._planes.get(target)
+
+                if plane is not None and planes is not None and plane not in planes:
+                    continue
+
+                self._sent += 1
+
+                if self._loss and self._random.random() < self._loss:
+                    self._lost += 1
+                    continue
+
+                delay: float = self._latency
+
+                if self._jitter:
+                    delay += self._random.uniform(0, self._jitter)
+
+                heapq.heappush(self._queue, (now + delay, next(self._order), target, data))
+
+            self._cond.notify()
+
+
+    def __delivery_thread(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._queue:
+                        wait: float = self._queue[0][0] - time.monotonic()
+
+                        if wait <= 0:
+                            break
+
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+
+                if self._stopped:
+                    return
+
+                _, _, target, data = heapq.heappop(self._queue)
+                f: Callable[[bytes], None] | None = self._nodes.get(target)
+
+            if f is None:
+                continue
+
+            try:
+                messages: list[bytes] = split_datagram(data)
+            except ValueError as e:
+                logger.warning(f"⚠️ Datagrama inválido descartado: {e}")
+                continue
+
+            for m in messages:
+                try:
+                    f(m)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao processar mensagem\nException:{e}")
+
+            with self._cond:
+                self._delivered += 1
+
+
+class LoopbackTransport(Transport):
+    def __init__(self, network: LoopbackNetwork, process_id: int, planes: tuple[str, ...] | None = None) -> None:
+        """
+        Args:
+            network (LoopbackNetwork): rede em memória compartilhada pelos nós
+            process_id (int): id do nó
+            planes (tuple[str, ...] | None): planos recebidos pelo nó, caso None todos
+        """
+
+        self._network: LoopbackNetwork = network
+        self._process_id: int = process_id
+        self._planes: tuple[str, ...] | None = planes
+
+
+    def send(self, message: bytes) -> bool:
+        self._network.send(self._process_id, message)
+        return True
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        self._network.send(self._process_id, message, peer_id=peer_id)
+        return True
+
+
+    def start(self, f: Callable[[bytes], None]) -> None:
+        self._network.attach(self._process_id, f, self._planes)
+
+
+    def stop(self) -> None:
+        self._network.detach(self._process_id)
+
+
+    def stats(self) -> dict:
+        return self._network.stats()
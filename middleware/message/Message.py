@@ -9,15 +9,21 @@
 """
 
 
+import sys
 import socket
 import struct
-import json 
 import logging
+import threading
+import itertools
+import random
 import time
 
-from typing import Callable
+from typing import Callable, Iterator
+from contextlib import contextmanager
 
 from .MessageEnum import MessageEnum
+from .Codec import LAYOUTS, WIRE_VERSION, PayloadLayout, encode, decode, pack_batch, split_datagram, fragment
+from .Reassembler import Reassembler
 
 logger = logging.getLogger(__name__)
 
@@ -32,19 +38,646 @@ Conceitos:
 UNICAST_IP: str = "127.0.0.1"
 UNICAST_PORT: int = 5005
 
+# Porta unicast de cada nó: o nó de id i escuta em UNICAST_BASE_PORT + i (ver PeerBook)
+UNICAST_BASE_PORT: int = 6000
+
 MULTICAST_GROUP: str = '224.1.1.1'
 MUSTICAST_PORT: int = 5007
 
-def message(message_enum: MessageEnum, sender_id, payload: str) -> bytes:
-    return json.dumps({
-        "type": message_enum.value,
-        "sender_id": sender_id,
-        "payload": payload
-    }).encode('utf-8')
+# Plano de cada tipo de mensagem. Um cluster pode utilizar um grupo multicast por plano
+# (ver ClusterConfig), e cada nó participa apenas dos grupos dos planos que utiliza
+PLANES: dict[MessageEnum, str] = {
+    MessageEnum.HEARTBEAT:          "membership",
+    MessageEnum.NACK:               "membership",
+    MessageEnum.JOIN_REQUEST:       "membership",
+    MessageEnum.JOIN_SNAPSHOT:      "membership",
+    MessageEnum.LEAVE:              "membership",
+    MessageEnum.VIEW:               "membership",
+
+    MessageEnum.ELECTION:           "election",
+    MessageEnum.ANSWER:             "election",
+    MessageEnum.COORDINATOR:        "election",
+    MessageEnum.LEADER_SEARCH:      "election",
+    MessageEnum.LEADER_ACK:         "election",
+
+    MessageEnum.BIZANTINE_START:    "consensus",
+    MessageEnum.BIZANTINE_VOTE:     "consensus",
+    MessageEnum.BIZANTINE_DECIDE:   "consensus",
+
+    MessageEnum.TEST:               "data",
+    MessageEnum.REQUEST_VALUE:      "data",
+    MessageEnum.TOB_DATA:           "data",
+    MessageEnum.TOB_ORDER:          "data",
+}
+
+PLANE_NAMES: tuple[str, ...] = ("membership", "election", "consensus", "data")
+
+# Tamanho do buffer de recebimento, também é o tamanho máximo de um datagrama enviado.
+# Mensagens maiores são fragmentadas (ver Codec.fragment)
+RECV_BUFFER_SIZE: int = 1024
+
+def message(message_enum: MessageEnum, sender_id: int, payload: str = "", round: int | None = None, **fields) -> bytes:
+    """
+    Cria uma mensagem no formato binário (ver Codec)
+
+    Args:
+        message_enum (MessageEnum): tipo da mensagem
+        sender_id (int): id do nó que envia a mensagem
+        payload (str): payload no formato de string legado, convertido para os campos
+        do template legado do tipo (ex.: "{round}:{vote}"), os campos tipados e o
+        round informados têm precedência
+        round (int | None): rodada/termo ao qual a mensagem pertence, caso None o do
+        payload legado ou 0
+        **fields: campos tipados do payload (ex.: leader, vote, value)
+
+    Returns:
+        bytes: mensagem codificada
+    """
+    
+    layout: PayloadLayout = LAYOUTS[message_enum]
+    
+    # O template pode conter apenas o round (ex.: BIZANTINE_START), que não é um campo do layout
+    has_placeholders: bool = "{" in getattr(layout, "legacy", "")
+    
+    if any(f not in fields for f in layout.fields) or (payload and has_placeholders):
+        legacy: dict = layout.from_legacy(payload)
+        legacy_round: int | None = legacy.pop("round", None)
+        fields = {**legacy, **fields}
+        
+        if round is None:
+            round = legacy_round
+    
+    return encode(message_enum, sender_id, round=round if round is not None else 0, **fields)
     
 
 def handle_message(message: bytes) -> dict:
-    return json.loads(message.decode('utf-8'))
+    """
+    Decodifica uma mensagem binária ou JSON legada
+
+    Args:
+        message (bytes): datagrama recebido
+
+    Returns:
+        dict: mensagem com as chaves type, sender_id, round e os campos tipados
+    """
+    
+    return decode(message)
+
+
+class PeerBook():
+    """
+    Catálogo de endereços unicast dos nós do sistema, indexado pelo id do processo.
+    
+    Respostas que interessam a apenas um nó (ANSWER para quem iniciou a eleição,
+    BIZANTINE_VOTE para o líder, LEADER_ACK para quem pesquisou o líder) são enviadas
+    para o endereço unicast do destinatário em vez de para todo o grupo multicast.
+    
+    Por padrão o nó de id i escuta em (ip, base_port + i), endereços diferentes
+    (ex.: nós em outros hosts) podem ser informados explicitamente.
+    """
+    
+    def __init__(self, 
+                 addresses: dict[int, tuple[str, int]] | None = None,
+                 ip: str = UNICAST_IP,
+                 base_port: int = UNICAST_BASE_PORT) -> None:
+        """
+        Args:
+            addresses (dict[int, tuple[str, int]] | None): endereços conhecidos por id de processo
+            ip (str): IP dos ids sem endereço informado
+            base_port (int): porta base, o nó de id i utiliza base_port + i
+        """
+        
+        self._addresses: dict[int, tuple[str, int]] = dict(addresses or {})
+        self._ip: str = ip
+        self._base_port: int = base_port
+        
+        self._lock: threading.Lock = threading.Lock()
+        
+        
+    def address(self, peer_id: int) -> tuple[str, int]:
+        """
+        Args:
+            peer_id (int): id do processo
+
+        Returns:
+            tuple[str, int]: endereço (ip, porta) unicast do processo
+        """
+        
+        with self._lock:
+            addr: tuple[str, int] | None = self._addresses.get(peer_id)
+            
+        if addr is None:
+            return (self._ip, self._base_port + peer_id)
+        
+        return addr
+    
+    
+    def set(self, peer_id: int, address: tuple[str, int]) -> None:
+        with self._lock:
+            self._addresses[peer_id] = address
+
+
+class ClusterConfig():
+    """
+    Endereços de rede de um cluster: grupo e porta multicast, interface local e
+    endereços unicast dos nós.
+    
+    Clusters com grupos (ou portas) diferentes podem executar no mesmo host sem
+    receber o tráfego uns dos outros, por exemplo testes e benchmarks em paralelo
+    com nós em execução. A configuração é repassada pelo Node para o transporte,
+    e deste para todos os envios e recebimentos.
+    
+    Cada plano (ver PLANES) pode utilizar um grupo próprio (planes, ou split), assim
+    os HEARTBEATs e a eleição não disputam o socket e a fila de recebimento com as
+    rajadas do consenso, e um nó pode deixar de receber os planos que não utiliza.
+    Os planos sem grupo próprio utilizam o grupo do cluster.
+    
+    Com shared_memory os nós do mesmo host (local_ids) trocam as mensagens por anéis
+    de memória compartilhada (ver SharedMemoryTransport), e o UDP é utilizado apenas
+    para os nós remotos.
+    """
+    
+    def __init__(self,
+                 group: str = MULTICAST_GROUP,
+                 port: int = MUSTICAST_PORT,
+                 interface: str | None = None,
+                 ttl: int = 1,
+                 unicast_ip: str = UNICAST_IP,
+                 unicast_base_port: int = UNICAST_BASE_PORT,
+                 planes: dict[str, tuple[str, int]] | None = None,
+                 shared_memory: str | None = None,
+                 local_ids: tuple[int, ...] | None = None) -> None:
+        """
+        Args:
+            group (str): endereço do grupo multicast do cluster
+            port (int): porta do grupo multicast do cluster
+            interface (str | None): IP da interface local usada no multicast, caso None
+            utiliza a interface padrão do sistema
+            ttl (int): número de saltos que o datagrama multicast pode atravessar
+            unicast_ip (str): IP unicast dos nós sem endereço informado no PeerBook
+            unicast_base_port (int): porta base unicast, o nó de id i utiliza unicast_base_port + i
+            planes (dict[str, tuple[str, int]] | None): grupo e porta próprios de cada plano
+            shared_memory (str | None): namespace dos anéis de memória compartilhada, caso
+            None os nós locais também utilizam o UDP
+            local_ids (tuple[int, ...] | None): ids dos nós no mesmo host, caso None todos
+        """
+        
+        self.group: str = group
+        self.port: int = port
+        self.interface: str | None = interface
+        self.ttl: int = ttl
+        self.unicast_ip: str = unicast_ip
+        self.unicast_base_port: int = unicast_base_port
+        self.planes: dict[str, tuple[str, int]] = dict(planes or {})
+        self.shared_memory: str | None = shared_memory
+        self.local_ids: tuple[int, ...] | None = local_ids
+        
+        
+    def address(self, plane: str | None = None) -> tuple[str, int]:
+        """
+        Args:
+            plane (str | None): nome do plano, caso None o grupo do cluster
+
+        Returns:
+            tuple[str, int]: grupo e porta multicast do plano
+        """
+        
+        return self.planes.get(plane, (self.group, self.port))
+    
+    
+    def addresses(self, subscriptions: tuple[str, ...] | None = None) -> list[tuple[str, int]]:
+        """
+        Args:
+            subscriptions (tuple[str, ...] | None): planos utilizados pelo nó, caso None todos
+
+        Returns:
+            list[tuple[str, int]]: grupos (sem repetição) dos quais o nó deve participar
+        """
+        
+        res: list[tuple[str, int]] = []
+        
+        for plane in (subscriptions if subscriptions is not None else PLANE_NAMES):
+            address: tuple[str, int] = self.address(plane)
+            
+            if address not in res:
+                res.append(address)
+                
+        return res
+    
+    
+    def routes(self) -> dict[int, tuple[str, int]]:
+        """
+        Returns:
+            dict[int, tuple[str, int]]: grupo de destino por valor do tipo de mensagem,
+            vazio se todos os planos utilizam o grupo do cluster
+        """
+        
+        if not self.planes:
+            return {}
+        
+        return {k.value: self.address(plane) for k, plane in PLANES.items()}
+    
+    
+    def split(self) -> "ClusterConfig":
+        """
+        Cria a configuração com um grupo por plano: o plano de índice i em PLANE_NAMES
+        utiliza o grupo do cluster com o último octeto somado de i, na mesma porta
+
+        Returns:
+            ClusterConfig: configuração com os grupos de cada plano
+        """
+        
+        prefix, last = self.group.rsplit(".", 1)
+        
+        return ClusterConfig(
+            group=self.group,
+            port=self.port,
+            interface=self.interface,
+            ttl=self.ttl,
+            unicast_ip=self.unicast_ip,
+            unicast_base_port=self.unicast_base_port,
+            planes={plane: (f"{prefix}.{int(last) + i}", self.port) for i, plane in enumerate(PLANE_NAMES)},
+            shared_memory=self.shared_memory,
+            local_ids=self.local_ids
+        )
+        
+        
+    def peers(self) -> PeerBook:
+        """
+        Returns:
+            PeerBook: catálogo de endereços unicast padrão do cluster
+        """
+        
+        return PeerBook(ip=self.unicast_ip, base_port=self.unicast_base_port)
+    
+    
+    def sender(self, peers: PeerBook | None = None) -> "MulticastSender":
+        """
+        Returns:
+            MulticastSender: remetente persistente para o grupo (ou grupos dos planos) do cluster
+        """
+        
+        return MulticastSender(
+            group=self.group,
+            port=self.port,
+            ttl=self.ttl,
+            interface=self.interface,
+            peers=peers if peers is not None else self.peers(),
+            routes=self.routes()
+        )
+    
+    
+    def __repr__(self) -> str:
+        planes: str = f", planes={self.planes}" if self.planes else ""
+        shm: str = f", shared_memory={self.shared_memory}" if self.shared_memory is not None else ""
+        return f"ClusterConfig(group={self.group}, port={self.port}, interface={self.interface}{planes}{shm})"
+    
+
+# Cluster utilizado quando nenhuma configuração é informada
+DEFAULT_CLUSTER: ClusterConfig = ClusterConfig()
+
+
+class MulticastSender():
+    """
+    Remetente de longa duração de um nó: mantém um único socket de envio aberto
+    durante toda a vida do nó, evitando criar, vincular, entrar no grupo multicast
+    e fechar um socket a cada mensagem enviada.
+    
+    O mesmo objeto pode ser compartilhado entre a thread do DF, a thread de escuta
+    e a thread principal do nó.
+    """
+    
+    def __init__(self, 
+                 group: str = MULTICAST_GROUP, 
+                 port: int = MUSTICAST_PORT,
+                 ttl: int = 1,
+                 loopback: bool = True,
+                 interface: str | None = None,
+                 mtu: int = RECV_BUFFER_SIZE,
+                 peers: PeerBook | None = None,
+                 routes: dict[int, tuple[str, int]] | None = None) -> None:
+        """
+        Args:
+            group (str): endereço do grupo multicast de destino
+            port (int): porta do grupo multicast de destino
+            ttl (int): número de saltos que o datagrama multicast pode atravessar
+            loopback (bool): se True o próprio host também recebe as mensagens enviadas
+            interface (str | None): IP da interface local usada para o envio multicast
+            mtu (int): tamanho máximo de um datagrama, mensagens maiores são fragmentadas
+            peers (PeerBook | None): endereços unicast dos nós utilizados por send_to
+            routes (dict[int, tuple[str, int]] | None): grupo de destino por valor do tipo
+            de mensagem (ver ClusterConfig.routes), os outros tipos são enviados para group
+        """
+        
+        self._group: tuple = (group, port)
+        self._routes: dict[int, tuple[str, int]] = routes or {}
+        self._ttl: int = ttl
+        self._loopback: bool = loopback
+        self._interface: str | None = interface
+        self._mtu: int = mtu
+        
+        self._sock: socket.socket | None = None
+        self._lock: threading.Lock = threading.Lock()
+        
+        self._peers: PeerBook = peers if peers is not None else PeerBook()
+        
+        # Socket unicast persistente e conectado de cada nó de destino de send_to
+        self._peer_socks: dict[int, socket.socket] = {}
+        
+        # Identificador das mensagens fragmentadas enviadas por este remetente, o início 
+        # aleatório evita repetir os ids de antes de um reinício do nó
+        self._fragment_ids: itertools.count = itertools.count(random.getrandbits(32))
+        
+        
+    def __create_socket(self) -> socket.socket:
+        """
+        Cria o socket de envio, não é necessário vincular a porta multicast 
+        nem participar do grupo para enviar mensagens
+        
+        Returns:
+            socket: socket de envio configurado
+        """
+        
+        sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, struct.pack('b', self._ttl))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if self._loopback else 0)
+        
+        if self._interface is not None:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(self._interface))
+        
+        return sock
+    
+    
+    def __datagrams(self, message: bytes) -> list[bytes]:
+        if len(message) > self._mtu:
+            return fragment(message, next(self._fragment_ids), self._mtu)
+        
+        return [message]
+    
+    
+    def __sendto(self, message: bytes, address: tuple) -> None:
+        datagrams: list[bytes] = self.__datagrams(message)
+        
+        with self._lock:
+            if self._sock is None:
+                self._sock = self.__create_socket()
+            
+            for d in datagrams:
+                self._sock.sendto(d, address)
+    
+        
+    def send(self, message: bytes) -> bool:
+        """
+        Envia uma mensagem para o grupo multicast utilizando o socket persistente
+
+        Args:
+            message (bytes): a mensagem que será enviada para os outros nós por multicast
+
+        Returns:
+            bool: True se o envio da mensagem for sucesso, False caso contrário
+        """
+        
+        try:
+            self.__sendto(message, route(message, self._routes, self._group))
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Não foi possível enviar os dados\nException:{e}")
+            return False
+        
+        
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        """
+        Envia uma mensagem para apenas um nó reutilizando o socket persistente
+
+        Args:
+            message (bytes): a mensagem que será enviada para o outro nó
+            port (int): porta do nó onde será enviada a mensagem
+            ip (str): endereço do nó onde será enviada a mensagem
+
+        Returns:
+            bool: True se o envio da mensagem for sucesso, False caso contrário
+        """
+        
+        try:
+            self.__sendto(message, (ip, port))
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Não foi possível enviar os dados\nException:{e}")
+            return False
+        
+        
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        """
+        Envia uma mensagem para apenas um nó, pelo socket unicast persistente 
+        e conectado ao endereço do nó no catálogo de endereços
+
+        Args:
+            peer_id (int): id do nó de destino
+            message (bytes): a mensagem que será enviada para o nó
+
+        Returns:
+            bool: True se o envio da mensagem for sucesso, False caso contrário
+        """
+        
+        try:
+            datagrams: list[bytes] = self.__datagrams(message)
+            
+            with self._lock:
+                sock: socket.socket | None = self._peer_socks.get(peer_id)
+                
+                if sock is None:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+                    sock.connect(self._peers.address(peer_id))
+                    self._peer_socks[peer_id] = sock
+                    
+                for d in datagrams:
+                    sock.send(d)
+                    
+            return True
+        
+        except ConnectionRefusedError:
+            # Erro ICMP de um envio anterior, o nó de destino não está escutando
+            logger.debug(f"⚠️ Servidor {peer_id} não está escutando no endereço unicast")
+            return False
+        
+        except Exception as e:
+            logger.error(f"❌ Não foi possível enviar os dados\nException:{e}")
+            return False
+        
+        
+    def close(self) -> None:
+        """
+        Fecha os sockets de envio, novos sockets são criados no próximo envio
+        """
+        
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+                
+            for sock in self._peer_socks.values():
+                sock.close()
+                
+            self._peer_socks.clear()
+
+
+def route(message: bytes, routes: dict[int, tuple[str, int]], default: tuple) -> tuple:
+    """
+    Grupo de destino de uma mensagem (ou datagrama agrupado, cujas mensagens são do
+    mesmo plano, ver Message.send_batch) pelo tipo no cabeçalho
+
+    Args:
+        message (bytes): mensagem codificada
+        routes (dict[int, tuple[str, int]]): grupo por valor do tipo de mensagem
+        default (tuple): grupo das mensagens sem rota (e das mensagens JSON legadas)
+
+    Returns:
+        tuple: endereço (grupo, porta) de destino
+    """
+    
+    if not routes or message[0] != WIRE_VERSION:
+        return default
+    
+    return routes.get(message[1], default)
+
+
+def plane_of(message: bytes) -> str | None:
+    """
+    Returns:
+        str | None: plano do tipo da mensagem, None para mensagens JSON legadas ou tipos sem plano
+    """
+    
+    if message[0] != WIRE_VERSION:
+        return None
+    
+    try:
+        return PLANES.get(MessageEnum(message[1]))
+    except ValueError:
+        return None
+
+
+# Remetente compartilhado pelas chamadas estáticas que não informam um remetente
+_default_sender: MulticastSender | None = None
+_default_sender_lock: threading.Lock = threading.Lock()
+
+
+def default_sender() -> MulticastSender:
+    """
+    Retorna o remetente padrão do processo, criado na primeira utilização
+
+    Returns:
+        MulticastSender: remetente multicast compartilhado
+    """
+    
+    global _default_sender
+    
+    with _default_sender_lock:
+        if _default_sender is None:
+            _default_sender = MulticastSender()
+            
+    return _default_sender
+
+
+class Outbox():
+    """
+    Caixa de saída de um nó, possui a mesma interface do Transport (e de envio do MulticastSender)
+    e encaminha o recebimento para o transporte encapsulado.
+    
+    Fora de um bloco batch() as mensagens são enviadas imediatamente. Dentro de um
+    bloco batch() as mensagens multicast da thread atual são acumuladas e enviadas
+    ao final do bloco agrupadas no menor número de datagramas possível, reduzindo
+    o custo por pacote de quem envia e de todos os nós que recebem.
+    """
+    
+    def __init__(self, sender, mtu: int = RECV_BUFFER_SIZE) -> None:
+        """
+        Args:
+            sender (Transport | MulticastSender): transporte ou remetente persistente utilizado no envio
+            mtu (int): tamanho máximo de cada datagrama agrupado
+        """
+        
+        self._sender = sender
+        self._mtu: int = mtu
+        
+        # Cada thread possui as suas próprias mensagens pendentes (multicast e por nó de destino)
+        self._local: threading.local = threading.local()
+        
+        
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Acumula as mensagens enviadas pela thread atual até o final do bloco
+        """
+        
+        pending: list[bytes] | None = getattr(self._local, "pending", None)
+        
+        # Blocos aninhados são enviados pelo bloco mais externo
+        if pending is not None:
+            yield
+            return
+        
+        self._local.pending = []
+        self._local.pending_to = {}
+        
+        try:
+            yield
+        finally:
+            pending, self._local.pending = self._local.pending, None
+            pending_to, self._local.pending_to = self._local.pending_to, None
+            
+            if pending:
+                Message.send_batch(pending, sender=self._sender, mtu=self._mtu)
+                
+            for peer_id, messages in pending_to.items():
+                for datagram in pack_batch(messages, self._mtu):
+                    self._sender.send_to(peer_id, datagram)
+                
+        
+    def send(self, message: bytes) -> bool:
+        pending: list[bytes] | None = getattr(self._local, "pending", None)
+        
+        if pending is None:
+            return self._sender.send(message)
+        
+        pending.append(message)
+        return True
+    
+    
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        return self._sender.send_unicast(message, port, ip)
+    
+    
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        pending_to: dict[int, list[bytes]] | None = getattr(self._local, "pending_to", None)
+        
+        if pending_to is None:
+            return self._sender.send_to(peer_id, message)
+        
+        pending_to.setdefault(peer_id, []).append(message)
+        return True
+    
+    
+    def start(self, f: Callable[[bytes], None]) -> None:
+        self._sender.start(f)
+        
+        
+    async def astart(self, f: Callable[[bytes], None]) -> None:
+        await self._sender.astart(f)
+        
+        
+    def stop(self) -> None:
+        self._sender.stop()
+        
+        
+    def stats(self) -> dict:
+        return self._sender.stats()
+    
+    
+    def close(self) -> None:
+        self._sender.close()
     
         
 class Message():
@@ -54,18 +687,30 @@ class Message():
   
 
     @staticmethod
-    def create_socket_multicast() -> socket:
+    def create_socket_multicast(cluster: ClusterConfig | None = None, address: tuple[str, int] | None = None) -> socket:
         """
         Método estático que cria um socket multicast
         
+        Args:
+            cluster (ClusterConfig | None): grupo, porta e interface do cluster, caso 
+            None utiliza o cluster padrão
+            address (tuple[str, int] | None): grupo e porta de um plano do cluster 
+            (ver ClusterConfig.addresses), caso None utiliza o grupo do cluster
+        
         Returns:
             socket: socket multicast 
         """
         
+        if cluster is None:
+            cluster = DEFAULT_CLUSTER
+            
+        group, port = address if address is not None else (cluster.group, cluster.port)
+        
         # Criação do socket multicast 
 
-        # Configuração de porta multicast
-        server_address = ('', MUSTICAST_PORT)
+        # Configuração de porta multicast. No Linux o socket é vinculado ao endereço do 
+        # grupo, assim não recebe os datagramas de outros grupos na mesma porta
+        server_address = (group if sys.platform.startswith("linux") else '', port)
         
         sock: socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         
@@ -76,42 +721,88 @@ class Message():
         sock.bind(server_address)
 
         # Participação no grupo multicast
-        group = socket.inet_aton(MULTICAST_GROUP)
-        mreq = struct.pack('4sL', group, socket.INADDR_ANY)
+        group = socket.inet_aton(group)
+        
+        if cluster.interface is None:
+            mreq = struct.pack('4sL', group, socket.INADDR_ANY)
+        else:
+            mreq = group + socket.inet_aton(cluster.interface)
+            
         sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
         
         return sock   
+    
+    
+    @staticmethod
+    def create_socket_unicast(address: tuple[str, int]) -> socket:
+        """
+        Cria o socket onde o nó recebe as mensagens enviadas diretamente para ele (send_to)
+
+        Args:
+            address (tuple[str, int]): endereço unicast do nó (ver PeerBook)
+
+        Returns:
+            socket: socket unicast vinculado ao endereço
+        """
+        
+        sock: socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(address)
+        
+        return sock
         
         
     @staticmethod
-    def send_unicast(message: bytes, port: int) -> bool:
+    def send_unicast(message: bytes, port: int, sender: MulticastSender | None = None) -> bool:
         """
         Envia uma messagem para apenas um nó do sistema
 
         Args:
             message (bytes): a mensagem que será enviada para o outro nó
             port (int): porta do nó onde será enviada a mensagem
+            sender (MulticastSender | None): remetente persistente do nó, caso None 
+            utiliza o remetente padrão do processo
 
         Returns:
             bool: True se o envio da mensagem for sucesso, False caso contrário
         """
         
-        sock: socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if sender is None:
+            sender = default_sender()
         
-        try:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"⬆️ Mensagem Unicast Enviando: {message}")
-            sock.sendto(message, (UNICAST_IP, port))
+        
+        res: bool = sender.send_unicast(message, port)
+        
+        if res:
             logger.debug("✅ Dados Enviados com Sucesso")
+            
+        return res
+            
+    
+    @staticmethod
+    def send_to(message: bytes, peer_id: int, sender: MulticastSender | None = None) -> bool:
+        """
+        Envia uma mensagem para apenas um nó, identificado pelo id do processo
 
-            return True
-        
-        except Exception as e:
-            logger.error(f"❌ Não foi possível enviar os dados\nException:{e}")
-            return False
+        Args:
+            message (bytes): a mensagem que será enviada para o nó
+            peer_id (int): id do nó de destino
+            sender (MulticastSender | None): remetente persistente do nó, caso None 
+            utiliza o remetente padrão do processo
+
+        Returns:
+            bool: True se o envio da mensagem for sucesso, False caso contrário
+        """
         
-        finally:
-            sock.close()
+        if sender is None:
+            sender = default_sender()
+            
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"⬆️ Mensagem Unicast para o Servidor {peer_id}: {handle_message(message)}")
             
+        return sender.send_to(peer_id, message)
+    
     
     @staticmethod
     def recv_unicast(f: Callable[[bytes], None], port: int) -> None:
@@ -131,65 +822,122 @@ class Message():
         
         s.bind((UNICAST_IP, port))
         
+        reassembler: Reassembler = Reassembler()
+        
         while True:
-            data, _ = s.recvfrom(1024)
+            data, _ = s.recvfrom(RECV_BUFFER_SIZE)
+            
+            data = reassembler.feed(data)
+            
+            if data is None:
+                continue
 
-            logger.debug(f"⬇️ Mensagem Unicast Recebida: {message}")
+            for m in split_datagram(data):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"⬇️ Mensagem Unicast Recebida: {m}")
             
-            f(data)
+                f(m)
 
 
     @staticmethod
-    def send_multicast(message: bytes) -> bool:
+    def send_multicast(message: bytes, sender: MulticastSender | None = None) -> bool:
         """
         Envia uma mensagem para todos os nós que pertecem ao grupo de multicast
 
         Args:
             message (bytes): a mensagem que será enviada para os outros nós por multicast
+            sender (MulticastSender | None): remetente persistente do nó, caso None 
+            utiliza o remetente padrão do processo
             
         Returns:
             bool: True se o envio da mensagem for sucesso, False caso contrário
         """
-    
-        # Configuração de endereço e porta multicast
-        multicast_group: tuple = (MULTICAST_GROUP, MUSTICAST_PORT)
         
-        try:
-            # Envio de dados
+        if sender is None:
+            sender = default_sender()
+        
+        # A mensagem só é decodificada para o log quando o nível DEBUG está ativo
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"⬆️ Mensagem Multicast Enviando: {handle_message(message)}")
-            s: socket = Message.create_socket_multicast()
-            sent: int = s.sendto(message, multicast_group)
-            
+        
+        res: bool = sender.send(message)
+        
+        if res:
             logger.debug("✅ Dados Enviados com Sucesso")
-            return True
             
-        except Exception as e:
-            logger.error(f"❌ Não foi possível enviar os dados\nException:{e}")
-            return False
+        return res
         
-        finally:
-            s.close()
+
+    @staticmethod
+    def send_batch(messages: list[bytes], sender: MulticastSender | None = None, mtu: int = RECV_BUFFER_SIZE) -> bool:
+        """
+        Envia várias mensagens para o grupo multicast agrupadas em datagramas de
+        no máximo mtu bytes
+
+        Args:
+            messages (list[bytes]): mensagens que serão enviadas
+            sender (MulticastSender | None): remetente persistente do nó, caso None 
+            utiliza o remetente padrão do processo
+            mtu (int): tamanho máximo de cada datagrama
+
+        Returns:
+            bool: True se o envio de todos os datagramas for sucesso, False caso contrário
+        """
+        
+        if sender is None:
+            sender = default_sender()
+            
+        # Cada datagrama agrupa mensagens de um único plano, que pode ter um grupo próprio
+        by_plane: dict[str | None, list[bytes]] = {}
+        
+        for m in messages:
+            by_plane.setdefault(plane_of(m), []).append(m)
+            
+        datagrams: list[bytes] = [d for group in by_plane.values() for d in pack_batch(group, mtu)]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"⬆️ {len(messages)} Mensagens Multicast Enviando em {len(datagrams)} datagrama(s)")
+        
+        res: bool = True
+        
+        for d in datagrams:
+            res = sender.send(d) and res
+            
+        return res
         
 
     @staticmethod
-    def recv_multicast(f: Callable[[bytes], None]) -> None:
+    def recv_multicast(f: Callable[[bytes], None], cluster: ClusterConfig | None = None) -> None:
         """
-        Recebe uma mensagem enviada por um nó do sistema por multcast
+        Recebe uma mensagem enviada por um nó do sistema por multcast, mensagens 
+        fragmentadas são remontadas e datagramas agrupados são separados, cada 
+        mensagem é entregue individualmente para f
 
         Args:
             f (Callable): função de primeira ordem com as operações que devem
             ser feita com essa mensagem
+            cluster (ClusterConfig | None): cluster cujo grupo é escutado, caso None 
+            utiliza o cluster padrão
             
         Returns:
             None: não retorna nada
         """
         
-        s: socket = Message.create_socket_multicast()
+        s: socket = Message.create_socket_multicast(cluster)
+        
+        reassembler: Reassembler = Reassembler()
         
         while True:
-            data, _ = s.recvfrom(1024)
+            data, _ = s.recvfrom(RECV_BUFFER_SIZE)
+            
+            data = reassembler.feed(data)
+            
+            if data is None:
+                continue
         
-            logger.debug(f"⬇️ Mensagem Multicast Recebida: {handle_message(data)}")
+            for m in split_datagram(data):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"⬇️ Mensagem Multicast Recebida: {handle_message(m)}")
             
-            f(data)
+                f(m)
         
\ No newline at end of file
@@ -20,3 +20,20 @@ class MessageEnum(Enum):
     BIZANTINE_START = 9
     BIZANTINE_VOTE = 10
     BIZANTINE_DECIDE = 11
+    
+    # Canal confiável
+    NACK = 12
+    
+    # Difusão com ordem total
+    TOB_DATA = 13
+    TOB_ORDER = 14
+    
+    # Entrada no cluster
+    JOIN_REQUEST = 15
+    JOIN_SNAPSHOT = 16
+    
+    # Saída do cluster
+    LEAVE = 17
+    
+    # Visão dos membros do cluster
+    VIEW = 18
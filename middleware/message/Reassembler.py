@@ -0,0 +1,161 @@
+"""
+   Remontagem das mensagens fragmentadas pelo remetente (ver Codec.fragment)
+
+   No primeiro fragmento recebido de uma mensagem é alocado um buffer com o tamanho
+   total da mensagem, e cada fragmento é copiado diretamente para a sua posição por
+   meio de memoryviews. Quando todos os fragmentos chegam o buffer é entregue.
+
+   Mensagens incompletas são descartadas após um timeout, e o total de memória
+   reservada para remontagens é limitado, descartando as mais antigas quando necessário.
+   Fragmentos de mensagens maiores que esse limite são ignorados, por padrão o limite é
+   MAX_MESSAGE_SIZE, a maior mensagem produzida por Codec.encode.
+"""
+
+import time
+import logging
+import threading
+
+from collections import OrderedDict
+
+from .Codec import FRAGMENT_HEADER, FRAGMENT_HEADER_SIZE, MAX_MESSAGE_SIZE, is_fragment, fragment_size
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending():
+    __slots__ = ("buffer", "view", "received", "missing", "created")
+
+    def __init__(self, total: int, count: int) -> None:
+        self.buffer: bytearray = bytearray(total)
+        self.view: memoryview = memoryview(self.buffer)
+        self.received: bytearray = bytearray(count)
+        self.missing: int = count
+        self.created: float = time.monotonic()
+
+
+class Reassembler():
+    def __init__(self, timeout: float = 2.0, max_bytes: int = MAX_MESSAGE_SIZE, history: int = 256) -> None:
+        """
+        Args:
+            timeout (float): tempo máximo, em segundos, para receber todos os fragmentos
+            max_bytes (int): memória máxima reservada para mensagens incompletas
+            history (int): quantidade de mensagens já remontadas lembradas para 
+            ignorar fragmentos repetidos que cheguem depois
+        """
+
+        self._timeout: float = timeout
+        self._max_bytes: int = max_bytes
+
+        # (sender_id, msg_id) -> remontagem em andamento, da mais antiga para a mais nova
+        self._pending: OrderedDict = OrderedDict()
+        self._pending_bytes: int = 0
+
+        self._history: int = history
+        self._done: OrderedDict = OrderedDict()
+
+        self._lock: threading.Lock = threading.Lock()
+
+        self._completed: int = 0
+        self._expired: int = 0
+        self._evicted: int = 0
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: completed, expired, evicted, pending e pending_bytes
+        """
+
+        with self._lock:
+            return {
+                "completed": self._completed,
+                "expired": self._expired,
+                "evicted": self._evicted,
+                "pending": len(self._pending),
+                "pending_bytes": self._pending_bytes,
+            }
+
+
+    def __discard(self, key: tuple) -> None:
+        p: _Pending = self._pending.pop(key)
+        self._pending_bytes -= len(p.buffer)
+
+
+    def __expire(self, now: float) -> None:
+        while self._pending:
+            key, p = next(iter(self._pending.items()))
+
+            if now - p.created <= self._timeout:
+                break
+
+            self.__discard(key)
+            self._expired += 1
+
+
+    def feed(self, data: bytes) -> bytes | bytearray | None:
+        """
+        Processa um datagrama recebido
+
+        Args:
+            data (bytes): datagrama recebido
+
+        Returns:
+            bytes | bytearray | None: o próprio datagrama se não for um fragmento, a mensagem
+            remontada quando o último fragmento chega, ou None se a mensagem ainda está incompleta
+        """
+
+        if not is_fragment(data):
+            return data
+
+        _, sender_id, msg_id, index, count, total = FRAGMENT_HEADER.unpack_from(data)
+
+        if index >= count or total > self._max_bytes:
+            return None
+
+        key: tuple = (sender_id, msg_id)
+
+        with self._lock:
+            if key in self._done:
+                return None
+
+            self.__expire(time.monotonic())
+
+            p: _Pending | None = self._pending.get(key)
+
+            if p is None:
+                while self._pending and self._pending_bytes + total > self._max_bytes:
+                    self.__discard(next(iter(self._pending)))
+                    self._evicted += 1
+
+                p = _Pending(total, count)
+                self._pending[key] = p
+                self._pending_bytes += total
+
+            if p.received[index]:
+                return None
+
+            size: int = fragment_size(total, count)
+            chunk: memoryview = memoryview(data)[FRAGMENT_HEADER_SIZE:]
+
+            if index * size + len(chunk) > total:
+                logger.warning(f"⚠️ Fragmento inválido do Servidor {sender_id} descartado")
+                return None
+
+            p.view[index * size:index * size + len(chunk)] = chunk
+            p.received[index] = 1
+            p.missing -= 1
+
+            if p.missing:
+                return None
+
+            self.__discard(key)
+            self._completed += 1
+
+            self._done[key] = None
+
+            if len(self._done) > self._history:
+                self._done.popitem(last=False)
+
+        p.view.release()
+
+        return p.buffer
@@ -0,0 +1,254 @@
+"""
+   Recebimento multicast com drenagem dedicada do socket
+
+   Em Message.recv_multicast a função de tratamento é executada dentro do laço de
+   recebimento, e enquanto o nó responde (LEADER_ACK, ANSWER, BIZANTINE_VOTE) o
+   socket não é lido e o kernel descarta os datagramas que não cabem no buffer.
+
+   O MulticastReceiver separa as duas tarefas:
+
+   * Thread de drenagem: apenas lê o socket e coloca os datagramas em um anel
+     (ring) limitado em memória
+   * Workers: retiram os datagramas do anel, remontam as mensagens fragmentadas,
+     separam as mensagens e executam a função de tratamento
+
+   Contadores:
+   * received: datagramas lidos do socket
+   * dropped_kernel: datagramas descartados pelo kernel por falta de espaço no
+     buffer do socket (SO_RXQ_OVFL, disponível no Linux)
+   * dropped_ring: datagramas descartados porque o anel estava cheio (os mais
+     antigos são descartados, mantendo os HEARTBEATs mais recentes)
+   * processed: mensagens entregues para a função de tratamento
+
+   Os datagramas são lidos com recvmsg_into em bytearrays reutilizados de um pool,
+   e as mensagens são entregues para a função de tratamento como memoryviews desse
+   buffer, sem cópias. A função de tratamento não deve guardar referência para a
+   mensagem recebida após retornar, pois o buffer volta para o pool.
+"""
+
+import sys
+import socket
+import struct
+import logging
+import threading
+
+from collections import deque
+from typing import Callable
+
+from .Codec import split_datagram
+from .Message import RECV_BUFFER_SIZE
+from .Reassembler import Reassembler
+
+logger = logging.getLogger(__name__)
+
+
+class BufferPool():
+    """
+    Pool de bytearrays de tamanho fixo reutilizados no recebimento dos datagramas
+    """
+
+    def __init__(self, size: int, count: int) -> None:
+        """
+        Args:
+            size (int): tamanho de cada buffer
+            count (int): quantidade de buffers pré-alocados
+        """
+
+        self._size: int = size
+        self._free: deque = deque(bytearray(size) for _ in range(count))
+
+
+    def acquire(self) -> bytearray:
+        try:
+            return self._free.pop()
+        except IndexError:
+            return bytearray(self._size)
+
+
+    def release(self, buf: bytearray) -> None:
+        self._free.append(buf)
+
+
+# Opção do Linux que anexa a cada datagrama o total de descartes do socket
+SO_RXQ_OVFL: int | None = getattr(socket, "SO_RXQ_OVFL", 40 if sys.platform.startswith("linux") else None)
+
+
+class MulticastReceiver():
+    def __init__(self,
+                 f: Callable[[bytes], None],
+                 sock: socket.socket,
+                 rcvbuf: int | None = None,
+                 ring_size: int = 1024,
+                 workers: int = 1) -> None:
+        """
+        Args:
+            f (Callable): função de primeira ordem com as operações que devem
+            ser feita com cada mensagem recebida
+            sock (socket): socket já vinculado de onde os datagramas são lidos
+            rcvbuf (int | None): tamanho do buffer de recebimento do socket (SO_RCVBUF),
+            caso None mantém o padrão do sistema
+            ring_size (int): número máximo de datagramas aguardando processamento
+            workers (int): número de threads que processam as mensagens
+        """
+
+        self._f: Callable[[bytes], None] = f
+        self._sock: socket.socket = sock
+
+        if rcvbuf is not None:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+
+        self._ancbufsize: int = 0
+
+        if SO_RXQ_OVFL is not None:
+            try:
+                self._sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                self._ancbufsize = socket.CMSG_SPACE(4)
+            except OSError:
+                logger.warning("⚠️ SO_RXQ_OVFL não suportado, descartes do kernel não serão contados")
+
+        # Permite que a thread de drenagem verifique periodicamente se deve parar
+        self._sock.settimeout(0.5)
+
+        # Anel de (buffer, tamanho do datagrama), com buffers suficientes para o anel cheio
+        self._ring: deque = deque()
+        self._ring_size: int = ring_size
+        self._ring_cond: threading.Condition = threading.Condition()
+        
+        self._pool: BufferPool = BufferPool(RECV_BUFFER_SIZE, ring_size + workers + 1)
+
+        self._stop_event: threading.Event = threading.Event()
+        
+        self._reassembler: Reassembler = Reassembler()
+
+        self._drain_thread: threading.Thread = threading.Thread(target=self.__drain_thread, daemon=True)
+        self._worker_threads: list[threading.Thread] = [
+            threading.Thread(target=self.__worker_thread, daemon=True) for _ in range(workers)
+        ]
+
+        self._received: int = 0
+        self._dropped_kernel: int = 0
+        self._dropped_ring: int = 0
+        self._processed: int = 0
+        self._processed_lock: threading.Lock = threading.Lock()
+
+
+    def start(self) -> None:
+        self._drain_thread.start()
+
+        for th in self._worker_threads:
+            th.start()
+
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+        with self._ring_cond:
+            self._ring_cond.notify_all()
+
+        self._drain_thread.join(timeout=1)
+
+        for th in self._worker_threads:
+            th.join(timeout=1)
+
+        self._sock.close()
+
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores do recebimento
+
+        Returns:
+            dict: received, dropped_kernel, dropped_ring, processed, pending e os
+            descartes de mensagens fragmentadas incompletas
+        """
+
+        with self._ring_cond:
+            pending: int = len(self._ring)
+
+        reassembly: dict = self._reassembler.stats()
+
+        return {
+            "received": self._received,
+            "dropped_kernel": self._dropped_kernel,
+            "dropped_ring": self._dropped_ring,
+            "processed": self._processed,
+            "pending": pending,
+            "fragments_expired": reassembly["expired"],
+            "fragments_evicted": reassembly["evicted"],
+        }
+
+
+    def __drain_thread(self) -> None:
+        """
+        Thread que apenas lê o socket e coloca os datagramas no anel
+        """
+
+        buf: bytearray = self._pool.acquire()
+        
+        while not self._stop_event.is_set():
+            try:
+                nbytes, ancdata, _, _ = self._sock.recvmsg_into([buf], self._ancbufsize)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self._received += 1
+
+            for level, kind, value in ancdata:
+                if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL and len(value) >= 4:
+                    # O kernel informa o total acumulado de descartes do socket
+                    self._dropped_kernel = struct.unpack("=I", value[:4])[0]
+
+            with self._ring_cond:
+                if len(self._ring) == self._ring_size:
+                    self._dropped_ring += 1
+                    self._pool.release(self._ring.popleft()[0])
+
+                self._ring.append((buf, nbytes))
+                self._ring_cond.notify()
+                
+            buf = self._pool.acquire()
+
+
+    def __worker_thread(self) -> None:
+        """
+        Thread que decodifica e entrega as mensagens para a função de tratamento
+        """
+
+        while True:
+            with self._ring_cond:
+                while not self._ring and not self._stop_event.is_set():
+                    self._ring_cond.wait()
+
+                if self._stop_event.is_set():
+                    return
+
+                buf, nbytes = self._ring.popleft()
+
+            try:
+                self.__process(memoryview(buf)[:nbytes])
+            finally:
+                self._pool.release(buf)
+                
+                
+    def __process(self, view: memoryview) -> None:
+        try:
+            data: memoryview | bytearray | None = self._reassembler.feed(view)
+            
+            if data is None:
+                return
+            
+            messages: list[memoryview] = split_datagram(data)
+        except (ValueError, IndexError) as e:
+            logger.warning(f"⚠️ Datagrama inválido descartado: {e}")
+            return
+
+        for m in messages:
+            try:
+                self._f(m)
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar mensagem\nException:{e}")
+
+            with self._processed_lock:
+                self._processed += 1
@@ -0,0 +1,382 @@
+"""
+   Canal confiável (NACK) para as mensagens de controle críticas
+
+   COORDINATOR, ANSWER, BIZANTINE_DECIDE e LEADER_ACK são enviados uma única vez sobre UDP,
+   e uma perda só era recuperada pelas repetições do protocolo (difusão do LEADER_SEARCH,
+   reenvio do ELECTION, novas eleições). O ReliableChannel envolve o transporte do nó
+   e entrega essas mensagens de forma confiável sem repeti-las para todo o grupo:
+
+   * cada mensagem recebe um número de sequência do remetente (extensão do cabeçalho,
+     ver Codec.stamp_reliable), com uma sequência multicast para cada plano (ver
+     Message.PLANES) e uma para cada nó de destino das mensagens direcionadas. Um nó
+     inscrito apenas em alguns planos não recebe o multicast dos outros, portanto não
+     vê lacunas (nem pede retransmissões) nas sequências que não recebe. A época
+     identifica a execução do remetente, assim um nó reiniciado não tem as suas
+     mensagens descartadas como duplicadas
+   * o receptor detecta lacunas na sequência e pede a retransmissão com um NACK
+     direcionado ao remetente, repetido a cada tick até max_nack_retries
+   * o remetente guarda as últimas history_size mensagens de cada sequência e as
+     retransmite apenas para o nó que enviou o NACK
+   * mensagens já recebidas (retransmissões e cópias) são descartadas
+   * como uma perda da última mensagem não gera lacuna, a cada tick o remetente reenvia
+     uma vez a última mensagem de cada sequência que recebeu novas mensagens
+
+   As mensagens são entregues assim que chegam, sem aguardar as lacunas anteriores
+   (não há ordenação total, ver TotalOrder para isso).
+
+   Uso (ver Node): as mensagens críticas são enviadas pelo canal no lugar do transporte,
+   Message.send_multicast(m, sender=channel) / Message.send_to(m, peer_id, sender=channel),
+   as mensagens recebidas com FLAG_RELIABLE passam por accept, os NACKs recebidos por
+   handle_nack e tick é executado periodicamente.
+"""
+
+import random
+import logging
+import threading
+
+from collections import OrderedDict
+
+from .Codec import FLAG_DIRECT, stamp_reliable
+from .Message import PLANES, PLANE_NAMES, message, plane_of
+from .MessageEnum import MessageEnum
+from .TypedMessage import TypedMessage, NackMessage
+
+logger = logging.getLogger(__name__)
+
+
+class _SendStream():
+    """
+    Sequência de envio (multicast de um plano ou para um nó) e histórico para retransmissão
+    """
+
+    __slots__ = ("seq", "history", "probe")
+
+    def __init__(self) -> None:
+        self.seq: int = 0
+        self.history: OrderedDict[int, bytes] = OrderedDict()
+
+        # Última mensagem ainda não reenviada pelo tick (perda da cauda)
+        self.probe: bool = False
+
+
+class _RecvStream():
+    """
+    Estado de recebimento da sequência de um remetente
+    """
+
+    __slots__ = ("epoch", "expected", "ahead", "retries")
+
+    def __init__(self, epoch: int, expected: int) -> None:
+        self.epoch: int = epoch
+
+        # Próxima sequência esperada, todas as anteriores já foram recebidas ou abandonadas
+        self.expected: int = expected
+
+        # Sequências recebidas depois de uma lacuna
+        self.ahead: set[int] = set()
+
+        self.retries: int = 0
+
+
+    def missing(self, limit: int) -> list[tuple[int, int]]:
+        """
+        Returns:
+            list[tuple[int, int]]: até limit intervalos (first, last) ainda não recebidos
+        """
+
+        ranges: list[tuple[int, int]] = []
+        first: int | None = None
+
+        for seq in range(self.expected, max(self.ahead) + 1):
+            if seq not in self.ahead:
+                if first is None:
+                    first = seq
+            elif first is not None:
+                ranges.append((first, seq - 1))
+                first = None
+
+                if len(ranges) == limit:
+                    break
+
+        return ranges
+
+
+class ReliableChannel():
+    def __init__(self, transport, process_id: int, history_size: int = 1024, max_nack_retries: int = 5, max_ranges: int = 8, join_window: int = 16) -> None:
+        """
+        Args:
+            transport (Transport | Outbox): transporte do nó, utilizado para os envios,
+            as retransmissões e os NACKs
+            process_id (int): id do nó
+            history_size (int): mensagens guardadas por sequência para retransmissão, também
+            é a maior lacuna recuperável
+            max_nack_retries (int): ticks pedindo uma lacuna antes de abandoná-la
+            max_ranges (int): máximo de intervalos pedidos por tick para cada remetente
+            join_window (int): se a primeira mensagem recebida de um remetente tiver sequência
+            até join_window, as anteriores são pedidas, caso contrário a sequência começa nela
+        """
+
+        self._transport = transport
+        self._process_id: int = process_id
+
+        self._history_size: int = history_size
+        self._max_nack_retries: int = max_nack_retries
+        self._max_ranges: int = max_ranges
+        self._join_window: int = join_window
+
+        self._epoch: int = random.getrandbits(32)
+
+        self._lock: threading.Lock = threading.Lock()
+
+        # Plano da sequência multicast, ou id do nó de destino
+        self._send: dict[str | int, _SendStream] = {}
+
+        # (id do remetente, plano ou None para a sequência direcionada) -> estado de recebimento
+        self._recv: dict[tuple[int, str | None], _RecvStream] = {}
+
+        self._stats: dict[str, int] = {
+            "sent": 0,
+            "retransmitted": 0,
+            "probes": 0,
+            "nacks_sent": 0,
+            "nacks_received": 0,
+            "duplicates": 0,
+            "recovered": 0,
+            "lost": 0,
+            "evicted": 0,
+        }
+
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+
+    # Envio
+
+    def send(self, message: bytes) -> bool:
+        """
+        Envia uma mensagem para todos os nós do grupo pelo canal confiável
+        """
+
+        return self._transport.send(self.__stamp(plane_of(message) or PLANE_NAMES[0], message))
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        """
+        Envia uma mensagem para apenas um nó pelo canal confiável
+        """
+
+        return self._transport.send_to(peer_id, self.__stamp(peer_id, message))
+
+
+    def __stamp(self, key: str | int, message: bytes) -> bytes:
+        with self._lock:
+            stream: _SendStream = self._send.setdefault(key, _SendStream())
+            stream.seq += 1
+
+            frame: bytes = stamp_reliable(message, self._epoch, stream.seq, direct=isinstance(key, int))
+
+            stream.history[stream.seq] = frame
+            stream.probe = True
+
+            if len(stream.history) > self._history_size:
+                stream.history.popitem(last=False)
+
+            self._stats["sent"] += 1
+
+        return frame
+
+
+    # Recebimento
+
+    def accept(self, m: TypedMessage) -> bool:
+        """
+        Registra uma mensagem recebida com FLAG_RELIABLE, pedindo por NACK as
+        mensagens anteriores que ainda não chegaram
+
+        Args:
+            m (TypedMessage): mensagem recebida
+
+        Returns:
+            bool: True se a mensagem deve ser entregue, False se já foi recebida
+        """
+
+        key: tuple[int, str | None] = (m.sender_id, None if m.flags & FLAG_DIRECT else self.__plane(m.type))
+        nack: tuple[int, int] | None = None
+
+        with self._lock:
+            stream: _RecvStream | None = self._recv.get(key)
+
+            # Primeira mensagem do remetente, ou remetente reiniciado (nova época). Se o
+            # remetente acabou de iniciar, as suas primeiras mensagens também são pedidas
+            if stream is None or stream.epoch != m.epoch:
+                stream = _RecvStream(m.epoch, 1 if m.seq <= self._join_window else m.seq + 1)
+                self._recv[key] = stream
+
+                if m.seq > self._join_window:
+                    return True
+
+            if m.seq < stream.expected or m.seq in stream.ahead:
+                self._stats["duplicates"] += 1
+                return False
+
+            if m.seq == stream.expected:
+                stream.expected += 1
+
+                if stream.ahead:
+                    self._stats["recovered"] += 1
+
+                while stream.expected in stream.ahead:
+                    stream.ahead.remove(stream.expected)
+                    stream.expected += 1
+
+                if not stream.ahead:
+                    stream.retries = 0
+
+                return True
+
+            # Lacuna maior que o histórico do remetente, as mensagens não podem ser recuperadas
+            if m.seq - stream.expected > self._history_size:
+                self._stats["lost"] += m.seq - stream.expected - len(stream.ahead)
+                stream.expected = m.seq + 1
+                stream.ahead.clear()
+                stream.retries = 0
+                return True
+
+            if m.seq in range(stream.expected, max(stream.ahead, default=stream.expected) + 1):
+                self._stats["recovered"] += 1
+            else:
+                # Nova lacuna, entre a última sequência recebida e esta
+                nack = (max(stream.ahead, default=stream.expected - 1) + 1, m.seq - 1)
+
+            stream.ahead.add(m.seq)
+
+        if nack is not None and nack[0] <= nack[1]:
+            self.__send_NACK(m.sender_id, m.epoch, nack[0], nack[1], key[1])
+
+        return True
+
+
+    def handle_nack(self, m: NackMessage) -> None:
+        """
+        Retransmite para o nó que enviou o NACK as mensagens pedidas que ainda
+        estão no histórico
+        """
+
+        frames: list[bytes] = []
+
+        with self._lock:
+            self._stats["nacks_received"] += 1
+
+            if m.target_epoch != self._epoch:
+                return
+
+            key: str | int = m.sender_id if m.direct else PLANE_NAMES[m.plane % len(PLANE_NAMES)]
+            stream: _SendStream | None = self._send.get(key)
+
+            if stream is None:
+                return
+
+            for seq in range(m.first, min(m.last, m.first + self._history_size) + 1):
+                frame: bytes | None = stream.history.get(seq)
+
+                if frame is None:
+                    self._stats["evicted"] += 1
+                else:
+                    frames.append(frame)
+
+            self._stats["retransmitted"] += len(frames)
+
+        for frame in frames:
+            self._transport.send_to(m.sender_id, frame)
+
+
+    def tick(self) -> None:
+        """
+        Repete os NACKs das lacunas pendentes (abandonando as que excederam
+        max_nack_retries) e reenvia uma vez a última mensagem de cada sequência
+        com envios desde o último tick
+        """
+
+        nacks: list[tuple[int, int, int, int, str | None]] = []
+        probes: list[tuple[str | int, bytes]] = []
+
+        with self._lock:
+            for (sender_id, plane), stream in self._recv.items():
+                if not stream.ahead:
+                    continue
+
+                stream.retries += 1
+
+                if stream.retries > self._max_nack_retries:
+                    last: int = max(stream.ahead)
+
+                    self._stats["lost"] += last + 1 - stream.expected - len(stream.ahead)
+                    logger.warning(f"⚠️ Mensagens {stream.expected}..{last} do Servidor ID {sender_id} abandonadas após {self._max_nack_retries} NACKs")
+
+                    stream.expected = last + 1
+                    stream.ahead.clear()
+                    stream.retries = 0
+                    continue
+
+                for first, last in stream.missing(self._max_ranges):
+                    nacks.append((sender_id, stream.epoch, first, last, plane))
+
+            for key, stream in self._send.items():
+                if stream.probe and stream.history:
+                    stream.probe = False
+                    probes.append((key, next(reversed(stream.history.values()))))
+
+            self._stats["probes"] += len(probes)
+
+        for sender_id, epoch, first, last, plane in nacks:
+            self.__send_NACK(sender_id, epoch, first, last, plane)
+
+        for key, frame in probes:
+            if isinstance(key, int):
+                self._transport.send_to(key, frame)
+            else:
+                self._transport.send(frame)
+
+
+    @staticmethod
+    def __plane(type_value: int) -> str:
+        try:
+            return PLANES.get(MessageEnum(type_value), PLANE_NAMES[0])
+        except ValueError:
+            return PLANE_NAMES[0]
+
+
+    def __send_NACK(self, peer_id: int, epoch: int, first: int, last: int, plane: str | None) -> None:
+        """
+        Args:
+            plane (str | None): plano da sequência multicast com a lacuna, None para a
+            sequência das mensagens direcionadas
+        """
+
+        m: bytes = message(
+            message_enum=MessageEnum.NACK,
+            sender_id=self._process_id,
+            target_epoch=epoch,
+            first=first,
+            last=last,
+            direct=int(plane is None),
+            plane=PLANE_NAMES.index(plane) if plane is not None else 0
+        )
+
+        with self._lock:
+            self._stats["nacks_sent"] += 1
+
+        self._transport.send_to(peer_id, m)
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: sent, retransmitted, probes, nacks_sent, nacks_received, duplicates,
+            recovered, lost e evicted
+        """
+
+        with self._lock:
+            return dict(self._stats)
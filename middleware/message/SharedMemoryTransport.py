@@ -0,0 +1,488 @@
+"""
+   Transporte por memória compartilhada para nós no mesmo host
+
+   Os nós executados no mesmo host (ex.: run_nodes.py) trocavam todas as mensagens
+   pela pilha UDP multicast do kernel. Com o SharedMemoryTransport cada nó publica as
+   suas mensagens em um anel próprio (multiprocessing.shared_memory) que os outros nós
+   do host leem diretamente, sem syscalls por mensagem:
+
+   * o anel possui um único escritor (o dono) e qualquer número de leitores, cada um
+     com a sua posição de leitura local, assim a publicação não utiliza locks entre
+     processos: o escritor copia o registro e depois publica a nova posição de escrita
+     (8 bytes alinhados) no cabeçalho
+   * um multicast é escrito uma única vez no anel e lido por todos os nós locais, um
+     send_to é escrito com o id do destino e ignorado pelos outros leitores
+   * um leitor que fica mais de um anel atrasado (ou cujo registro foi sobrescrito
+     durante a cópia) descarta as mensagens perdidas, como uma perda de datagrama UDP,
+     que o protocolo já tolera (ver Reliable)
+   * os leitores fazem polling, pois o Python não expõe futex: até spin segundos após
+     a última mensagem o leitor apenas cede o processador, depois dorme max_idle
+     entre as leituras. Os anéis dos nós locais são
+     procurados (e um anel recriado por um nó reiniciado é reaberto) a cada scan_interval
+
+   Os nós remotos (ids fora de local_ids) continuam sendo alcançados pelo transporte
+   UDP (fallback): os send_to para eles utilizam o UDP, e os multicasts também são
+   enviados pelo UDP quando o cluster possui nós remotos. As mensagens UDP de um nó
+   cujo anel está aberto são descartadas, pois já foram recebidas pela memória compartilhada.
+
+   Registro do anel: tamanho (uint32), destino (int32, -1 para multicast) e o datagrama,
+   alinhado em 8 bytes. Um registro que não cabe no final do anel é precedido de um
+   marcador PAD e escrito no início.
+"""
+
+import time
+import struct
+import random
+import logging
+import threading
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable
+
+from .Codec import peek_header, split_datagram
+from .Message import UNICAST_IP
+from .Transport import Transport
+
+logger = logging.getLogger(__name__)
+
+RING_MAGIC: bytes = b"DSHM"
+
+# magic, capacidade do anel e época do dono
+RING_HEADER: struct.Struct = struct.Struct("<4sII")
+
+# Posição de escrita (bytes escritos desde a criação), alinhada em 8 bytes
+WRITE_POS: struct.Struct = struct.Struct("<Q")
+WRITE_POS_OFFSET: int = 16
+
+DATA_OFFSET: int = 64
+
+# tamanho e destino de um registro
+RECORD: struct.Struct = struct.Struct("<Ii")
+
+PAD: int = 0xFFFFFFFF
+MULTICAST: int = -1
+
+# Segmentos criados por este processo, removidos por ele ao encerrar
+_OWNED: set[str] = set()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Abre um segmento existente sem mantê-lo no resource_tracker, que o removeria
+    quando este processo (que não é o dono) encerrasse
+    """
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name)
+
+        if name not in _OWNED:
+            resource_tracker.unregister(shm._name, "shared_memory")
+
+        return shm
+
+
+class ShmRing():
+    """
+    Anel de memória compartilhada com um único escritor
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm: shared_memory.SharedMemory = shm
+        self._owner: bool = owner
+
+        magic, self.capacity, self.epoch = RING_HEADER.unpack_from(shm.buf, 0)
+
+        if magic != RING_MAGIC:
+            shm.close()
+            raise ValueError(f"Segmento {shm.name} não é um anel do transporte")
+
+        # Um leitor deve estar a menos de um anel da escrita, descontando o registro em escrita
+        self.max_record: int = self.capacity // 4
+
+        self._lock: threading.Lock = threading.Lock()
+        self._pos: int = WRITE_POS.unpack_from(shm.buf, WRITE_POS_OFFSET)[0]
+
+
+    @classmethod
+    def create(cls, name: str, capacity: int) -> "ShmRing":
+        """
+        Cria o anel do nó, substituindo um anel deixado por uma execução anterior
+
+        Args:
+            name (str): nome do segmento
+            capacity (int): bytes de dados do anel, múltiplo de 8
+        """
+
+        capacity -= capacity % 8
+
+        try:
+            shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=True, size=DATA_OFFSET + capacity)
+        except FileExistsError:
+            stale: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+
+            shm = shared_memory.SharedMemory(name=name, create=True, size=DATA_OFFSET + capacity)
+
+        _OWNED.add(name)
+
+        RING_HEADER.pack_into(shm.buf, 0, RING_MAGIC, capacity, random.getrandbits(32))
+        WRITE_POS.pack_into(shm.buf, WRITE_POS_OFFSET, 0)
+
+        return cls(shm, owner=True)
+
+
+    @classmethod
+    def open(cls, name: str) -> "ShmRing":
+        """
+        Abre o anel de outro nó para leitura
+
+        Raises:
+            FileNotFoundError: se o nó ainda não criou o anel
+        """
+
+        return cls(_attach(name), owner=False)
+
+
+    def write_pos(self) -> int:
+        return WRITE_POS.unpack_from(self._shm.buf, WRITE_POS_OFFSET)[0]
+
+
+    def publish(self, data: bytes, dest: int = MULTICAST) -> None:
+        """
+        Escreve um datagrama no anel (apenas o dono)
+
+        Args:
+            data (bytes): datagrama
+            dest (int): id do nó de destino, ou MULTICAST para todos
+        """
+
+        size: int = (RECORD.size + len(data) + 7) & ~7
+
+        if size > self.max_record:
+            raise ValueError(f"Datagrama de {len(data)} bytes excede o registro máximo do anel")
+
+        buf: memoryview = self._shm.buf
+
+        with self._lock:
+            pos: int = self._pos
+            offset: int = pos % self.capacity
+
+            if self.capacity - offset < size:
+                RECORD.pack_into(buf, DATA_OFFSET + offset, PAD, 0)
+                pos += self.capacity - offset
+                offset = 0
+
+            start: int = DATA_OFFSET + offset + RECORD.size
+
+            buf[start:start + len(data)] = data
+            RECORD.pack_into(buf, DATA_OFFSET + offset, len(data), dest)
+
+            self._pos = pos + size
+            WRITE_POS.pack_into(buf, WRITE_POS_OFFSET, self._pos)
+
+
+    def read(self, pos: int, process_id: int) -> tuple[list[bytes], int, bool]:
+        """
+        Lê os registros publicados a partir de pos
+
+        Args:
+            pos (int): posição de leitura do leitor
+            process_id (int): id do leitor, os registros para outros nós são ignorados
+
+        Returns:
+            tuple[list[bytes], int, bool]: datagramas para o leitor, nova posição de
+            leitura e se houve perda por atraso do leitor
+        """
+
+        buf: memoryview = self._shm.buf
+        limit: int = self.capacity - self.max_record
+
+        write: int = self.write_pos()
+        res: list[bytes] = []
+
+        while pos < write:
+            if write - pos > limit:
+                return res, write, True
+
+            offset: int = pos % self.capacity
+            length, dest = RECORD.unpack_from(buf, DATA_OFFSET + offset)
+
+            if length == PAD:
+                pos += self.capacity - offset
+                continue
+
+            if length > self.max_record:
+                return res, self.write_pos(), True
+
+            start: int = DATA_OFFSET + offset + RECORD.size
+            data: bytes = bytes(buf[start:start + length])
+
+            # O escritor pode ter sobrescrito o registro durante a cópia
+            write = self.write_pos()
+
+            if write - pos > limit:
+                return res, write, True
+
+            pos += (RECORD.size + length + 7) & ~7
+
+            if dest == MULTICAST or dest == process_id:
+                res.append(data)
+
+        return res, pos, False
+
+
+    def close(self) -> None:
+        self._shm.close()
+
+        if self._owner:
+            _OWNED.discard(self._shm.name)
+
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class _Peer():
+    """
+    Anel de um nó local aberto para leitura e a posição de leitura
+    """
+
+    __slots__ = ("ring", "pos")
+
+    def __init__(self, ring: ShmRing) -> None:
+        self.ring: ShmRing = ring
+
+        # Começa no final: as mensagens publicadas antes da abertura não são entregues
+        self.pos: int = ring.write_pos()
+
+
+class SharedMemoryTransport(Transport):
+    def __init__(self,
+                 process_id: int,
+                 local_ids: list[int],
+                 fallback: Transport | None = None,
+                 namespace: str = "distributed",
+                 capacity: int = 1 << 20,
+                 remote: bool = True,
+                 spin: float = 0.002,
+                 max_idle: float = 0.001,
+                 scan_interval: float = 1.0) -> None:
+        """
+        Args:
+            process_id (int): id do nó
+            local_ids (list[int]): ids dos nós no mesmo host, cujos anéis são lidos
+            fallback (Transport | None): transporte dos nós remotos (ex.: UdpTransport), caso
+            None apenas os nós locais são alcançados
+            namespace (str): prefixo dos segmentos, clusters com namespaces diferentes não
+            leem os anéis uns dos outros
+            capacity (int): bytes de dados do anel do nó, o maior datagrama é capacity / 4
+            remote (bool): se existem nós remotos, os multicasts também são enviados pelo fallback
+            spin (float): tempo após a última mensagem em que o polling não dorme, em segundos
+            max_idle (float): espera do polling sem mensagens após spin, em segundos
+            scan_interval (float): intervalo para procurar (ou reabrir) os anéis dos nós locais
+        """
+
+        self._process_id: int = process_id
+        self._local_ids: list[int] = [id for id in local_ids if id != process_id]
+        self._fallback: Transport | None = fallback
+        self._namespace: str = namespace
+        self._capacity: int = capacity
+        self._remote: bool = remote and fallback is not None
+        self._spin: float = spin
+        self._max_idle: float = max_idle
+        self._scan_interval: float = scan_interval
+
+        self._ring: ShmRing | None = None
+
+        # id do nó local -> anel aberto
+        self._peers: dict[int, _Peer] = {}
+
+        self._running: bool = False
+        self._thread: threading.Thread | None = None
+
+        self._stats: dict[str, int] = {
+            "shm_sent": 0,
+            "shm_received": 0,
+            "overruns": 0,
+            "duplicates": 0,
+        }
+
+
+    def __name(self, process_id: int) -> str:
+        return f"{self._namespace}-{process_id}"
+
+
+    # Envio
+
+    def send(self, message: bytes) -> bool:
+        ok: bool = self.__publish(message, MULTICAST)
+
+        if self._remote:
+            ok = self._fallback.send(message) and ok
+
+        return ok
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        if peer_id in self._local_ids:
+            return self.__publish(message, peer_id)
+
+        if self._fallback is None:
+            return False
+
+        return self._fallback.send_to(peer_id, message)
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        if self._fallback is None:
+            return super().send_unicast(message, port, ip)
+
+        return self._fallback.send_unicast(message, port, ip)
+
+
+    def __publish(self, message: bytes, dest: int) -> bool:
+        if self._ring is None:
+            logger.error("❌ Transporte de memória compartilhada não iniciado")
+            return False
+
+        try:
+            self._ring.publish(message, dest)
+        except ValueError as e:
+            logger.error(f"❌ Erro ao publicar mensagem na memória compartilhada\nException:{e}")
+            return False
+
+        self._stats["shm_sent"] += 1
+        return True
+
+
+    # Recebimento
+
+    def start(self, f: Callable[[bytes], None]) -> None:
+        self._ring = ShmRing.create(self.__name(self._process_id), self._capacity)
+        self._running = True
+
+        if self._fallback is not None:
+            self._fallback.start(lambda data: self.__on_fallback(f, data))
+
+        self._thread = threading.Thread(target=self.__reader_thread, args=(f,), daemon=True)
+        self._thread.start()
+
+
+    def __on_fallback(self, f: Callable[[bytes], None], data: bytes) -> None:
+        """
+        Descarta as mensagens UDP de nós cujo anel está aberto, recebidas também pela memória compartilhada
+        """
+
+        try:
+            _, sender_id = peek_header(data)
+        except Exception:
+            sender_id = None
+
+        if sender_id in self._peers:
+            self._stats["duplicates"] += 1
+            return
+
+        f(data)
+
+
+    def __scan(self) -> None:
+        """
+        Abre os anéis dos nós locais que ainda não foram abertos, e reabre os anéis
+        recriados por nós reiniciados (nova época)
+        """
+
+        for peer_id in self._local_ids:
+            try:
+                ring: ShmRing = ShmRing.open(self.__name(peer_id))
+            except (FileNotFoundError, ValueError):
+                continue
+
+            peer: _Peer | None = self._peers.get(peer_id)
+
+            if peer is not None and peer.ring.epoch == ring.epoch:
+                ring.close()
+                continue
+
+            if peer is not None:
+                peer.ring.close()
+
+            self._peers[peer_id] = _Peer(ring)
+            logger.debug(f"🔗 Servidor ID {self._process_id} lê o anel do Servidor ID {peer_id}")
+
+
+    def __reader_thread(self, f: Callable[[bytes], None]) -> None:
+        last: float = 0.0
+        next_scan: float = 0.0
+
+        while self._running:
+            now: float = time.monotonic()
+
+            if now >= next_scan:
+                self.__scan()
+                next_scan = now + self._scan_interval
+
+            received: int = 0
+
+            for peer in list(self._peers.values()):
+                datagrams, peer.pos, overrun = peer.ring.read(peer.pos, self._process_id)
+
+                if overrun:
+                    self._stats["overruns"] += 1
+
+                for data in datagrams:
+                    try:
+                        messages: list[bytes] = split_datagram(data)
+                    except ValueError as e:
+                        logger.warning(f"⚠️ Datagrama inválido descartado: {e}")
+                        continue
+
+                    for m in messages:
+                        try:
+                            f(m)
+                        except Exception as e:
+                            logger.error(f"❌ Erro ao processar mensagem\nException:{e}")
+
+                received += len(datagrams)
+
+            self._stats["shm_received"] += received
+
+            # Sem mensagens: cede o processador durante spin, e depois dorme max_idle
+            if received:
+                last = now
+            else:
+                time.sleep(0 if now - last < self._spin else self._max_idle)
+
+        for peer in self._peers.values():
+            peer.ring.close()
+
+        self._peers = {}
+
+
+    def stop(self) -> None:
+        self._running = False
+
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+        if self._fallback is not None:
+            self._fallback.stop()
+
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: shm_sent, shm_received, overruns (leituras atrasadas que perderam mensagens),
+            duplicates (mensagens UDP descartadas) e os contadores do fallback
+        """
+
+        stats: dict = self._fallback.stats() if self._fallback is not None else {}
+        return {**stats, **self._stats}
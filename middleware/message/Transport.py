@@ -0,0 +1,187 @@
+"""
+   Interface de transporte utilizada pelo Node e pelos seus subsistemas
+
+   O Node, o DF, a Eleição e o Consenso não dependem mais diretamente dos sockets
+   multicast: todos os envios e o recebimento passam pelo Transport injetado no Node.
+
+   Implementações:
+
+   * UdpTransport: multicast UDP nos grupos do cluster (ClusterConfig) e unicast UDP entre os nós
+     (MulticastSender + MulticastReceiver), utilizado pelos nós em processos separados. Cada
+     grupo recebido possui o seu socket e a sua fila, e o nó participa apenas dos grupos
+     dos planos em que está inscrito
+   * LoopbackTransport (ver LoopbackTransport.py): entrega em memória entre nós do
+     mesmo processo, com latência e perda configuráveis
+   * AsyncUdpTransport (ver AsyncMessage.py): UDP sobre o event loop do asyncio
+   * SharedMemoryTransport (ver SharedMemoryTransport.py): anéis de memória compartilhada
+     entre os nós do mesmo host, com UDP para os nós remotos (ClusterConfig.shared_memory)
+   * HostTransport (ver HostTransport.py): UDP compartilhado (UdpHub) pelos nós executados
+     no mesmo processo (ver NodeHost)
+"""
+
+import logging
+
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from .Message import Message, ClusterConfig, MulticastSender, PeerBook, DEFAULT_CLUSTER, UNICAST_IP
+from .Receiver import MulticastReceiver
+
+logger = logging.getLogger(__name__)
+
+
+class Transport(ABC):
+    @abstractmethod
+    def send(self, message: bytes) -> bool:
+        """
+        Envia uma mensagem (ou datagrama agrupado) para todos os nós do grupo
+
+        Returns:
+            bool: True se o envio da mensagem for sucesso, False caso contrário
+        """
+
+
+    @abstractmethod
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        """
+        Envia uma mensagem para apenas um nó, identificado pelo id do processo
+
+        Returns:
+            bool: True se o envio da mensagem for sucesso, False caso contrário
+        """
+
+
+    @abstractmethod
+    def start(self, f: Callable[[bytes], None]) -> None:
+        """
+        Inicia o recebimento, cada mensagem recebida (multicast ou direcionada
+        ao nó) é entregue para f
+
+        Args:
+            f (Callable): função de primeira ordem com as operações que devem
+            ser feita com cada mensagem
+        """
+
+
+    @abstractmethod
+    def stop(self) -> None:
+        """
+        Encerra o recebimento e libera os recursos do transporte
+        """
+
+
+    async def astart(self, f: Callable[[bytes], None]) -> None:
+        """
+        Inicia o recebimento a partir de um event loop (ex.: AsyncNode)
+        """
+
+        self.start(f)
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        logger.error("❌ Transporte não suporta envio unicast por porta, utilize send_to")
+        return False
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: contadores do recebimento, quando o transporte os possui
+        """
+
+        return {}
+
+
+class UdpTransport(Transport):
+    def __init__(self,
+                 process_id: int,
+                 cluster: ClusterConfig | None = None,
+                 peers: PeerBook | None = None,
+                 sender: MulticastSender | None = None,
+                 rcvbuf: int | None = None,
+                 ring_size: int = 1024,
+                 workers: int = 1,
+                 planes: tuple[str, ...] | None = None) -> None:
+        """
+        Args:
+            process_id (int): id do nó, define o endereço unicast onde o nó escuta
+            cluster (ClusterConfig | None): grupo, porta e interface do cluster, caso None
+            utiliza o cluster padrão
+            peers (PeerBook | None): endereços unicast dos nós, caso None utiliza os do cluster
+            sender (MulticastSender | None): remetente persistente, caso None é criado um para o cluster
+            rcvbuf (int | None): tamanho do buffer de recebimento dos sockets (SO_RCVBUF)
+            ring_size (int): número máximo de datagramas aguardando processamento
+            workers (int): número de threads que processam as mensagens multicast
+            planes (tuple[str, ...] | None): planos recebidos pelo nó (ver Message.PLANES), caso
+            None todos. Ex.: um observador sem ("consensus",) não recebe as rajadas de votos
+        """
+
+        self._process_id: int = process_id
+        self._cluster: ClusterConfig = cluster if cluster is not None else DEFAULT_CLUSTER
+        self._peers: PeerBook = peers if peers is not None else self._cluster.peers()
+        self._sender: MulticastSender = sender if sender is not None else self._cluster.sender(self._peers)
+
+        self._rcvbuf: int | None = rcvbuf
+        self._ring_size: int = ring_size
+        self._workers: int = workers
+        self._planes: tuple[str, ...] | None = planes
+
+        self._receivers: list[MulticastReceiver] = []
+
+
+    def send(self, message: bytes) -> bool:
+        return self._sender.send(message)
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        return self._sender.send_to(peer_id, message)
+
+
+    def send_unicast(self, message: bytes, port: int, ip: str = UNICAST_IP) -> bool:
+        return self._sender.send_unicast(message, port, ip)
+
+
+    def start(self, f: Callable[[bytes], None]) -> None:
+        self._receivers = [
+            MulticastReceiver(
+                f,
+                sock=Message.create_socket_multicast(self._cluster, address),
+                rcvbuf=self._rcvbuf,
+                ring_size=self._ring_size,
+                workers=self._workers
+            )
+            for address in self._cluster.addresses(self._planes)
+        ] + [
+            MulticastReceiver(
+                f,
+                sock=Message.create_socket_unicast(self._peers.address(self._process_id)),
+                rcvbuf=self._rcvbuf,
+                ring_size=self._ring_size
+            ),
+        ]
+
+        for receiver in self._receivers:
+            receiver.start()
+
+
+    def stop(self) -> None:
+        for receiver in self._receivers:
+            receiver.stop()
+
+        self._receivers = []
+        self._sender.close()
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: contadores do MulticastReceiver, somando o recebimento de todos os grupos e o unicast
+        """
+
+        stats: dict = {}
+
+        for receiver in self._receivers:
+            for key, value in receiver.stats().items():
+                stats[key] = stats.get(key, 0) + value
+
+        return stats
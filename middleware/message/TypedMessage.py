@@ -0,0 +1,292 @@
+"""
+   Representação tipada das mensagens recebidas
+
+   Cada datagrama é decodificado uma única vez (ver Codec.decode_message) em um objeto
+   da classe correspondente ao seu MessageEnum, com os campos do payload já convertidos.
+   O mesmo objeto é entregue para o DF, a Eleição, o Consenso e o Node, que identificam
+   o tipo da mensagem com isinstance e leem os campos como atributos, sem consultar
+   chaves de dict ou interpretar strings de payload.
+
+   As classes utilizam __slots__, evitando o dict de atributos de cada instância.
+"""
+
+from .MessageEnum import MessageEnum
+
+
+class TypedMessage():
+    """
+    Campos do cabeçalho, comuns a todas as mensagens
+    """
+
+    __slots__ = ("type", "sender_id", "round", "flags", "epoch", "seq")
+
+    # Campos do payload, na ordem do layout binário (ver Codec.LAYOUTS)
+    FIELDS: tuple[str, ...] = ()
+
+    # Payload legado constante do tipo (ex.: "HEARTBEAT"), mantido na conversão para dict
+    PAYLOAD: str | None = None
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0) -> None:
+        self.type: int = type
+        self.sender_id: int = sender_id
+        self.round: int = round
+        self.flags: int = flags
+
+        # Extensão do canal confiável (ver Reliable), preenchida pelo Codec quando presente
+        self.epoch: int = 0
+        self.seq: int = 0
+
+
+    @property
+    def message_enum(self) -> MessageEnum:
+        return MessageEnum(self.type)
+
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: mensagem no formato de dict devolvido por Codec.decode
+        """
+
+        m: dict = {
+            "type": self.type,
+            "sender_id": self.sender_id,
+            "round": self.round
+        }
+
+        for name in self.FIELDS:
+            m[name] = getattr(self, name)
+
+        if self.PAYLOAD is not None:
+            m["payload"] = self.PAYLOAD
+
+        return m
+
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+
+        return f"{type(self).__name__}(sender_id={self.sender_id}, round={self.round}{', ' + fields if fields else ''})"
+
+
+class TextMessage(TypedMessage):
+    """
+    TEST e REQUEST_VALUE, com payload livre em texto
+    """
+
+    __slots__ = ("payload",)
+    FIELDS = ("payload",)
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0, payload: str = "") -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.payload: str = payload
+
+
+# Algoritmo do Valentão
+
+class ElectionMessage(TypedMessage):
+    __slots__ = ()
+    PAYLOAD = "ELECTION"
+
+
+class AnswerMessage(TypedMessage):
+    __slots__ = ()
+    PAYLOAD = "ANSWER_ACK"
+
+
+class CoordinatorMessage(TypedMessage):
+    __slots__ = ()
+    PAYLOAD = "COORDINATOR"
+
+
+# Detector de Falhas
+
+class HeartbeatMessage(TypedMessage):
+    __slots__ = ()
+    PAYLOAD = "HEARTBEAT"
+
+
+# Pesquisa do Líder
+
+class LeaderSearchMessage(TypedMessage):
+    __slots__ = ()
+    PAYLOAD = "LEADER_SEARCH"
+
+
+class LeaderAckMessage(TypedMessage):
+    __slots__ = ("leader",)
+    FIELDS = ("leader",)
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0, leader: int = 0) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.leader: int = leader
+
+
+# Bizantino, a rodada é transportada no cabeçalho
+
+class BizantineStartMessage(TypedMessage):
+    __slots__ = ()
+
+
+class BizantineVoteMessage(TypedMessage):
+    __slots__ = ("vote",)
+    FIELDS = ("vote",)
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0, vote: int = 0) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.vote: int = vote
+
+
+class BizantineDecideMessage(TypedMessage):
+    __slots__ = ("value",)
+    FIELDS = ("value",)
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0, value: int = 0) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.value: int = value
+
+
+# Canal confiável
+
+class NackMessage(TypedMessage):
+    """
+    Pedido de retransmissão das mensagens first..last (inclusive) da época target_epoch
+    do nó de destino, direct indica a sequência das mensagens direcionadas ao nó, caso
+    contrário plane é o índice (ver Message.PLANE_NAMES) da sequência multicast do plano
+    """
+
+    __slots__ = ("target_epoch", "first", "last", "direct", "plane")
+    FIELDS = ("target_epoch", "first", "last", "direct", "plane")
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0,
+                 target_epoch: int = 0, first: int = 0, last: int = 0, direct: int = 0, plane: int = 0) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.target_epoch: int = target_epoch
+        self.first: int = first
+        self.last: int = last
+        self.direct: int = direct
+        self.plane: int = plane
+
+
+# Difusão com ordem total
+
+class TobDataMessage(TypedMessage):
+    """
+    Mensagem difundida, identificada por (sender_id, data_epoch, local_id)
+    """
+
+    __slots__ = ("data_epoch", "local_id", "payload")
+    FIELDS = ("data_epoch", "local_id", "payload")
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0,
+                 data_epoch: int = 0, local_id: int = 0, payload: str = "") -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.data_epoch: int = data_epoch
+        self.local_id: int = local_id
+        self.payload: str = payload
+
+
+class TobOrderMessage(TypedMessage):
+    """
+    Números de sequência first, first + 1, ... atribuídos pelo líder às entradas
+    (sender_id, data_epoch, local_id)
+    """
+
+    __slots__ = ("first", "entries")
+    FIELDS = ("first", "entries")
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0,
+                 first: int = 0, entries: tuple = ()) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.first: int = first
+        self.entries: tuple = entries
+
+
+# Entrada no cluster
+
+class JoinRequestMessage(TypedMessage):
+    __slots__ = ()
+
+
+class JoinSnapshotMessage(TypedMessage):
+    """
+    Estado do cluster enviado pelo líder para um nó que está entrando, a rodada de
+    consenso atual é transportada no cabeçalho. view é a versão da visão do líder e
+    members os ids dos seus membros em ordem crescente, incluindo o líder
+    """
+
+    __slots__ = ("leader", "decided_round", "decided_value", "view", "members")
+    FIELDS = ("leader", "decided_round", "decided_value", "view", "members")
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0,
+                 leader: int = 0, decided_round: int = 0, decided_value: int = 0, view: int = 0, members: tuple[int, ...] = ()) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.leader: int = leader
+        self.decided_round: int = decided_round
+        self.decided_value: int = decided_value
+        self.view: int = view
+        self.members: tuple[int, ...] = members
+
+
+# Saída do cluster
+
+class LeaveMessage(TypedMessage):
+    """
+    Saída graciosa de um nó (ver Node.stop), os outros nós o marcam como suspeito
+    sem aguardar o DF e, se era o líder, iniciam uma eleição
+    """
+
+    __slots__ = ()
+
+
+# Visão dos membros do cluster
+
+class ViewMessage(TypedMessage):
+    """
+    Visão difundida pelo líder a cada alteração dos membros (ver Membership), members
+    são os ids dos membros em ordem crescente
+    """
+
+    __slots__ = ("version", "members")
+    FIELDS = ("version", "members")
+
+    def __init__(self, type: int, sender_id: int, round: int = 0, flags: int = 0,
+                 version: int = 0, members: tuple[int, ...] = ()) -> None:
+        super().__init__(type, sender_id, round, flags)
+        self.version: int = version
+        self.members: tuple[int, ...] = members
+
+
+MESSAGE_CLASSES: dict[MessageEnum, type[TypedMessage]] = {
+    MessageEnum.TEST:               TextMessage,
+    MessageEnum.REQUEST_VALUE:      TextMessage,
+
+    MessageEnum.ELECTION:           ElectionMessage,
+    MessageEnum.ANSWER:             AnswerMessage,
+    MessageEnum.COORDINATOR:        CoordinatorMessage,
+
+    MessageEnum.HEARTBEAT:          HeartbeatMessage,
+
+    MessageEnum.LEADER_SEARCH:      LeaderSearchMessage,
+    MessageEnum.LEADER_ACK:         LeaderAckMessage,
+
+    MessageEnum.BIZANTINE_START:    BizantineStartMessage,
+    MessageEnum.BIZANTINE_VOTE:     BizantineVoteMessage,
+    MessageEnum.BIZANTINE_DECIDE:   BizantineDecideMessage,
+
+    MessageEnum.NACK:               NackMessage,
+
+    MessageEnum.TOB_DATA:           TobDataMessage,
+    MessageEnum.TOB_ORDER:          TobOrderMessage,
+
+    MessageEnum.JOIN_REQUEST:       JoinRequestMessage,
+    MessageEnum.JOIN_SNAPSHOT:      JoinSnapshotMessage,
+
+    MessageEnum.LEAVE:              LeaveMessage,
+
+    MessageEnum.VIEW:               ViewMessage,
+}
@@ -1,32 +1,176 @@
-import subprocess
-import time
+"""
+Cluster launcher: starts all the nodes in parallel and waits until each node reports
+a readiness event (first heartbeat sent, leader known, first consensus round decided).
+Every node process writes its events to a pipe (main.py --ready-fd). The launcher
+prints the time-to-ready of each node and of the whole cluster, measured from the
+launch, and stops all the processes together.
+
+Usage:
+    python3 run_nodes.py --nodes 5                         # run until Ctrl+C
+    python3 run_nodes.py --nodes 3 --ready leader --exit   # CI: stop once a leader is known
+
+Any other argument is forwarded to main.py (e.g. --shm, --split-planes).
+"""
+
+import os
 import sys
+import time
+import argparse
+import selectors
+import subprocess
+
+from middleware.Node import READY_EVENTS
+
+
+class Cluster:
+    def __init__(self, node_ids, per_process=1, extra=(), verbose=False):
+        self.node_ids = list(node_ids)
+        self.groups = [self.node_ids[i:i + per_process] for i in range(0, len(self.node_ids), per_process)]
+        self.extra = list(extra)
+        self.verbose = verbose
+
+        self.processes = []
+        self.selector = selectors.DefaultSelector()
+        self.buffers = {}
+
+        # node id -> event -> seconds since the launch
+        self.events = {i: {} for i in self.node_ids}
+        self.exited = []
+        self.started = None
+
+    def start(self):
+        """
+        Starts every node process at once, without waiting for the previous one
+        """
+        self.started = time.monotonic()
+
+        for group in self.groups:
+            ids = ["--id", str(group[0])] if len(group) == 1 else ["--ids", *map(str, group)]
+            r, w = os.pipe()
+
+            p = subprocess.Popen(
+                [sys.executable, "main.py", *ids, "--cluster-size", str(len(self.node_ids)), "--ready-fd", str(w), *self.extra],
+                pass_fds=(w,),
+                stdout=None if self.verbose else subprocess.DEVNULL,
+                stderr=None if self.verbose else subprocess.DEVNULL
+            )
+
+            # Only the node keeps the write end, EOF means the process exited
+            os.close(w)
+            self.selector.register(r, selectors.EVENT_READ, group)
+            self.buffers[r] = b""
+            self.processes.append(p)
+
+    def __read(self, timeout):
+        for key, _ in self.selector.select(timeout):
+            data = os.read(key.fd, 4096)
+            now = time.monotonic() - self.started
+
+            if not data:
+                print(f"Node(s) {key.data} exited")
+                self.exited.extend(key.data)
+                self.selector.unregister(key.fd)
+                os.close(key.fd)
+                continue
+
+            lines = (self.buffers[key.fd] + data).split(b"\n")
+            self.buffers[key.fd] = lines.pop()
+
+            for line in lines:
+                node_id, event, _ = line.decode().split()
+                self.events[int(node_id)].setdefault(event, now)
 
-# Script to launch 3 nodes as separate processes
+    def ready(self, event):
+        return all(event in e for e in self.events.values())
+
+    def wait_ready(self, event, timeout):
+        """
+        Waits until every node reports event
+
+        Returns:
+            bool: True if the cluster is ready, False after the timeout or if a node
+            exited before reporting event
+        """
+        deadline = self.started + timeout
+
+        while not self.ready(event):
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0 or any(event not in self.events[i] for i in self.exited):
+                return False
+
+            self.__read(remaining)
+
+        return True
+
+    def report(self, event):
+        print(f"{'node':>6}" + "".join(f"{e:>12}" for e in READY_EVENTS))
+
+        for node_id, events in self.events.items():
+            print(f"{node_id:>6}" + "".join(f"{events[e]:>11.2f}s" if e in events else f"{'-':>12}" for e in READY_EVENTS))
+
+        if self.ready(event):
+            print(f"Cluster ready ({event}) in {max(e[event] for e in self.events.values()):.2f}s")
+        else:
+            print(f"Cluster not ready ({event}): nodes {[i for i, e in self.events.items() if event not in e]}")
+
+    def stop(self, timeout=5):
+        """
+        Stops every process together: SIGTERM to all (each node announces that it
+        leaves the cluster, see Node.stop), then SIGKILL to the ones still running
+        after timeout seconds
+        """
+        for p in self.processes:
+            if p.poll() is None:
+                p.terminate()
+
+        deadline = time.monotonic() + timeout
+
+        for p in self.processes:
+            try:
+                p.wait(max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                p.kill()
+                p.wait()
+
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fd)
+            os.close(key.fd)
 
-def run_node(node_id):
-    return subprocess.Popen([
-        sys.executable, "main.py", "--id", str(node_id)
-    ])
 
 def main():
-    processes = []
-    for node_id in [1, 2, 3, 4, 5]:
-        print(f"Starting node {node_id}")
-        p = run_node(node_id)
-        processes.append(p)
-        time.sleep(1)  # Stagger startup for clarity
+    parser = argparse.ArgumentParser(description="Launch the nodes and wait until the cluster is ready")
+    parser.add_argument("--nodes", type=int, help="Number of nodes (ids 1 to N)", default=5)
+    parser.add_argument("--per-process", type=int, help="Nodes hosted by each process", default=1)
+    parser.add_argument("--ready", choices=READY_EVENTS, help="Readiness event awaited from every node", default="decided")
+    parser.add_argument("--timeout", type=float, help="Seconds to wait for the cluster to be ready", default=60)
+    parser.add_argument("--exit", action="store_true", help="Stop the cluster once it is ready (exit code 1 if not)")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the nodes")
+    args, extra = parser.parse_known_args()
+
+    cluster = Cluster(range(1, args.nodes + 1), args.per_process, extra, args.verbose)
+    ready = False
+
     try:
-        print("All nodes started. Press Ctrl+C to stop.")
-        while True:
-            time.sleep(1)
+        print(f"Starting {args.nodes} node(s) in {len(cluster.groups)} process(es)")
+        cluster.start()
+
+        ready = cluster.wait_ready(args.ready, args.timeout)
+        cluster.report(args.ready)
+
+        if not args.exit:
+            print("Press Ctrl+C to stop.")
+            while True:
+                time.sleep(1)
     except KeyboardInterrupt:
+        pass
+    finally:
         print("Stopping all nodes...")
-        for p in processes:
-            p.terminate()
-        for p in processes:
-            p.wait()
+        cluster.stop()
         print("All nodes stopped.")
 
+    sys.exit(0 if ready else 1)
+
+
 if __name__ == "__main__":
     main()
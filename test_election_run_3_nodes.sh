@@ -1,8 +1,4 @@
 #!/bin/sh
 
-SCRIPT="main.py --id"
-
-for i in 1 2 3; do
-    python3 $SCRIPT $i &
-done 
-
+# Starts 3 nodes in parallel and stops them once every node knows the leader
+python3 run_nodes.py --nodes 3 --ready leader --exit "$@"
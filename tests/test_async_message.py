@@ -0,0 +1,81 @@
+"""
+Testes unitários para o transporte assíncrono (AsyncMessage), verificando a
+interoperabilidade com o envio baseado em threads
+"""
+
+import asyncio
+import unittest
+
+from middleware.message.AsyncMessage import AsyncMulticastSender, create_multicast_endpoint
+from middleware.message.Message import Message, ClusterConfig, message, handle_message
+from middleware.message.MessageEnum import MessageEnum
+
+
+# Grupo próprio dos testes, não interfere com nós em execução no cluster padrão
+TEST_CLUSTER: ClusterConfig = ClusterConfig(group="224.1.1.203", port=5108)
+
+
+class TestAsyncMessage(unittest.TestCase):
+    def test_async_endpoint_receives_messages_from_both_senders(self):
+        """
+        O endpoint assíncrono recebe as mensagens enviadas pelo AsyncMulticastSender
+        e pelo Message.send_multicast
+        """
+
+        async def scenario() -> list[dict]:
+            received: asyncio.Queue = asyncio.Queue()
+
+            sender: AsyncMulticastSender = AsyncMulticastSender(group=TEST_CLUSTER.group, port=TEST_CLUSTER.port)
+            thread_sender = TEST_CLUSTER.sender()
+
+            transport = await create_multicast_endpoint(
+                lambda m: received.put_nowait(handle_message(m)),
+                sender=sender,
+                cluster=TEST_CLUSTER
+            )
+
+            try:
+                self.assertTrue(sender.send(message(
+                    message_enum=MessageEnum.TEST,
+                    sender_id=1,
+                    payload="async"
+                )))
+
+                Message.send_multicast(message(
+                    message_enum=MessageEnum.TEST,
+                    sender_id=2,
+                    payload="thread"
+                ), sender=thread_sender)
+
+                return [
+                    await asyncio.wait_for(received.get(), 2),
+                    await asyncio.wait_for(received.get(), 2)
+                ]
+            finally:
+                transport.close()
+                thread_sender.close()
+
+        res: list[dict] = asyncio.run(scenario())
+
+        self.assertEqual(
+            first=sorted((m["sender_id"], m["payload"]) for m in res),
+            second=[(1, "async"), (2, "thread")]
+        )
+
+
+    def test_send_without_endpoint_fails(self):
+        """
+        Sem um endpoint associado o envio não é realizado
+        """
+
+        sender: AsyncMulticastSender = AsyncMulticastSender()
+
+        self.assertFalse(sender.send(message(
+            message_enum=MessageEnum.TEST,
+            sender_id=1,
+            payload="ping"
+        )))
+
+
+if __name__ == '__main__':
+    unittest.main()
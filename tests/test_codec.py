@@ -0,0 +1,253 @@
+"""
+Testes unitários para o formato binário das mensagens (Codec), verificando
+a codificação dos layouts tipados e a compatibilidade com o JSON legado
+"""
+
+import json
+import unittest
+
+from middleware.message.Codec import (
+    HEADER_SIZE, MESSAGE_ID_SIZE, FLAG_COMPRESSED, HEADER, encode, decode, decode_message, pack_batch, split_datagram,
+    configure_compression, compression_stats, peek_message_id, stamp_reliable
+)
+from middleware.message.Message import message, handle_message
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.TypedMessage import BizantineVoteMessage, LeaderAckMessage
+
+
+class TestCodec(unittest.TestCase):
+    def test_message_without_payload_only_has_the_header(self):
+        """
+        Mensagens como HEARTBEAT não possuem payload, apenas o cabeçalho fixo e o id da mensagem
+        """
+
+        m: bytes = message(
+            message_enum=MessageEnum.HEARTBEAT,
+            sender_id=3,
+            payload="HEARTBEAT"
+        )
+
+        self.assertEqual(len(m), HEADER_SIZE + MESSAGE_ID_SIZE)
+
+        res: dict = handle_message(m)
+
+        self.assertEqual(res["type"], MessageEnum.HEARTBEAT.value)
+        self.assertEqual(res["sender_id"], 3)
+        self.assertEqual(res["payload"], "HEARTBEAT")
+
+
+    def test_typed_payload_round_trip(self):
+        """
+        Os campos tipados de BIZANTINE_VOTE e LEADER_ACK são preservados
+        """
+
+        vote: dict = decode(encode(MessageEnum.BIZANTINE_VOTE, 4, round=9, vote=48200))
+
+        self.assertEqual(vote["round"], 9)
+        self.assertEqual(vote["vote"], 48200)
+
+        ack: dict = decode(encode(MessageEnum.LEADER_ACK, 2, leader=7))
+
+        self.assertEqual(ack["leader"], 7)
+
+        # Lista de tamanho variável dos membros da visão, o tamanho não depende dos ids
+        members: tuple[int, ...] = (1, 3, 600000, 0xFFFFFFFF)
+        snapshot: dict = decode(encode(MessageEnum.JOIN_SNAPSHOT, 3, round=5, leader=3, decided_round=4, decided_value=-2, view=6, members=members))
+
+        self.assertEqual(snapshot["round"], 5)
+        self.assertEqual((snapshot["leader"], snapshot["decided_round"], snapshot["decided_value"], snapshot["view"]), (3, 4, -2, 6))
+        self.assertEqual(snapshot["members"], members)
+
+        view: bytes = encode(MessageEnum.VIEW, 3, version=7, members={600000, 3, 1, 0xFFFFFFFF})
+
+        self.assertEqual(len(view), HEADER_SIZE + MESSAGE_ID_SIZE + 4 + 4 * len(members))
+        self.assertEqual((decode(view)["version"], decode(view)["members"]), (7, members))
+
+
+    def test_message_accepts_legacy_payload_strings(self):
+        """
+        message() converte o payload em string antigo para os campos tipados
+        """
+
+        res: dict = handle_message(message(
+            message_enum=MessageEnum.BIZANTINE_VOTE,
+            sender_id=1,
+            payload="3:100"
+        ))
+
+        self.assertEqual(res["round"], 3)
+        self.assertEqual(res["vote"], 100)
+
+        # Template apenas com o round, sem campos tipados
+        start: dict = handle_message(message(message_enum=MessageEnum.BIZANTINE_START, sender_id=1, payload="5"))
+
+        self.assertEqual(start["round"], 5)
+
+        # O round e os campos informados têm precedência sobre o payload
+        vote: dict = handle_message(message(message_enum=MessageEnum.BIZANTINE_VOTE, sender_id=1, payload="3:100", round=4, vote=7))
+
+        self.assertEqual((vote["round"], vote["vote"]), (4, 7))
+
+
+    def test_decode_legacy_json_datagram(self):
+        """
+        Datagramas JSON enviados por nós antigos continuam sendo decodificados
+        """
+
+        m: bytes = json.dumps({
+            "type": MessageEnum.LEADER_ACK.value,
+            "sender_id": 5,
+            "payload": "LEADER_ACK:8"
+        }).encode('utf-8')
+
+        res: dict = handle_message(m)
+
+        self.assertEqual(res["type"], MessageEnum.LEADER_ACK.value)
+        self.assertEqual(res["sender_id"], 5)
+        self.assertEqual(res["leader"], 8)
+
+
+    def test_decode_message_returns_the_typed_object(self):
+        """
+        decode_message entrega a classe do tipo com os campos já convertidos,
+        tanto para o formato binário quanto para o JSON legado
+        """
+
+        vote = decode_message(encode(MessageEnum.BIZANTINE_VOTE, 4, round=9, vote=48200))
+
+        self.assertIsInstance(vote, BizantineVoteMessage)
+        self.assertEqual((vote.sender_id, vote.round, vote.vote), (4, 9, 48200))
+
+        legacy = decode_message(json.dumps({
+            "type": MessageEnum.LEADER_ACK.value,
+            "sender_id": 5,
+            "payload": "LEADER_ACK:8"
+        }).encode("utf-8"))
+
+        self.assertIsInstance(legacy, LeaderAckMessage)
+        self.assertEqual(legacy.leader, 8)
+
+
+    def test_decode_rejects_unknown_version(self):
+        """
+        Uma versão de formato desconhecida gera ValueError
+        """
+
+        m: bytearray = bytearray(encode(MessageEnum.HEARTBEAT, 1))
+        m[0] = 99
+
+        with self.assertRaises(ValueError):
+            decode(bytes(m))
+
+
+
+    def test_batch_is_split_back_into_the_original_messages(self):
+        """
+        Mensagens agrupadas em um datagrama são separadas na mesma ordem
+        """
+
+        messages: list[bytes] = [
+            encode(MessageEnum.HEARTBEAT, 1),
+            encode(MessageEnum.LEADER_SEARCH, 1),
+            encode(MessageEnum.ELECTION, 1),
+            encode(MessageEnum.BIZANTINE_VOTE, 1, round=2, vote=10),
+        ]
+
+        datagrams: list[bytes] = pack_batch(messages, mtu=1024)
+
+        self.assertEqual(len(datagrams), 1)
+        self.assertEqual(split_datagram(datagrams[0]), messages)
+
+
+    def test_batch_respects_the_mtu(self):
+        """
+        Nenhum datagrama ultrapassa o mtu quando as mensagens cabem nele
+        """
+
+        messages: list[bytes] = [encode(MessageEnum.TEST, 1, payload="x" * 100) for _ in range(10)]
+
+        datagrams: list[bytes] = pack_batch(messages, mtu=300)
+
+        self.assertTrue(all(len(d) <= 300 for d in datagrams))
+        self.assertEqual([m for d in datagrams for m in split_datagram(d)], messages)
+
+        with self.assertRaises(ValueError):
+            split_datagram(datagrams[0][:-1])
+
+
+    def test_large_payload_is_compressed_above_the_threshold(self):
+        """
+        Payloads a partir do limite são comprimidos e marcados no cabeçalho, os
+        menores seguem sem compressão
+        """
+
+        configure_compression(threshold=64)
+        self.addCleanup(configure_compression, None)
+
+        payload: str = ",".join(str(i % 8) for i in range(400))
+
+        small: bytes = message(message_enum=MessageEnum.REQUEST_VALUE, sender_id=1, payload="1,2,3")
+        large: bytes = message(message_enum=MessageEnum.REQUEST_VALUE, sender_id=1, payload=payload)
+
+        self.assertFalse(HEADER.unpack_from(small)[2] & FLAG_COMPRESSED)
+        self.assertTrue(HEADER.unpack_from(large)[2] & FLAG_COMPRESSED)
+        self.assertLess(len(large), len(payload))
+
+        res = decode_message(large)
+
+        self.assertEqual(res.payload, payload)
+        self.assertEqual(res.flags, 0)
+
+        stats: dict = compression_stats()
+
+        self.assertEqual(stats["compressed"], 1)
+        self.assertEqual(stats["decompressed"], 1)
+        self.assertEqual(stats["bytes_saved"], len(payload) - (len(large) - HEADER_SIZE - MESSAGE_ID_SIZE))
+
+
+    def test_decompression_is_capped_at_the_max_size(self):
+        """
+        Um payload comprimido que expande além do limite é rejeitado no recebimento,
+        e o envio não comprime payloads maiores que o limite
+        """
+
+        configure_compression(threshold=64)
+        self.addCleanup(configure_compression, None)
+
+        payload: str = "0" * 4000
+        bomb: bytes = message(message_enum=MessageEnum.REQUEST_VALUE, sender_id=1, payload=payload)
+
+        self.assertTrue(HEADER.unpack_from(bomb)[2] & FLAG_COMPRESSED)
+        self.assertEqual(decode_message(bomb).payload, payload)
+
+        configure_compression(threshold=64, max_size=1000)
+
+        with self.assertRaises(ValueError):
+            decode_message(bomb)
+
+        plain: bytes = message(message_enum=MessageEnum.REQUEST_VALUE, sender_id=1, payload="0" * 1500)
+
+        self.assertFalse(HEADER.unpack_from(plain)[2] & FLAG_COMPRESSED)
+
+
+    def test_each_message_has_a_new_id_kept_by_the_reliable_extension(self):
+        """
+        Cada mensagem codificada recebe um novo id do remetente, lido sem decodificar
+        a mensagem, e a extensão do canal confiável não altera o id nem o payload
+        """
+
+        first: bytes = message(message_enum=MessageEnum.LEADER_ACK, sender_id=2, leader=7)
+        second: bytes = message(message_enum=MessageEnum.LEADER_ACK, sender_id=2, leader=7)
+
+        self.assertEqual((peek_message_id(second) - peek_message_id(first)) % (1 << 32), 1)
+        self.assertIsNone(peek_message_id(json.dumps({"type": 1, "sender_id": 2}).encode()))
+
+        stamped: bytes = stamp_reliable(first, epoch=9, seq=3)
+        res = decode_message(stamped)
+
+        self.assertEqual(peek_message_id(stamped), peek_message_id(first))
+        self.assertEqual((res.leader, res.epoch, res.seq), (7, 9, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Testes unitários para o DuplicateFilter, verificando o descarte das cópias pelo
+id da mensagem, a janela deslizante e o reinício dos remetentes
+"""
+
+import unittest
+
+from middleware.message.DuplicateFilter import DuplicateFilter
+
+
+class TestDuplicateFilter(unittest.TestCase):
+    def test_copies_are_dropped_inside_the_window(self):
+        f: DuplicateFilter = DuplicateFilter(window=8)
+
+        self.assertFalse(f.seen(1, 100))
+        self.assertTrue(f.seen(1, 100))
+
+        # Fora de ordem, dentro da janela
+        self.assertFalse(f.seen(1, 103))
+        self.assertFalse(f.seen(1, 101))
+        self.assertTrue(f.seen(1, 101))
+        self.assertTrue(f.seen(1, 103))
+
+        # Os remetentes possuem janelas independentes
+        self.assertFalse(f.seen(2, 100))
+
+        # Mais antigo que a janela: não pode ser verificado e é aceito
+        self.assertFalse(f.seen(1, 120))
+        self.assertFalse(f.seen(1, 100))
+
+        self.assertEqual(f.stats()["duplicates"], 3)
+
+
+    def test_ids_wrap_around_and_restarted_senders_reset_the_window(self):
+        f: DuplicateFilter = DuplicateFilter(window=8, reset_distance=1000)
+
+        self.assertFalse(f.seen(1, 0xFFFFFFFF))
+        self.assertFalse(f.seen(1, 0))
+        self.assertTrue(f.seen(1, 0xFFFFFFFF))
+
+        # Nó reiniciado com uma nova sequência de ids
+        self.assertFalse(f.seen(1, 5000))
+        self.assertFalse(f.seen(1, 5001))
+        self.assertTrue(f.seen(1, 5000))
+        self.assertEqual(f.stats()["resets"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Testes unitários para o LoopbackTransport, verificando a entrega em memória
+entre nós do mesmo processo, a perda e a latência configuráveis
+"""
+
+import time
+import queue
+import unittest
+
+from middleware.message.Codec import decode
+from middleware.message.LoopbackTransport import LoopbackNetwork
+from middleware.message.Message import message
+from middleware.message.MessageEnum import MessageEnum
+
+
+def heartbeat(sender_id: int) -> bytes:
+    return message(message_enum=MessageEnum.HEARTBEAT, sender_id=sender_id)
+
+
+class TestLoopbackTransport(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queues: dict[int, queue.Queue] = {i: queue.Queue() for i in range(1, 4)}
+
+
+    def start(self, network: LoopbackNetwork) -> dict:
+        transports: dict = {i: network.transport(i) for i in self.queues}
+
+        for i, t in transports.items():
+            t.start(lambda m, q=self.queues[i]: q.put(decode(m)))
+
+        self.addCleanup(network.close)
+
+        return transports
+
+
+    def test_multicast_reaches_the_other_nodes_and_send_to_only_the_peer(self):
+        network: LoopbackNetwork = LoopbackNetwork()
+        transports: dict = self.start(network)
+
+        transports[1].send(heartbeat(1))
+        transports[2].send_to(3, heartbeat(2))
+
+        self.assertEqual(self.queues[2].get(timeout=1)["sender_id"], 1)
+        self.assertEqual(
+            first=sorted(self.queues[3].get(timeout=1)["sender_id"] for _ in range(2)),
+            second=[1, 2]
+        )
+
+        time.sleep(0.05)
+
+        self.assertTrue(self.queues[1].empty())
+        self.assertEqual(network.stats()["delivered"], 3)
+
+
+    def test_loss_and_latency(self):
+        """
+        Com perda total nada é entregue, e com latência a entrega é atrasada
+        """
+
+        lossy: LoopbackNetwork = LoopbackNetwork(loss=1.0, seed=1)
+        self.start(lossy)[1].send(heartbeat(1))
+
+        time.sleep(0.05)
+
+        self.assertEqual(lossy.stats()["lost"], 2)
+        self.assertTrue(self.queues[2].empty())
+
+        slow: LoopbackNetwork = LoopbackNetwork(latency=0.2)
+        transports: dict = {i: slow.transport(i) for i in (1, 2)}
+        transports[2].start(lambda m: self.queues[2].put(time.monotonic()))
+        transports[1].start(lambda m: None)
+        self.addCleanup(slow.close)
+
+        start: float = time.monotonic()
+        transports[1].send(heartbeat(1))
+
+        self.assertGreaterEqual(self.queues[2].get(timeout=1) - start, 0.2)
+
+
+    def test_node_only_receives_the_subscribed_planes(self):
+        """
+        Um observador sem o plano do consenso não recebe os votos multicast, mas
+        continua recebendo os HEARTBEATs e as mensagens direcionadas a ele
+        """
+
+        network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(network.close)
+
+        sender = network.transport(1)
+        observer = network.transport(2, planes=("membership", "election"))
+
+        sender.start(lambda m: None)
+        observer.start(lambda m: self.queues[2].put(decode(m)["type"]))
+
+        vote: bytes = message(message_enum=MessageEnum.BIZANTINE_VOTE, sender_id=1, round=1, vote=3)
+
+        sender.send(vote)
+        sender.send(heartbeat(1))
+        sender.send_to(2, vote)
+
+        self.assertEqual(
+            first=sorted(self.queues[2].get(timeout=1) for _ in range(2)),
+            second=[MessageEnum.HEARTBEAT.value, MessageEnum.BIZANTINE_VOTE.value]
+        )
+
+        time.sleep(0.05)
+
+        self.assertTrue(self.queues[2].empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Testes unitários para a visão versionada dos membros do cluster
+"""
+
+import unittest
+
+from middleware.Membership import Membership, View
+
+
+class TestMembership(unittest.TestCase):
+    def setUp(self):
+        self.views: list[View] = []
+        self.membership: Membership = Membership(1, [2, 3], on_change=self.views.append)
+
+
+    def test_initial_view_contains_the_local_process(self):
+        view: View = self.membership.view()
+
+        self.assertEqual((view.version, view.members), (0, {1, 2, 3}))
+        self.assertEqual(self.membership.peers(), [2, 3])
+        self.assertIn(1, self.membership)
+
+
+    def test_update_increments_the_version_only_when_members_change(self):
+        view: View | None = self.membership.update(add=[4], remove=[2])
+
+        self.assertEqual((view.version, view.members), (1, {1, 3, 4}))
+        self.assertIsNone(self.membership.update(add=[4]))
+
+        # O próprio processo nunca é removido
+        self.assertIsNone(self.membership.update(remove=[1]))
+        self.assertEqual(self.views, [view])
+
+
+    def test_install_ignores_views_that_are_not_newer(self):
+        self.membership.update(add=[4])
+
+        self.assertFalse(self.membership.install(View(1, [1, 2])))
+        self.assertTrue(self.membership.install(View(3, [1, 5])))
+        self.assertEqual(self.membership.peers(), [5])
+        self.assertEqual([v.version for v in self.views], [1, 3])
+
+        # Um novo líder cria uma versão maior que todas as já vistas, mesmo as não instaladas
+        self.assertFalse(self.membership.install(View(2, [1])))
+        self.membership.install(View(4, [1, 5]))
+        self.assertEqual(self.membership.update(force=True).version, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
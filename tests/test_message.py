@@ -9,10 +9,16 @@ import threading
 import queue
 
 import time
+import socket
 
-from middleware.message.Message import Message, message, handle_message
+from middleware.message.Message import Message, MulticastSender, Outbox, PeerBook, ClusterConfig, message, handle_message
+from middleware.message.Codec import split_datagram
 from middleware.message.MessageEnum import MessageEnum
 
+# Grupo próprio dos testes, não interfere com nós em execução no cluster padrão
+TEST_CLUSTER: ClusterConfig = ClusterConfig(group="224.1.1.201", port=5107)
+TEST_SENDER: MulticastSender = TEST_CLUSTER.sender()
+
 class TestMessageCommunication(unittest.TestCase):
     # UNICAST
     def test_send_unicast_messages_its_a_success(self):
@@ -199,7 +205,7 @@ class TestMessageCommunication(unittest.TestCase):
             payload="ping"
         )
                 
-        res: bool = Message.send_multicast(message=m)
+        res: bool = Message.send_multicast(message=m, sender=TEST_SENDER)
                 
         self.assertTrue(res)
         
@@ -223,7 +229,7 @@ class TestMessageCommunication(unittest.TestCase):
                  
                  
             # Servidor            
-            Message.recv_multicast(f)
+            Message.recv_multicast(f, cluster=TEST_CLUSTER)
                
             
         m: bytes = message(
@@ -244,7 +250,7 @@ class TestMessageCommunication(unittest.TestCase):
         time.sleep(0.2)
         
         # Envia a mesagem do cliente e recebe a resposta
-        Message.send_multicast(message=m) 
+        Message.send_multicast(message=m, sender=TEST_SENDER) 
                 
         server_thead.join()   
           
@@ -276,7 +282,7 @@ class TestMessageCommunication(unittest.TestCase):
                  
                  
            # Servidor            
-           Message.recv_multicast(f)
+           Message.recv_multicast(f, cluster=TEST_CLUSTER)
             
             
         m: bytes = message(
@@ -307,7 +313,7 @@ class TestMessageCommunication(unittest.TestCase):
         time.sleep(0.2)
         
         # Envia a mesagem do cliente e recebe as respostas
-        Message.send_multicast(message=m) 
+        Message.send_multicast(message=m, sender=TEST_SENDER) 
         
         server_thead_1.join()   
         server_thead_2.join()  
@@ -341,6 +347,228 @@ class TestMessageCommunication(unittest.TestCase):
             second=5
         )
         
+        
+    def test_multicast_sender_reuses_the_same_socket(self):
+        """
+        Verifica se o MulticastSender mantém o mesmo socket entre os envios e
+        se as mensagens chegam ao grupo multicast
+        """
+        
+        res_queue: queue.Queue = queue.Queue()
+        
+        def handler():
+            def f(m: bytes):
+                msg: dict = handle_message(m)
+                
+                res_queue.put(msg.get("sender_id"))
+                
+                exit()
+                
+            Message.recv_multicast(f, cluster=TEST_CLUSTER)
+            
+        m: bytes = message(
+            message_enum=MessageEnum.TEST,
+            sender_id=7,
+            payload="ping"
+        )
+        
+        sender: MulticastSender = TEST_CLUSTER.sender()
+        
+        server_thead: threading.Thread = threading.Thread(target=handler)
+        server_thead.start()
+        
+        time.sleep(0.2)
+        
+        self.assertTrue(Message.send_multicast(message=m, sender=sender))
+        sock = sender._sock
+        
+        self.assertTrue(sender.send(m))
+        self.assertIs(sender._sock, sock)
+        
+        server_thead.join()
+        sender.close()
+        
+        self.assertEqual(
+            first=res_queue.get(),
+            second=7
+        )
+        
+        
+    def test_send_batch_delivers_each_message_to_the_handler(self):
+        """
+        Verifica se as mensagens agrupadas em um datagrama pelo send_batch são
+        entregues individualmente pelo recv_multicast
+        """
+        
+        res_queue: queue.Queue = queue.Queue()
+        
+        def handler():
+            def f(m: bytes):
+                msg: dict = handle_message(m)
+                
+                res_queue.put(msg.get("type"))
+                
+                if msg.get("type") == MessageEnum.ELECTION.value:
+                    exit()
+                
+            Message.recv_multicast(f, cluster=TEST_CLUSTER)
+            
+        messages: list[bytes] = [
+            message(message_enum=MessageEnum.HEARTBEAT, sender_id=1, payload="HEARTBEAT"),
+            message(message_enum=MessageEnum.LEADER_SEARCH, sender_id=1, payload="LEADER_SEARCH"),
+            message(message_enum=MessageEnum.ELECTION, sender_id=1, payload="ELECTION"),
+        ]
+        
+        server_thead: threading.Thread = threading.Thread(target=handler)
+        server_thead.start()
+        
+        time.sleep(0.2)
+        
+        self.assertTrue(Message.send_batch(messages, sender=TEST_SENDER))
+        
+        server_thead.join()
+        
+        self.assertEqual(
+            first=[res_queue.get() for _ in range(3)],
+            second=[
+                MessageEnum.HEARTBEAT.value,
+                MessageEnum.LEADER_SEARCH.value,
+                MessageEnum.ELECTION.value
+            ]
+        )
+
+        
+        
+    def test_message_larger_than_the_receive_buffer_is_fragmented(self):
+        """
+        Verifica se uma mensagem maior que o buffer de recebimento chega completa
+        ao recv_multicast
+        """
+        
+        res_queue: queue.Queue = queue.Queue()
+        
+        def handler():
+            def f(m: bytes):
+                res_queue.put(handle_message(m))
+                
+                exit()
+                
+            Message.recv_multicast(f, cluster=TEST_CLUSTER)
+            
+        payload: str = "snapshot" * 1000
+        
+        server_thead: threading.Thread = threading.Thread(target=handler)
+        server_thead.start()
+        
+        time.sleep(0.2)
+        
+        self.assertTrue(Message.send_multicast(message(
+            message_enum=MessageEnum.TEST,
+            sender_id=4,
+            payload=payload
+        ), sender=TEST_SENDER))
+        
+        server_thead.join()
+        
+        self.assertEqual(
+            first=res_queue.get()["payload"],
+            second=payload
+        )
+        
+        
+    def test_clusters_with_different_groups_do_not_see_each_other(self):
+        """
+        Verifica se um nó escutando o grupo de um cluster não recebe as mensagens
+        enviadas para outro grupo na mesma porta
+        """
+        
+        other: ClusterConfig = ClusterConfig(group="224.1.1.202", port=TEST_CLUSTER.port)
+        
+        sock: socket.socket = Message.create_socket_multicast(TEST_CLUSTER)
+        sock.settimeout(0.5)
+        
+        other_sender: MulticastSender = other.sender()
+        
+        self.assertTrue(other_sender.send(message(message_enum=MessageEnum.TEST, sender_id=1, payload="outro")))
+        self.assertTrue(TEST_SENDER.send(message(message_enum=MessageEnum.TEST, sender_id=2, payload="mesmo")))
+        
+        data, _ = sock.recvfrom(1024)
+        
+        with self.assertRaises(socket.timeout):
+            sock.recvfrom(1024)
+            
+        sock.close()
+        other_sender.close()
+        
+        self.assertEqual(handle_message(data)["payload"], "mesmo")
+        
+        
+    def test_split_cluster_sends_each_plane_to_its_own_group(self):
+        """
+        Verifica se, com um grupo por plano, o HEARTBEAT e o voto agrupados no mesmo
+        batch seguem para grupos diferentes e cada socket recebe apenas o seu plano
+        """
+        
+        split: ClusterConfig = ClusterConfig(group="224.1.1.210", port=5109).split()
+        
+        membership: socket.socket = Message.create_socket_multicast(split, split.address("membership"))
+        consensus: socket.socket = Message.create_socket_multicast(split, split.address("consensus"))
+        
+        for sock in (membership, consensus):
+            sock.settimeout(0.5)
+            self.addCleanup(sock.close)
+        
+        sender: MulticastSender = split.sender()
+        self.addCleanup(sender.close)
+        
+        outbox: Outbox = Outbox(sender)
+        
+        with outbox.batch():
+            outbox.send(message(message_enum=MessageEnum.HEARTBEAT, sender_id=1))
+            outbox.send(message(message_enum=MessageEnum.BIZANTINE_VOTE, sender_id=1, round=1, vote=4))
+            
+        self.assertEqual(
+            first=[m["type"] for m in (handle_message(membership.recvfrom(1024)[0]), handle_message(consensus.recvfrom(1024)[0]))],
+            second=[MessageEnum.HEARTBEAT.value, MessageEnum.BIZANTINE_VOTE.value]
+        )
+        
+        for sock in (membership, consensus):
+            with self.assertRaises(socket.timeout):
+                sock.recvfrom(1024)
+        
+        
+    def test_send_to_delivers_to_the_peer_address(self):
+        """
+        Verifica se send_to entrega a mensagem no endereço do nó no PeerBook, e se as
+        mensagens para o mesmo nó dentro de um batch seguem em um único datagrama
+        """
+        
+        sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(2)
+        
+        sender: MulticastSender = MulticastSender(peers=PeerBook({7: sock.getsockname()}))
+        outbox: Outbox = Outbox(sender)
+        
+        with outbox.batch():
+            for i in range(3):
+                Message.send_to(message(
+                    message_enum=MessageEnum.BIZANTINE_VOTE,
+                    sender_id=2,
+                    round=1,
+                    vote=i
+                ), 7, sender=outbox)
+        
+        data, _ = sock.recvfrom(1024)
+        
+        sender.close()
+        sock.close()
+        
+        self.assertEqual(
+            first=[handle_message(m)["vote"] for m in split_datagram(data)],
+            second=[0, 1, 2]
+        )
+        
     
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,7 +2,9 @@
 Testes unitários para a classe Node
 """
 
+import io
 import unittest
+import contextlib
 
 import threading
 import queue
@@ -10,6 +12,11 @@ import queue
 import time
 
 from middleware.Node import Node
+from middleware.DF import DF
+from middleware.message.Codec import decode_message
+from middleware.message.LoopbackTransport import LoopbackNetwork
+from middleware.message.Message import message
+from middleware.message.MessageEnum import MessageEnum
 
 class TestNode(unittest.TestCase):
     """
@@ -61,4 +68,284 @@ class TestNode(unittest.TestCase):
         self.assertEqual(node._Node__num_active_processes(), 0)
                 
 class TestNodeDF(unittest.TestCase):
-    pass
\ No newline at end of file
+    pass
+
+
+class TestNodeEvents(unittest.TestCase):
+    """
+    O laço principal é acordado pelo DF e pela eleição, sem aguardar o próximo ciclo
+    """
+    
+    def setUp(self) -> None:
+        network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(network.close)
+        
+        self.node: Node = Node(
+            process_id=1,
+            processes_id=[1, 2, 3],
+            df_d=1,
+            df_t=1,
+            election_timeout=1,
+            transport=network.transport(1)
+        )
+        
+        self.node._df = DF(d=1, t=1, process_id=1, processes_list=[1, 2, 3], autostart=False, on_change=self.node._wake)
+        
+        # Conta os ciclos do laço principal em vez de executá-los
+        self.steps: queue.Queue = queue.Queue()
+        self.node._node_step = lambda: self.steps.put(time.monotonic())
+        
+        self.node._scheduler.start()
+        self.addCleanup(self.node._scheduler.stop)
+        
+        
+    def test_wakes_are_ignored_before_the_main_loop_starts(self) -> None:
+        self.node._ele.set_leader(2)
+        
+        with self.assertRaises(queue.Empty):
+            self.steps.get(timeout=0.2)
+    
+    
+    def test_leader_change_and_suspicion_change_wake_the_main_loop(self) -> None:
+        self.node._main_active = True
+        
+        self.node._ele.set_leader(3)
+        self.steps.get(timeout=0.5)
+        
+        # O mesmo líder não é uma mudança
+        self.node._ele.set_leader(3)
+        
+        with self.assertRaises(queue.Empty):
+            self.steps.get(timeout=0.2)
+        
+        # Processo 2 deixa de ser suspeito ao enviar um HEARTBEAT
+        self.node._df.handle_df_message(decode_message(message(message_enum=MessageEnum.HEARTBEAT, sender_id=2)))
+        self.steps.get(timeout=0.5)
+        
+        
+    def test_wakes_before_the_step_runs_are_coalesced(self) -> None:
+        self.node._main_active = True
+        
+        # Ocupa o escalonador enquanto os avisos chegam
+        release: threading.Event = threading.Event()
+        self.node._scheduler.call_soon(release.wait)
+        
+        for leader in (2, 3, None):
+            self.node._ele.set_leader(leader)
+            
+        release.set()
+        self.steps.get(timeout=0.5)
+        
+        with self.assertRaises(queue.Empty):
+            self.steps.get(timeout=0.2)
+            
+            
+    def test_readiness_events_are_reported_once(self) -> None:
+        events: list[str] = []
+        self.node.on_ready = lambda event, elapsed: events.append(event)
+        
+        self.node._periodic_step()
+        self.node._ele.set_leader(3)
+        self.node._ele.set_leader(2)
+        self.node._periodic_step()
+        
+        self.assertEqual(events, ["heartbeat", "leader"])
+        self.assertEqual(list(self.node.readiness()), ["heartbeat", "leader"])
+
+
+class TestNodeJoin(unittest.TestCase):
+    """
+    Um nó reiniciado instala o estado do líder em vez de aguardar a janela de pesquisa
+    """
+    
+    def start(self, process_id: int) -> Node:
+        node: Node = Node(
+            process_id=process_id,
+            processes_id=[1, 2, 3],
+            df_d=1,
+            df_t=1,
+            election_timeout=1,
+            transport=self.network.transport(process_id)
+        )
+        
+        node.init_node()
+        self.addCleanup(node._transport.stop)
+        self.addCleanup(node._scheduler.stop)
+        
+        return node
+    
+    
+    def test_restarted_node_installs_the_leader_snapshot(self) -> None:
+        self.network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(self.network.close)
+        
+        # Os prints de depuração dos módulos são descartados
+        with contextlib.redirect_stdout(io.StringIO()):
+            nodes: dict[int, Node] = {i: self.start(i) for i in (1, 2, 3)}
+            
+            for _ in range(100):
+                if all(node._ele.get_leader() == 3 for node in nodes.values()):
+                    break
+                
+                time.sleep(0.1)
+                
+            self.assertEqual(nodes[1]._ele.get_leader(), 3)
+            
+            # Reinício do nó 1
+            nodes[1]._scheduler.stop()
+            nodes[1]._transport.stop()
+            
+            restarted: Node = self.start(1)
+            
+            for _ in range(50):
+                if restarted._ele.get_leader() == 3:
+                    break
+                
+                time.sleep(0.02)
+            
+        self.assertEqual(restarted._ele.get_leader(), 3)
+        self.assertLess(restarted.readiness()["leader"], 1)
+        self.assertEqual(restarted._df.suspected_list(), [])
+        self.assertTrue(restarted._main_active)
+        
+        
+class TestNodeLeave(unittest.TestCase):
+    """
+    A saída graciosa do líder inicia a eleição sem aguardar o timeout do DF
+    """
+    
+    def test_leader_leave_starts_an_election_immediately(self) -> None:
+        network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(network.close)
+        
+        # Os prints de depuração dos módulos são descartados
+        with contextlib.redirect_stdout(io.StringIO()):
+            nodes: dict[int, Node] = {
+                i: Node(
+                    process_id=i,
+                    processes_id=[1, 2, 3],
+                    df_d=1,
+                    df_t=1,
+                    election_timeout=1,
+                    transport=network.transport(i)
+                )
+                for i in (1, 2, 3)
+            }
+            
+            for node in nodes.values():
+                node.init_node()
+                self.addCleanup(node.stop)
+                
+            for _ in range(100):
+                if all(node._ele.get_leader() == 3 for node in nodes.values()):
+                    break
+                
+                time.sleep(0.1)
+                
+            self.assertEqual(nodes[1]._ele.get_leader(), 3)
+            
+            nodes[3].stop()
+            left: float = time.monotonic()
+            
+            for _ in range(100):
+                if all(nodes[i]._ele.get_leader() == 2 for i in (1, 2)):
+                    break
+                
+                time.sleep(0.05)
+                
+            elapsed: float = time.monotonic() - left
+            
+        self.assertEqual(nodes[1]._ele.get_leader(), 2)
+        self.assertEqual(nodes[2]._ele.get_leader(), 2)
+        self.assertNotIn(3, nodes[1]._Node__list_active_processes())
+        
+        # A nova eleição termina após o seu timeout (1 segundo), sem o LEAVE o DF suspeitaria
+        # do líder apenas após mais de 3 * (t + d) = 6 segundos
+        self.assertLess(elapsed, 2)
+        self.assertFalse(nodes[3]._scheduler._running)
+        
+        
+class TestNodeMembership(unittest.TestCase):
+    """
+    O líder remove da visão os membros ausentes e admite nós fora da visão inicial
+    """
+    
+    def start(self, process_id: int, processes_id: list[int]) -> Node:
+        node: Node = Node(
+            process_id=process_id,
+            processes_id=processes_id,
+            df_d=1,
+            df_t=1,
+            election_timeout=1,
+            transport=self.network.transport(process_id)
+        )
+        
+        node.init_node()
+        self.addCleanup(node.stop)
+        
+        return node
+    
+    
+    def wait_views(self, nodes: list[Node], members: set[int]) -> None:
+        """
+        Aguarda a visão com os membros informados em todos os nós, a eleição de cada nó
+        considera os membros da visão instalada
+        """
+        
+        for _ in range(100):
+            if all(node._membership.view().members == members and node._ele._processes_id == sorted(members) for node in nodes):
+                break
+            
+            time.sleep(0.05)
+            
+        for node in nodes:
+            self.assertEqual(node._membership.view().members, members)
+            self.assertEqual(node._ele._processes_id, sorted(members))
+    
+    
+    def test_absent_members_are_removed_and_new_nodes_are_admitted(self) -> None:
+        self.network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(self.network.close)
+        
+        # Os prints de depuração dos módulos são descartados
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Os nós 4 e 5 da visão inicial nunca são iniciados
+            nodes: list[Node] = [self.start(i, [1, 2, 3, 4, 5]) for i in (1, 2, 3)]
+            
+            self.wait_views(nodes, {1, 2, 3})
+            self.assertEqual(nodes[0]._Node__num_active_processes(), 2)
+            
+            # O nó 6 não faz parte da visão inicial de nenhum nó
+            nodes.append(self.start(6, [1, 2, 3]))
+            
+            self.wait_views(nodes, {1, 2, 3, 6})
+            
+        leader: int = nodes[0]._ele.get_leader()
+        
+        self.assertTrue(all(node._ele.get_leader() == leader for node in nodes))
+        self.assertEqual(len({node._membership.view().version for node in nodes}), 1)
+        self.assertEqual(nodes[3]._df.suspected_list(), [])
+
+        
+        
+    def test_views_keep_spreading_after_a_node_with_a_large_id_joins(self) -> None:
+        """
+        A visão transporta a lista de ids, o seu tamanho não depende do maior id
+        """
+        
+        self.network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(self.network.close)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            nodes: list[Node] = [self.start(i, [1, 2]) for i in (1, 2)]
+            
+            self.wait_views(nodes, {1, 2})
+            
+            nodes.append(self.start(600000, [1, 2]))
+            
+            self.wait_views(nodes, {1, 2, 600000})
+            
+            # Alterações seguintes da visão continuam sendo difundidas
+            nodes.append(self.start(7, [1, 2]))
+            
+            self.wait_views(nodes, {1, 2, 7, 600000})
@@ -0,0 +1,82 @@
+"""
+Testes unitários para o UdpHub e o NodeHost, verificando a entrega das mensagens
+para os nós do mesmo processo e a eleição entre nós que compartilham o transporte
+"""
+
+import time
+import queue
+import contextlib
+import io
+import unittest
+
+from middleware.NodeHost import NodeHost
+from middleware.message.Codec import decode
+from middleware.message.HostTransport import UdpHub
+from middleware.message.Message import ClusterConfig, message
+from middleware.message.MessageEnum import MessageEnum
+
+# Cluster próprio, não interfere com nós em execução
+CLUSTER: ClusterConfig = ClusterConfig(group="224.1.1.241", port=5241, unicast_base_port=17000)
+
+
+def heartbeat(sender_id: int) -> bytes:
+    return message(message_enum=MessageEnum.HEARTBEAT, sender_id=sender_id)
+
+
+class TestUdpHub(unittest.TestCase):
+    def test_multicast_reaches_every_node_and_send_to_only_the_destination(self):
+        hub: UdpHub = UdpHub(cluster=CLUSTER)
+        self.addCleanup(hub.close)
+
+        queues: dict[int, queue.Queue] = {i: queue.Queue() for i in (1, 2)}
+
+        for i, q in queues.items():
+            hub.transport(i).start(lambda m, q=q: q.put(decode(m)))
+
+        hub.transport(3).send(heartbeat(3))
+
+        self.assertEqual(queues[1].get(timeout=1)["sender_id"], 3)
+        self.assertEqual(queues[2].get(timeout=1)["sender_id"], 3)
+
+        hub.transport(1).send_to(2, heartbeat(1))
+
+        self.assertEqual(queues[2].get(timeout=1)["sender_id"], 1)
+        self.assertTrue(queues[1].empty())
+
+        # Um nó desconectado deixa de receber e libera o endereço unicast
+        hub.transport(2).stop()
+        hub.transport(3).send(heartbeat(3))
+
+        self.assertEqual(queues[1].get(timeout=1)["sender_id"], 3)
+        self.assertTrue(queues[2].empty())
+        self.assertEqual(hub.stats()["nodes"], 1)
+
+
+class TestNodeHost(unittest.TestCase):
+    def test_nodes_of_the_same_process_elect_the_highest_id(self):
+        # Os prints de depuração dos módulos são descartados
+        with contextlib.redirect_stdout(io.StringIO()):
+            host: NodeHost = NodeHost(
+                local_ids=[1, 2, 3],
+                processes_id=[1, 2, 3],
+                df_d=1,
+                df_t=1,
+                election_timeout=1,
+                cluster=CLUSTER
+            )
+
+            self.addCleanup(host.stop)
+            host.start()
+
+            for _ in range(100):
+                if all(node._ele.get_leader() == 3 for node in host.nodes.values()):
+                    break
+
+                time.sleep(0.1)
+
+        self.assertTrue(all(node._ele.get_leader() == 3 for node in host.nodes.values()))
+        self.assertEqual(host.stats()["nodes"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
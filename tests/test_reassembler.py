@@ -0,0 +1,108 @@
+"""
+Testes unitários para a fragmentação (Codec.fragment) e remontagem (Reassembler)
+de mensagens maiores que um datagrama
+"""
+
+import time
+import random
+import unittest
+
+from middleware.message.Codec import MAX_PAYLOAD_SIZE, encode, decode, fragment
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.Reassembler import Reassembler
+
+
+class TestReassembler(unittest.TestCase):
+    def test_fragments_out_of_order_are_reassembled(self):
+        """
+        Os fragmentos podem chegar em qualquer ordem e repetidos
+        """
+
+        m: bytes = encode(MessageEnum.TEST, 3, payload="x" * 5000)
+
+        fragments: list[bytes] = fragment(m, msg_id=1, mtu=1024)
+
+        self.assertTrue(all(len(f) <= 1024 for f in fragments))
+
+        random.Random(0).shuffle(fragments)
+
+        reassembler: Reassembler = Reassembler()
+        res: list = [reassembler.feed(f) for f in fragments + fragments[:1]]
+
+        complete: list = [r for r in res if r is not None]
+
+        self.assertEqual(len(complete), 1)
+        self.assertEqual(bytes(complete[0]), m)
+        self.assertEqual(decode(complete[0])["sender_id"], 3)
+        self.assertEqual(reassembler.stats()["pending"], 0)
+
+
+    def test_payload_larger_than_64_kib_is_reassembled(self):
+        """
+        O tamanho do payload no cabeçalho não limita as mensagens a 64 KiB, apenas
+        payloads acima de MAX_PAYLOAD_SIZE são recusados pelo encode
+        """
+
+        payload: str = "".join(chr(ord("a") + i % 26) for i in range(200_000))
+        m: bytes = encode(MessageEnum.TEST, 5, payload=payload)
+
+        fragments: list[bytes] = fragment(m, msg_id=4, mtu=1400)
+
+        reassembler: Reassembler = Reassembler()
+        res: list = [reassembler.feed(f) for f in fragments]
+
+        self.assertTrue(all(r is None for r in res[:-1]))
+        self.assertEqual(decode(res[-1])["payload"], payload)
+
+        with self.assertRaises(ValueError):
+            encode(MessageEnum.TEST, 5, payload="x" * (MAX_PAYLOAD_SIZE + 1))
+
+
+    def test_datagram_that_is_not_a_fragment_passes_through(self):
+        m: bytes = encode(MessageEnum.HEARTBEAT, 1)
+
+        self.assertIs(Reassembler().feed(m), m)
+
+
+    def test_incomplete_message_expires(self):
+        """
+        Uma mensagem incompleta é descartada após o timeout
+        """
+
+        fragments: list[bytes] = fragment(encode(MessageEnum.TEST, 1, payload="y" * 3000), msg_id=2, mtu=1024)
+
+        reassembler: Reassembler = Reassembler(timeout=0.05)
+
+        self.assertIsNone(reassembler.feed(fragments[0]))
+
+        time.sleep(0.1)
+
+        # O fragmento de outra mensagem dispara a verificação dos timeouts
+        reassembler.feed(fragment(encode(MessageEnum.TEST, 1, payload="z" * 3000), msg_id=3, mtu=1024)[0])
+
+        stats: dict = reassembler.stats()
+
+        self.assertEqual(stats["expired"], 1)
+        self.assertEqual(stats["pending"], 1)
+
+
+    def test_memory_cap_evicts_the_oldest_message(self):
+        """
+        Ao atingir o limite de memória a remontagem mais antiga é descartada
+        """
+
+        reassembler: Reassembler = Reassembler(max_bytes=5000)
+
+        for msg_id in range(3):
+            m: bytes = encode(MessageEnum.TEST, 1, payload="w" * 2000)
+            reassembler.feed(fragment(m, msg_id=msg_id, mtu=1024)[0])
+
+        stats: dict = reassembler.stats()
+
+        self.assertEqual(stats["evicted"], 1)
+        self.assertEqual(stats["pending"], 2)
+        self.assertLessEqual(stats["pending_bytes"], 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Testes unitários para o MulticastReceiver, verificando a entrega das mensagens
+pelos workers e os contadores de descarte do anel
+"""
+
+import time
+import queue
+import socket
+import threading
+import unittest
+
+from middleware.message.Message import message, pack_batch
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.Receiver import MulticastReceiver
+
+
+def create_socket() -> socket.socket:
+    sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+
+    return sock
+
+
+def wait_for(cond, timeout: float = 2) -> bool:
+    start: float = time.time()
+
+    while time.time() - start < timeout:
+        if cond():
+            return True
+
+        time.sleep(0.01)
+
+    return False
+
+
+class TestMulticastReceiver(unittest.TestCase):
+    def test_each_message_of_a_datagram_is_delivered(self):
+        """
+        Um datagrama agrupado conta como um recebimento e entrega todas as mensagens
+        """
+
+        res_queue: queue.Queue = queue.Queue()
+
+        sock: socket.socket = create_socket()
+        receiver: MulticastReceiver = MulticastReceiver(res_queue.put, sock=sock, rcvbuf=1 << 20)
+        receiver.start()
+
+        datagram: bytes = pack_batch([
+            message(message_enum=MessageEnum.HEARTBEAT, sender_id=1, payload="HEARTBEAT"),
+            message(message_enum=MessageEnum.LEADER_SEARCH, sender_id=1, payload="LEADER_SEARCH"),
+        ], mtu=1024)[0]
+
+        client: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.sendto(datagram, sock.getsockname())
+        client.close()
+
+        self.assertTrue(wait_for(lambda: receiver.stats()["processed"] == 2))
+
+        stats: dict = receiver.stats()
+        receiver.stop()
+
+        self.assertEqual(stats["received"], 1)
+        self.assertEqual(stats["dropped_ring"], 0)
+        self.assertEqual(res_queue.qsize(), 2)
+
+
+    def test_full_ring_drops_the_oldest_datagrams(self):
+        """
+        Com o worker ocupado o anel enche e os datagramas mais antigos são descartados
+        """
+
+        release: threading.Event = threading.Event()
+
+        sock: socket.socket = create_socket()
+        receiver: MulticastReceiver = MulticastReceiver(lambda m: release.wait(), sock=sock, ring_size=2)
+        receiver.start()
+
+        client: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        # O primeiro datagrama ocupa o worker antes dos demais chegarem
+        client.sendto(message(message_enum=MessageEnum.HEARTBEAT, sender_id=1), sock.getsockname())
+        self.assertTrue(wait_for(lambda: receiver.stats()["received"] == 1 and receiver.stats()["pending"] == 0))
+
+        for _ in range(9):
+            client.sendto(message(message_enum=MessageEnum.HEARTBEAT, sender_id=1), sock.getsockname())
+
+        client.close()
+
+        self.assertTrue(wait_for(lambda: receiver.stats()["received"] == 10))
+
+        stats: dict = receiver.stats()
+
+        release.set()
+        receiver.stop()
+
+        self.assertEqual(stats["pending"], 2)
+        self.assertEqual(stats["dropped_ring"], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Testes unitários para o canal confiável (ReliableChannel), verificando a detecção
+de lacunas, a retransmissão pedida por NACK e o descarte das mensagens duplicadas
+"""
+
+import unittest
+
+from middleware.message.Codec import FLAG_RELIABLE, decode_message
+from middleware.message.Message import message
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.Reliable import ReliableChannel
+from middleware.message.TypedMessage import NackMessage
+
+
+class RecordingTransport():
+    """
+    Transporte que apenas guarda as mensagens enviadas
+    """
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[int | None, bytes]] = []
+
+
+    def send(self, message: bytes) -> bool:
+        self.sent.append((None, message))
+        return True
+
+
+    def send_to(self, peer_id: int, message: bytes) -> bool:
+        self.sent.append((peer_id, message))
+        return True
+
+
+def decide(value: int) -> bytes:
+    return message(message_enum=MessageEnum.BIZANTINE_DECIDE, sender_id=1, round=1, value=value)
+
+
+class TestReliableChannel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sender_net: RecordingTransport = RecordingTransport()
+        self.receiver_net: RecordingTransport = RecordingTransport()
+
+        self.sender: ReliableChannel = ReliableChannel(self.sender_net, process_id=1)
+        self.receiver: ReliableChannel = ReliableChannel(self.receiver_net, process_id=2)
+
+
+    def test_gap_is_recovered_by_nack_and_duplicates_are_dropped(self):
+        for value in (10, 20, 30):
+            self.sender.send(decide(value))
+
+        frames = [decode_message(m) for _, m in self.sender_net.sent]
+
+        self.assertTrue(all(m.flags & FLAG_RELIABLE for m in frames))
+        self.assertEqual([m.seq for m in frames], [1, 2, 3])
+        self.assertEqual(frames[1].value, 20)
+
+        # A segunda mensagem é perdida, a terceira revela a lacuna
+        self.assertTrue(self.receiver.accept(frames[0]))
+        self.assertTrue(self.receiver.accept(frames[2]))
+
+        peer_id, nack = self.receiver_net.sent[-1]
+        nack = decode_message(nack)
+
+        self.assertEqual(peer_id, 1)
+        self.assertIsInstance(nack, NackMessage)
+        self.assertEqual((nack.first, nack.last), (2, 2))
+
+        # O remetente retransmite apenas para quem pediu
+        self.sender.handle_nack(nack)
+
+        peer_id, retransmitted = self.sender_net.sent[-1]
+
+        self.assertEqual(peer_id, 2)
+        self.assertTrue(self.receiver.accept(decode_message(retransmitted)))
+        self.assertFalse(self.receiver.accept(decode_message(retransmitted)))
+        self.assertFalse(self.receiver.accept(frames[0]))
+
+        stats: dict = self.receiver.stats()
+
+        self.assertEqual(stats["recovered"], 1)
+        self.assertEqual(stats["duplicates"], 2)
+
+
+    def test_tick_probes_the_last_message_and_gives_up_old_gaps(self):
+        """
+        A última mensagem é reenviada uma vez pelo tick, e uma lacuna que não é
+        recuperada é abandonada após max_nack_retries
+        """
+
+        self.sender.send(decide(1))
+        self.sender.tick()
+        self.sender.tick()
+
+        self.assertEqual(len(self.sender_net.sent), 2)
+        self.assertEqual(self.sender_net.sent[0], self.sender_net.sent[1])
+
+        receiver: ReliableChannel = ReliableChannel(self.receiver_net, process_id=2, max_nack_retries=2)
+
+        for value in (2, 3, 4):
+            self.sender.send(decide(value))
+
+        frames = [decode_message(m) for _, m in self.sender_net.sent]
+
+        receiver.accept(frames[0])
+        receiver.accept(frames[-1])
+
+        for _ in range(3):
+            receiver.tick()
+
+        self.assertEqual(receiver.stats()["lost"], 2)
+        self.assertFalse(receiver.accept(frames[3]))
+
+
+    def test_each_plane_has_its_own_multicast_sequence(self):
+        """
+        Um nó que recebe apenas o plano de consenso não vê lacunas pelas mensagens
+        multicast do plano de eleição, e o NACK de um plano retransmite apenas o plano
+        """
+
+        self.sender.send(message(message_enum=MessageEnum.COORDINATOR, sender_id=1, round=1))
+        self.sender.send(decide(1))
+        self.sender.send(message(message_enum=MessageEnum.COORDINATOR, sender_id=1, round=2))
+        self.sender.send(decide(2))
+        self.sender.send(decide(3))
+
+        frames = [decode_message(m) for _, m in self.sender_net.sent]
+        decides = [m for m in frames if m.type == MessageEnum.BIZANTINE_DECIDE.value]
+
+        self.assertEqual([m.seq for m in frames], [1, 1, 2, 2, 3])
+
+        self.assertTrue(self.receiver.accept(decides[0]))
+        self.assertTrue(self.receiver.accept(decides[1]))
+        self.assertEqual(self.receiver_net.sent, [])
+
+        # O segundo DECIDE é perdido, o terceiro revela a lacuna
+        receiver: ReliableChannel = ReliableChannel(self.receiver_net, process_id=2)
+
+        receiver.accept(decides[0])
+        receiver.accept(decides[2])
+
+        _, nack = self.receiver_net.sent[-1]
+        self.sender.handle_nack(decode_message(nack))
+
+        _, retransmitted = self.sender_net.sent[-1]
+
+        self.assertEqual(decode_message(retransmitted).value, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
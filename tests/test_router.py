@@ -0,0 +1,63 @@
+"""
+Testes unitários para o Router, verificando que cada mensagem chega apenas aos
+subsistemas registrados para o seu tipo
+"""
+
+import queue
+import threading
+import unittest
+
+from middleware.Router import Router
+from middleware.message.Codec import encode, decode_message
+from middleware.message.MessageEnum import MessageEnum
+
+
+class TestRouter(unittest.TestCase):
+    def test_message_only_reaches_handlers_of_its_type(self):
+        """
+        Um HEARTBEAT não chega ao handler da eleição
+        """
+
+        calls: list[tuple[str, int]] = []
+
+        router: Router = Router()
+        router.register("df", [MessageEnum.HEARTBEAT], lambda m: calls.append(("df", m.type)))
+        router.register("election", [MessageEnum.ELECTION, MessageEnum.COORDINATOR], lambda m: calls.append(("election", m.type)))
+
+        router.dispatch(decode_message(encode(MessageEnum.HEARTBEAT, 2)))
+        router.dispatch(decode_message(encode(MessageEnum.COORDINATOR, 2)))
+        router.dispatch(decode_message(encode(MessageEnum.BIZANTINE_START, 2)))
+
+        self.assertEqual(calls, [
+            ("df", MessageEnum.HEARTBEAT.value),
+            ("election", MessageEnum.COORDINATOR.value),
+        ])
+
+        stats: dict = router.stats()
+
+        self.assertEqual(stats["HEARTBEAT"]["count"], 1)
+        self.assertEqual(stats["COORDINATOR"]["count"], 1)
+        self.assertNotIn("BIZANTINE_START", stats)
+
+
+    def test_queued_subsystem_runs_on_its_own_thread(self):
+        """
+        O handler de um subsistema com fila é executado pela thread do subsistema
+        """
+
+        res_queue: queue.Queue = queue.Queue()
+
+        router: Router = Router()
+        router.register("consensus", [MessageEnum.BIZANTINE_VOTE], lambda m: res_queue.put((threading.get_ident(), m.vote)), queued=True)
+
+        router.dispatch(decode_message(encode(MessageEnum.BIZANTINE_VOTE, 3, round=1, vote=42)))
+
+        thread_id, vote = res_queue.get(timeout=2)
+        router.stop()
+
+        self.assertNotEqual(thread_id, threading.get_ident())
+        self.assertEqual(vote, 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Testes unitários para o Scheduler, verificando a ordem dos temporizadores, o
+cancelamento, os temporizadores periódicos e a fila de execução, e o LoopScheduler
+sobre um event loop asyncio
+"""
+
+import time
+import asyncio
+import threading
+import unittest
+
+from middleware.Scheduler import Scheduler, LoopScheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler: Scheduler = Scheduler()
+        self.scheduler.start()
+        self.addCleanup(self.scheduler.stop)
+
+
+    def test_timers_run_in_order_and_cancelled_timers_do_not_run(self):
+        res: list[str] = []
+        done: threading.Event = threading.Event()
+
+        self.scheduler.call_later(0.06, res.append, "c")
+        self.scheduler.call_later(0.02, res.append, "a")
+        self.scheduler.call_later(0.04, res.append, "b").cancel()
+        self.scheduler.call_later(0.03, res.append, "b")
+        self.scheduler.call_soon(res.append, "soon")
+        self.scheduler.call_later(0.08, done.set)
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(res, ["soon", "a", "b", "c"])
+
+        # Uma exceção não interrompe o escalonador
+        self.scheduler.call_soon(lambda: 1 / 0)
+        self.scheduler.call_soon(done.clear)
+
+        time.sleep(0.05)
+
+        self.assertFalse(done.is_set())
+        self.assertEqual(self.scheduler.stats()["errors"], 1)
+
+
+    def test_periodic_timer_keeps_a_fixed_cadence(self):
+        ticks: list[float] = []
+
+        def tick() -> None:
+            ticks.append(time.monotonic())
+
+            # O tempo de execução do callback não atrasa os próximos horários
+            time.sleep(0.01)
+
+        handle = self.scheduler.call_every(0.03, tick)
+        time.sleep(0.2)
+        handle.cancel()
+
+        count: int = len(ticks)
+        time.sleep(0.06)
+
+        self.assertGreaterEqual(count, 6)
+        self.assertEqual(len(ticks), count)
+        self.assertAlmostEqual((ticks[-1] - ticks[0]) / (count - 1), 0.03, delta=0.005)
+
+
+class TestLoopScheduler(unittest.TestCase):
+    def test_timers_run_in_the_event_loop_without_a_thread(self):
+        """
+        Os temporizadores registrados no event loop ou por outra thread executam no
+        event loop, e os cancelados não executam
+        """
+
+        async def run() -> list[str]:
+            res: list[str] = []
+            scheduler: LoopScheduler = LoopScheduler()
+            scheduler.bind(asyncio.get_running_loop())
+
+            scheduler.call_later(0.02, res.append, "a")
+            scheduler.call_later(0.01, res.append, "x").cancel()
+
+            thread: threading.Thread = threading.Thread(target=scheduler.call_later, args=(0.03, res.append, "b"))
+            thread.start()
+            thread.join()
+
+            await asyncio.sleep(0.1)
+
+            return res
+
+        threads: int = threading.active_count()
+
+        self.assertEqual(asyncio.run(run()), ["a", "b"])
+        self.assertEqual(threading.active_count(), threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Testes unitários para o SharedMemoryTransport, verificando a entrega pelos anéis
+entre nós locais, o fallback para os nós remotos e o descarte das cópias UDP
+"""
+
+import os
+import time
+import queue
+import unittest
+
+from middleware.message.Codec import decode
+from middleware.message.LoopbackTransport import LoopbackNetwork
+from middleware.message.Message import message
+from middleware.message.MessageEnum import MessageEnum
+from middleware.message.SharedMemoryTransport import SharedMemoryTransport, ShmRing
+
+
+def heartbeat(sender_id: int) -> bytes:
+    return message(message_enum=MessageEnum.HEARTBEAT, sender_id=sender_id)
+
+
+class TestSharedMemoryTransport(unittest.TestCase):
+    def setUp(self) -> None:
+        self.namespace: str = f"test-shm-{os.getpid()}"
+        self.network: LoopbackNetwork = LoopbackNetwork()
+        self.addCleanup(self.network.close)
+
+        self.queues: dict[int, queue.Queue] = {i: queue.Queue() for i in range(1, 4)}
+
+
+    def start(self, process_id: int, local_ids: list[int], remote: bool):
+        t = SharedMemoryTransport(
+            process_id,
+            local_ids,
+            fallback=self.network.transport(process_id),
+            namespace=self.namespace,
+            remote=remote,
+            scan_interval=0.05
+        )
+
+        t.start(lambda m, q=self.queues[process_id]: q.put(decode(m)))
+        self.addCleanup(t.stop)
+
+        return t
+
+
+    def wait_ready(self, transports: dict) -> None:
+        """
+        Aguarda cada nó abrir os anéis dos outros nós locais, as mensagens publicadas
+        antes da abertura não são entregues
+        """
+
+        for _ in range(100):
+            if all(len(t._peers) == len(t._local_ids) for t in transports.values()):
+                return
+
+            time.sleep(0.02)
+
+        self.fail("Anéis não foram abertos")
+
+
+    def test_local_nodes_exchange_messages_through_the_rings(self):
+        transports: dict = {i: self.start(i, [1, 2, 3], remote=False) for i in (1, 2, 3)}
+
+        self.wait_ready(transports)
+
+        transports[1].send(heartbeat(1))
+        transports[1].send_to(3, heartbeat(1))
+
+        self.assertEqual(self.queues[2].get(timeout=1)["sender_id"], 1)
+        self.assertEqual(self.queues[3].get(timeout=1)["sender_id"], 1)
+        self.assertEqual(self.queues[3].get(timeout=1)["sender_id"], 1)
+        self.assertTrue(self.queues[2].empty())
+
+        # Nenhuma mensagem passou pelo fallback
+        self.assertEqual(self.network.stats()["sent"], 0)
+        self.assertGreaterEqual(transports[1].stats()["shm_sent"], 2)
+
+
+    def test_remote_nodes_use_the_fallback_without_duplicating_local_messages(self):
+        local: dict = {i: self.start(i, [1, 2], remote=True) for i in (1, 2)}
+        remote = self.network.transport(3)
+        remote.start(lambda m: self.queues[3].put(decode(m)))
+
+        self.wait_ready(local)
+
+        local[1].send(heartbeat(1))
+        local[1].send_to(3, heartbeat(1))
+
+        self.assertEqual(self.queues[2].get(timeout=1)["sender_id"], 1)
+        self.assertEqual(self.queues[3].get(timeout=1)["sender_id"], 1)
+        self.assertEqual(self.queues[3].get(timeout=1)["sender_id"], 1)
+
+        # A cópia UDP do multicast do nó 1 é descartada pelo nó 2
+        self.network.send(3, heartbeat(3))
+        self.assertEqual(self.queues[2].get(timeout=1)["sender_id"], 3)
+        self.assertTrue(self.queues[2].empty())
+        self.assertGreaterEqual(local[2].stats()["duplicates"], 1)
+
+
+    def test_slow_reader_detects_the_overrun(self):
+        ring: ShmRing = ShmRing.create(f"{self.namespace}-ring", 4096)
+        self.addCleanup(ring.close)
+
+        pos: int = ring.write_pos()
+
+        for _ in range(200):
+            ring.publish(heartbeat(1))
+
+        _, pos, overrun = ring.read(pos, 2)
+
+        self.assertTrue(overrun)
+        self.assertEqual(pos, ring.write_pos())
+
+        ring.publish(heartbeat(1), dest=3)
+        ring.publish(heartbeat(1))
+
+        datagrams, _, overrun = ring.read(pos, 2)
+
+        self.assertFalse(overrun)
+        self.assertEqual(len(datagrams), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Testes unitários para a difusão com ordem total (TotalOrder), verificando que
+todos os nós entregam as mensagens na mesma ordem, mesmo com perdas na rede
+"""
+
+import time
+import threading
+import unittest
+
+from middleware.TotalOrder import TotalOrder
+from middleware.message.Codec import FLAG_RELIABLE, decode_message
+from middleware.message.LoopbackTransport import LoopbackNetwork
+from middleware.message.Reliable import ReliableChannel
+from middleware.message.TypedMessage import NackMessage
+
+
+class FakeElection():
+    def __init__(self, leader: int) -> None:
+        self.leader: int = leader
+
+
+    def get_leader(self) -> int:
+        return self.leader
+
+
+class FakeNode():
+    """
+    Apenas o que o TotalOrder utiliza do Node: id, canal confiável e líder
+    """
+
+    def __init__(self, network: LoopbackNetwork, process_id: int, leader: int) -> None:
+        self._process_id: int = process_id
+        self._ele: FakeElection = FakeElection(leader)
+        self._reliable: ReliableChannel = ReliableChannel(network.transport(process_id), process_id)
+
+        self.delivered: list[str] = []
+        self.total_order: TotalOrder = TotalOrder(self, on_deliver=lambda sender_id, payload: self.delivered.append(payload))
+
+        self._lock: threading.Lock = threading.Lock()
+        network.transport(process_id).start(self.on_message)
+
+
+    def on_message(self, data: bytes) -> None:
+        m = decode_message(data)
+
+        with self._lock:
+            if m.flags & FLAG_RELIABLE and not self._reliable.accept(m):
+                return
+
+            if isinstance(m, NackMessage):
+                self._reliable.handle_nack(m)
+            else:
+                self.total_order.handle_message(m)
+
+
+class TestTotalOrder(unittest.TestCase):
+    def run_cluster(self, loss: float) -> list[FakeNode]:
+        network: LoopbackNetwork = LoopbackNetwork(loss=loss, seed=3)
+        self.addCleanup(network.close)
+
+        nodes: list[FakeNode] = [FakeNode(network, i, leader=3) for i in (1, 2, 3)]
+
+        for i in range(30):
+            nodes[i % 3].total_order.broadcast(f"{i % 3}:{i}")
+
+        # Os ticks recuperam as perdas (NACK e reenvio da última mensagem)
+        for _ in range(20):
+            time.sleep(0.05)
+
+            if all(len(node.delivered) == 30 for node in nodes):
+                break
+
+            for node in nodes:
+                node._reliable.tick()
+                node.total_order.tick()
+
+        return nodes
+
+
+    def test_all_nodes_deliver_in_the_same_order(self):
+        nodes: list[FakeNode] = self.run_cluster(loss=0.0)
+
+        self.assertEqual(len(nodes[0].delivered), 30)
+        self.assertEqual(nodes[0].delivered, nodes[1].delivered)
+        self.assertEqual(nodes[1].delivered, nodes[2].delivered)
+
+        # As mensagens de cada remetente mantêm a ordem de envio
+        own: list[int] = [int(p.split(":")[1]) for p in nodes[0].delivered if p.startswith("1:")]
+        self.assertEqual(own, sorted(own))
+
+        # O líder agrupa as atribuições
+        self.assertLess(nodes[2].total_order.stats()["orders"], 30)
+
+
+    def test_losses_are_recovered_without_breaking_the_order(self):
+        nodes: list[FakeNode] = self.run_cluster(loss=0.1)
+
+        self.assertEqual(len(nodes[0].delivered), 30)
+        self.assertEqual(nodes[0].delivered, nodes[1].delivered)
+        self.assertEqual(nodes[1].delivered, nodes[2].delivered)
+
+
+if __name__ == '__main__':
+    unittest.main()